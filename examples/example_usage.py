@@ -7,7 +7,7 @@ for day trading, swing trading, and long-term investment strategies.
 """
 
 import logging
-from tokenometry import Tokenometry
+from tokenometry import Tokenometry, load_env
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -135,5 +135,8 @@ def run_strategy_example():
         logger.info("No signals generated.")
 
 if __name__ == "__main__":
+    # Read API keys from .env (importing tokenometry no longer does this)
+    load_env()
+
     # Run single strategy example
     run_strategy_example()
@@ -4,12 +4,13 @@ import time
 import pandas as pd
 import pandas_ta as ta
 from coinbase.rest import RESTClient
+from tokenometry.transport import attach_session
 import warnings
 import logging
 import sys
-import requests
-from textblob import TextBlob
-from datetime import datetime, timedelta
+from tokenometry.enrichment import Enricher, EnrichmentSource
+from tokenometry.onchain import OnChainCache
+from tokenometry.sentiment import SentimentService
 import os
 from dotenv import load_dotenv
 
@@ -59,11 +60,30 @@ ATR_STOP_LOSS_MULTIPLIER = 2.5
 SENTIMENT_THRESHOLD_BULLISH = 0.05
 SENTIMENT_THRESHOLD_BEARISH = -0.05
 
+# --- Enrichment Deadlines (seconds from the start of a cycle) ---
+TREND_DEADLINE_SECONDS = 30
+SENTIMENT_DEADLINE_SECONDS = 15
+ONCHAIN_DEADLINE_SECONDS = 15
+SIGNAL_DATA_DEADLINE_SECONDS = 60
+
+# One client for the whole process, on the shared keep-alive connection pool
+client = attach_session(RESTClient())
+
+# Headline polarities are cached across cycles; only new headlines are scored
+sentiment_service = SentimentService(
+    NEWS_API_KEY,
+    bullish_threshold=SENTIMENT_THRESHOLD_BULLISH,
+    bearish_threshold=SENTIMENT_THRESHOLD_BEARISH,
+    logger=logger,
+)
+
+# Daily Glassnode points are stored locally; each asset costs at most one small request per day
+onchain_cache = OnChainCache(GLASSNODE_API_KEY, window=7, path="onchain_cache.json", logger=logger)
+
 def get_historical_data(product_id, granularity, years=1):
     """Fetches historical candlestick data from Coinbase."""
     logger.info(f"Fetching {granularity} data for {product_id}...")
     try:
-        client = RESTClient()
         end_time = int(time.time())
         start_time = end_time - (years * 365 * 86400)
         
@@ -108,50 +128,16 @@ def get_historical_data(product_id, granularity, years=1):
         logger.error(f"Error fetching price data for {product_id}: {e}")
         return None
 
-def get_news_sentiment(product_id):
-    """Fetches news and calculates an aggregate sentiment score."""
-    if not NEWS_API_KEY:
-        logger.warning("NEWS_API_KEY not found. Skipping sentiment analysis.")
-        return "Neutral"
-    search_term = product_id.split('-')[0]
-    logger.info(f"Fetching news sentiment for {search_term}...")
-    try:
-        url = f"https://newsapi.org/v2/everything?q={search_term}&sortBy=publishedAt&language=en&apiKey={NEWS_API_KEY}"
-        response = requests.get(url)
-        response.raise_for_status()
-        articles = response.json().get('articles', [])
-        if not articles: return "Neutral"
-        total_polarity = sum(TextBlob(article['title']).sentiment.polarity for article in articles[:20] if article['title'])
-        avg_polarity = total_polarity / len(articles[:20])
-        logger.info(f"Average sentiment polarity for {search_term}: {avg_polarity:.4f}")
-        if avg_polarity > SENTIMENT_THRESHOLD_BULLISH: return "Positive"
-        elif avg_polarity < SENTIMENT_THRESHOLD_BEARISH: return "Negative"
-        else: return "Neutral"
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching news for {search_term}: {e}")
-        return "Neutral"
-
 def get_onchain_status(product_id):
-    """Fetches on-chain data to gauge accumulation/distribution."""
+    """Gauges accumulation/distribution from the cached 7-day exchange netflow."""
     if not GLASSNODE_API_KEY:
         logger.warning("GLASSNODE_API_KEY not found. Skipping on-chain analysis.")
         return "Neutral"
     asset = product_id.split('-')[0]
-    logger.info(f"Fetching on-chain exchange flow for {asset}...")
-    since_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    try:
-        url = f"https://api.glassnode.com/v1/metrics/distribution/exchange_net_position_change?a={asset}&s={since_date}&i=24h"
-        params = {'api_key': GLASSNODE_API_KEY}
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if not data: return "Neutral"
-        net_flow_sum = sum(item['v'] for item in data)
-        logger.info(f"7-day cumulative exchange netflow for {asset}: {net_flow_sum:,.2f} {asset}")
-        return "Accumulation" if net_flow_sum < 0 else "Distribution"
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching on-chain data for {asset}: {e}")
-        return "Neutral"
+    net_flow_sum = onchain_cache.net_flow(asset)
+    if net_flow_sum is None: return "Neutral"
+    logger.info(f"7-day cumulative exchange netflow for {asset}: {net_flow_sum:,.2f} {asset}")
+    return "Accumulation" if net_flow_sum < 0 else "Distribution"
 
 def get_daily_trend(product_id):
     """Determines the main market trend using a daily EMA."""
@@ -197,19 +183,36 @@ def generate_signals(df):
     df.loc[death_cross & rsi_sell_filter & macd_sell_filter, 'Signal'] = -1
     return df
 
+def get_news_sentiments(product_ids):
+    """Sentiment labels for all assets from one concurrent fetch and one scoring batch."""
+    if not NEWS_API_KEY:
+        logger.warning("NEWS_API_KEY not found. Skipping sentiment analysis.")
+        return {product_id: "Neutral" for product_id in product_ids}
+    return sentiment_service.label_many(product_ids)
+
+enricher = Enricher([
+    EnrichmentSource('trend', get_daily_trend, deadline=TREND_DEADLINE_SECONDS),
+    EnrichmentSource('sentiment', get_news_sentiments, deadline=SENTIMENT_DEADLINE_SECONDS, batch=True),
+    EnrichmentSource('onchain', get_onchain_status, deadline=ONCHAIN_DEADLINE_SECONDS),
+    EnrichmentSource('data', lambda product_id: get_historical_data(product_id, GRANULARITY_SIGNAL, years=1),
+                     deadline=SIGNAL_DATA_DEADLINE_SECONDS, default=None),
+], logger=logger)
+
 def run_analysis_cycle():
     """Runs one full analysis cycle for all configured assets."""
     logger.info("Starting new analysis cycle.")
     results = []
     
+    # Every source for every asset runs at once; a source that misses its deadline reads as Neutral
+    enriched = enricher.run(PRODUCT_IDS)
     for product_id in PRODUCT_IDS:
-        daily_trend = get_daily_trend(product_id)
-        sentiment = get_news_sentiment(product_id)
+        daily_trend = enriched[product_id]['trend']
+        sentiment = enriched[product_id]['sentiment']
         # On-chain is kept for context but not used in the final aggressive signal
-        onchain = get_onchain_status(product_id) 
+        onchain = enriched[product_id]['onchain']
         logger.info(f"Analysis for {product_id} -> Trend: {daily_trend}, Sentiment: {sentiment}, On-Chain: {onchain}")
 
-        data = get_historical_data(product_id, GRANULARITY_SIGNAL, years=1)
+        data = enriched[product_id]['data']
         if data is not None and not data.empty:
             data = calculate_indicators(data)
             data.dropna(inplace=True)
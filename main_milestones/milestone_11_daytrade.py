@@ -4,6 +4,7 @@ import time
 import pandas as pd
 import pandas_ta as ta
 from coinbase.rest import RESTClient
+from tokenometry.transport import attach_session
 import warnings
 import logging
 import sys
@@ -52,6 +53,9 @@ HYPOTHETICAL_PORTFOLIO_SIZE = 100000.0
 RISK_PER_TRADE_PERCENTAGE = 0.5 # Tighter risk for day trading
 ATR_STOP_LOSS_MULTIPLIER = 2.0  # Tighter stop-loss for day trading
 
+# One client for the whole process, on the shared keep-alive connection pool
+client = attach_session(RESTClient())
+
 def get_historical_data(product_id, granularity):
     """
     Fetches the last 300 candles of historical data from Coinbase.
@@ -59,8 +63,6 @@ def get_historical_data(product_id, granularity):
     """
     logger.info(f"Fetching {granularity} data for {product_id}...")
     try:
-        client = RESTClient()
-        
         # Calculate a start time to ensure we get enough data for indicators to mature
         # 300 candles is the max per request.
         granularity_seconds = {"ONE_HOUR": 3600, "FIVE_MINUTE": 300}.get(granularity, 3600)
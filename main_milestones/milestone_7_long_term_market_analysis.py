@@ -4,6 +4,7 @@ import time
 import pandas as pd
 import pandas_ta as ta
 from coinbase.rest import RESTClient
+from tokenometry.transport import attach_session
 import warnings
 import logging
 import sys
@@ -48,11 +49,13 @@ HYPOTHETICAL_PORTFOLIO_SIZE = 100000.0
 RISK_PER_TRADE_PERCENTAGE = 1.0
 ATR_STOP_LOSS_MULTIPLIER = 2.5
 
+# One client for the whole process, on the shared keep-alive connection pool
+client = attach_session(RESTClient())
+
 def get_historical_data(product_id, granularity, years=1):
     """Fetches historical candlestick data from Coinbase for a single asset."""
     logger.info(f"Fetching {granularity} data for {product_id}...")
     try:
-        client = RESTClient()
         end_time = int(time.time())
         start_time = end_time - (years * 365 * 86400)
         
@@ -0,0 +1,84 @@
+"""
+Shared fixtures and helpers for the Tokenometry test suite.
+"""
+
+import math
+import random
+
+import pytest
+
+
+def synthetic_candles(n=300, granularity_seconds=3600, start=1_700_000_000, base=100.0, seed=0):
+    """Builds Coinbase-shaped candle dicts (newest first) following a noisy wave."""
+    rng = random.Random(seed)
+    candles = []
+    for i in range(n):
+        close = base + 10 * math.sin((i + seed) / 15.0) + 0.01 * i + rng.gauss(0, 1.0)
+        open_ = close - 0.5 * math.cos((i + seed) / 7.0)
+        candles.append({
+            'start': str(start + i * granularity_seconds),
+            'open': str(open_),
+            'high': str(max(open_, close) + 1.0),
+            'low': str(min(open_, close) - 1.0),
+            'close': str(close),
+            'volume': str(1000.0 * rng.lognormvariate(0, 0.5)),
+        })
+    return list(reversed(candles))
+
+
+class _Response:
+    def __init__(self, candles):
+        self._candles = candles
+
+    def to_dict(self):
+        return {'candles': self._candles}
+
+
+class FakeClient:
+    """Stands in for coinbase.rest.RESTClient, serving synthetic candles."""
+
+    def __init__(self, n=300):
+        self.n = n
+        self.calls = []
+
+    def get_public_candles(self, product_id, start, end, granularity):
+        self.calls.append((product_id, granularity))
+        seed = sum(ord(c) for c in product_id)
+        step = max(1, (int(end) - int(start)) // 300)
+        return _Response(synthetic_candles(self.n, step, start=int(end) - self.n * step, seed=seed))
+
+
+@pytest.fixture
+def fake_client():
+    """A fake Coinbase client with deterministic candles per product."""
+    return FakeClient()
+
+
+@pytest.fixture
+def base_config():
+    """A complete strategy configuration."""
+    return {
+        "STRATEGY_NAME": "Test Strategy",
+        "PRODUCT_IDS": ["BTC-USD", "ETH-USD"],
+        "GRANULARITY_SIGNAL": "ONE_HOUR",
+        "GRANULARITY_TREND": "ONE_DAY",
+        "GRANULARITY_SECONDS": {"ONE_HOUR": 3600, "ONE_DAY": 86400},
+        "TREND_INDICATOR_TYPE": "EMA",
+        "TREND_PERIOD": 50,
+        "SIGNAL_INDICATOR_TYPE": "EMA",
+        "SHORT_PERIOD": 20,
+        "LONG_PERIOD": 50,
+        "RSI_PERIOD": 14,
+        "RSI_OVERBOUGHT": 70,
+        "RSI_OVERSOLD": 30,
+        "MACD_FAST": 12,
+        "MACD_SLOW": 26,
+        "MACD_SIGNAL": 9,
+        "ATR_PERIOD": 14,
+        "VOLUME_FILTER_ENABLED": True,
+        "VOLUME_MA_PERIOD": 20,
+        "VOLUME_SPIKE_MULTIPLIER": 1.5,
+        "HYPOTHETICAL_PORTFOLIO_SIZE": 100000.0,
+        "RISK_PER_TRADE_PERCENTAGE": 1.0,
+        "ATR_STOP_LOSS_MULTIPLIER": 2.5,
+    }
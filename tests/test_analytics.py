@@ -0,0 +1,111 @@
+"""
+Tests for the vectorized performance analytics.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from tokenometry import analytics
+from tokenometry.analytics import TRADE_DTYPE
+
+
+def _curve(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return 10_000 * np.cumprod(1 + rng.normal(0.0002, 0.01, n))
+
+
+class TestAnalytics:
+    """Test cases for tokenometry.analytics."""
+
+    def test_curve_metrics_match_reference(self):
+        """Sharpe, Sortino, CAGR and drawdown agree with straightforward loops."""
+        equity = _curve()
+        periods = analytics.periods_per_year(86400)
+        r = np.diff(equity) / equity[:-1]
+        assert analytics.sharpe(equity, periods) == pytest.approx(r.mean() / r.std(ddof=1) * np.sqrt(365))
+        downside = np.sqrt(np.mean([min(x, 0) ** 2 for x in r]))
+        assert analytics.sortino(equity, periods) == pytest.approx(r.mean() / downside * np.sqrt(365))
+        years = (len(equity) - 1) / 365
+        assert analytics.cagr(equity, periods) == pytest.approx((equity[-1] / equity[0]) ** (1 / years) - 1)
+
+        peak, depth, longest, start = equity[0], 0.0, 0, 0
+        for i, value in enumerate(equity):
+            if value >= peak:
+                peak, start = value, i
+            depth = min(depth, value / peak - 1)
+            longest = max(longest, i - start)
+        assert analytics.max_drawdown(equity) == (pytest.approx(depth), longest)
+
+    def test_sweep_results_are_vectorized(self):
+        """A 2-D array of curves is reduced per run, in milliseconds per run."""
+        sweep = np.stack([_curve(seed=s) for s in range(1000)])
+        start = time.perf_counter()
+        sharpe = analytics.sharpe(sweep, 365)
+        depth, duration = analytics.max_drawdown(sweep)
+        elapsed = time.perf_counter() - start
+        assert sharpe.shape == depth.shape == duration.shape == (1000,)
+        assert sharpe[7] == pytest.approx(analytics.sharpe(sweep[7], 365))
+        assert duration[3] == analytics.max_drawdown(sweep[3])[1]
+        assert elapsed / 1000 < 0.005
+
+    def test_trade_statistics_and_excursions(self):
+        """Ledger pairing, win rate, profit factor, exposure and MAE/MFE."""
+        index = pd.date_range('2024-01-01', periods=10, freq='D')
+        high = np.array([11, 12, 13, 12, 11, 10, 12, 15, 14, 13], dtype=float)
+        low = high - 2
+        ledger = [
+            {'type': 'BUY', 'date': index[1], 'price': 10.0, 'size': 2.0},
+            {'type': 'SELL', 'date': index[3], 'price': 12.0},
+            {'type': 'BUY', 'date': index[4], 'price': 10.0, 'size': 1.0},
+            {'type': 'STOP-LOSS', 'date': index[5], 'price': 9.0},
+            {'type': 'BUY', 'date': index[7], 'price': 14.0, 'size': 1.0},
+            {'type': 'SELL', 'date': index[9], 'price': 12.0},
+        ]
+        trades = analytics.trades_from_ledger(ledger, index)
+        assert trades.dtype == TRADE_DTYPE
+        assert list(trades['exit_index']) == [3, 5, 9]
+        assert list(analytics.trade_pnl(trades)) == [4.0, -1.0, -2.0]
+        assert analytics.win_rate(trades) == pytest.approx(1 / 3)
+        assert analytics.profit_factor(trades) == pytest.approx(4 / 3)
+        assert analytics.exposure(trades, 10) == pytest.approx(0.8)
+
+        mae, mfe = analytics.excursions(trades, high, low)
+        assert list(mae) == pytest.approx([0.0, -0.2, 11 / 14 - 1])
+        assert list(mfe) == pytest.approx([0.3, 0.1, 15 / 14 - 1])
+
+    def test_degenerate_inputs(self):
+        """A one-point curve has no CAGR, and trade dates outside the index are rejected."""
+        assert np.isnan(analytics.cagr(np.array([100.0]), 365))
+        assert np.isnan(analytics.cagr(np.full((3, 1), 100.0), 365)).all()
+        index = pd.date_range('2024-01-01', periods=3, freq='D')
+        ledger = [{'type': 'BUY', 'date': index[0], 'price': 1.0, 'size': 1.0},
+                  {'type': 'SELL', 'date': pd.Timestamp('2024-02-01'), 'price': 2.0}]
+        with pytest.raises(ValueError, match='2024-02-01'):
+            analytics.trades_from_ledger(ledger, index)
+
+    def test_rolling_metrics_on_sweeps(self):
+        """A (runs, bars) sweep is rolled per run, matching each 1-D curve."""
+        sweep = np.stack([_curve(200, seed) for seed in range(3)])
+        rolling = analytics.rolling_sharpe(sweep, 30, 365)
+        rdd = analytics.rolling_drawdown(sweep, 20)
+        assert rolling.shape == rdd.shape == (3, 200)
+        for run in range(3):
+            np.testing.assert_allclose(rolling[run], analytics.rolling_sharpe(sweep[run], 30, 365))
+            np.testing.assert_allclose(rdd[run], analytics.rolling_drawdown(sweep[run], 20))
+
+    def test_rolling_and_summary(self):
+        """Rolling metrics are NaN until the window fills; summarize reports every metric."""
+        equity = _curve(500)
+        rolling = analytics.rolling_sharpe(equity, 50, 365)
+        assert np.isnan(rolling[:50]).all() and not np.isnan(rolling[50:]).any()
+        assert rolling[-1] == pytest.approx(analytics.sharpe(equity[-51:], 365))
+        rdd = analytics.rolling_drawdown(equity, 20)
+        assert rdd[-1] == pytest.approx(equity[-1] / equity[-20:].max() - 1)
+
+        trades = np.array([(10, 40, equity[10], equity[40], 1.0)], dtype=TRADE_DTYPE)
+        summary = analytics.summarize(equity, 365, trades, high=equity * 1.01, low=equity * 0.99)
+        assert summary['trades'] == 1
+        assert {'sharpe', 'sortino', 'cagr', 'max_drawdown', 'max_drawdown_duration',
+                'exposure', 'avg_mae', 'avg_mfe'} <= set(summary)
@@ -0,0 +1,56 @@
+"""
+Tests for the memory-mapped history archive.
+"""
+
+import numpy as np
+import pandas as pd
+from tokenometry.archive import HistoryArchive
+from tokenometry.compact import CompactCandles
+
+from .conftest import synthetic_candles
+
+
+def _history(n, start=1_600_000_000):
+    return CompactCandles.from_candles(synthetic_candles(n, 300, start=start)).to_frame().astype(np.float64)
+
+
+class TestHistoryArchive:
+    """Test cases for HistoryArchive and ArchivedSeries."""
+
+    def test_append_only_writes_new_rows(self, tmp_path):
+        """Overlapping appends store each timestamp once, in order."""
+        archive = HistoryArchive(str(tmp_path))
+        history = _history(1000)
+        assert archive.append('BTC-USD', 'FIVE_MINUTE', history.iloc[:600]) == 600
+        assert archive.append('BTC-USD', 'FIVE_MINUTE', history.iloc[500:]) == 400
+        assert archive.append('BTC-USD', 'FIVE_MINUTE', history.iloc[900:]) == 0
+        series = archive.open('BTC-USD', 'FIVE_MINUTE')
+        assert len(series) == 1000
+        assert isinstance(series.column('Close'), np.memmap)
+        pd.testing.assert_frame_equal(series.frame(), history, check_freq=False)
+        assert archive.keys() == [('BTC-USD', 'FIVE_MINUTE')]
+
+    def test_time_range_uses_sidecar(self, tmp_path):
+        """Time slicing returns exactly the requested half-open range."""
+        archive = HistoryArchive(str(tmp_path))
+        history = _history(500)
+        archive.append('ETH-USD', 'FIVE_MINUTE', history)
+        start, end = history.index[100], history.index[200]
+        window = archive.open('ETH-USD', 'FIVE_MINUTE').frame(start, end)
+        assert len(window) == 100
+        assert window.index[0] == start and window.index[-1] < end
+
+    def test_iter_frames_with_warmup_matches_full_pass(self, tmp_path):
+        """Paging with warmup reproduces an indicator computed over the whole history."""
+        archive = HistoryArchive(str(tmp_path))
+        history = _history(2000)
+        archive.append('SOL-USD', 'FIVE_MINUTE', history)
+        series = archive.open('SOL-USD', 'FIVE_MINUTE')
+        warmup = 20
+        pieces = []
+        for i, chunk in enumerate(series.iter_frames(chunk_rows=300, warmup=warmup)):
+            sma = chunk['Close'].rolling(20).mean()
+            pieces.append(sma if i == 0 else sma.iloc[warmup:])
+        paged = pd.concat(pieces)
+        expected = history['Close'].rolling(20).mean()
+        pd.testing.assert_series_equal(paged, expected, check_freq=False)
@@ -0,0 +1,80 @@
+"""
+Tests for the shared-memory candle arena.
+"""
+
+import logging
+import multiprocessing
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from tokenometry import Tokenometry
+from tokenometry.arena import CandleArena, compute_indicators
+from tokenometry.compact import OHLCV_COLUMNS, CompactCandles
+from tokenometry.metrics import MetricsRegistry
+
+from .conftest import synthetic_candles
+
+INDICATORS = ['EMA_20', 'EMA_50', 'RSI_14', 'ATRr_14']
+
+
+@pytest.fixture
+def arena():
+    keys = [('BTC-USD', 'ONE_HOUR'), ('ETH-USD', 'ONE_HOUR')]
+    with CandleArena.create(keys, fields=list(OHLCV_COLUMNS) + INDICATORS, capacity=300) as arena:
+        for seed, (asset, granularity) in enumerate(keys):
+            arena.write_frame(asset, granularity, CompactCandles.from_candles(synthetic_candles(300, seed=seed)).to_frame())
+        yield arena
+
+
+class TestCandleArena:
+    """Test cases for CandleArena."""
+
+    def test_attach_sees_writes_without_copying(self, arena):
+        """An attached handle and a pandas view share the creator's buffers."""
+        other = CandleArena.attach(arena.name)
+        try:
+            assert other.keys == arena.keys
+            other.column('BTC-USD', 'ONE_HOUR', 'EMA_20')[:] = 1.5
+            frame = arena.frame('BTC-USD', 'ONE_HOUR')
+            assert np.shares_memory(frame['EMA_20'].to_numpy(), arena.values('BTC-USD', 'ONE_HOUR'))
+            assert (frame['EMA_20'] == 1.5).all()
+            del frame
+        finally:
+            other.close()
+
+    def test_write_rejects_oversized_window(self, arena):
+        """Windows longer than the slot capacity are rejected."""
+        with pytest.raises(ValueError):
+            arena.write('BTC-USD', 'ONE_HOUR', np.arange(301), {})
+
+    @pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+    def test_process_pool_computes_indicators_in_place(self, arena, base_config, start_method):
+        """Workers attach by name and write indicators the parent can read."""
+        context = multiprocessing.get_context(start_method)
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+            done = list(pool.map(compute_indicators, [arena.name] * 2, *zip(*arena.keys), [base_config] * 2))
+        assert done == arena.keys
+
+        scanner = Tokenometry(config=base_config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+        for asset, granularity in arena.keys:
+            frame = arena.frame(asset, granularity)
+            expected = scanner._calculate_indicators(frame[list(OHLCV_COLUMNS)].copy())
+            for field in INDICATORS:
+                np.testing.assert_allclose(frame[field], expected[field], equal_nan=True)
+            del frame
+
+    def test_block_outlives_attached_process(self, arena):
+        """A separately started process that attaches and exits leaves the block intact."""
+        code = f'from tokenometry.arena import CandleArena; CandleArena.attach({arena.name!r}).close()'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert 'leaked' not in result.stderr
+        other = CandleArena.attach(arena.name)
+        try:
+            assert other.keys == arena.keys
+        finally:
+            other.close()
@@ -0,0 +1,58 @@
+"""
+Tests for the Arrow/Parquet readers and writers.
+"""
+
+import numpy as np
+import pytest
+from tokenometry.compact import CompactCandles
+
+pa = pytest.importorskip('pyarrow')
+from tokenometry import arrow_io  # noqa: E402
+
+from .conftest import synthetic_candles  # noqa: E402
+
+
+def _frame(seed=0):
+    df = CompactCandles.from_candles(synthetic_candles(96, 3600, seed=seed)).to_frame().astype(np.float64)
+    df['EMA_20'] = df['Close'].ewm(span=20, adjust=False).mean()
+    return df
+
+
+SIGNALS = [
+    {'timestamp': '2025-08-19 21:00:00', 'asset': 'BTC-USD', 'signal': 'BUY', 'strength': 'Strong',
+     'trend': 'Bullish', 'close_price': 60000.0,
+     'trade_plan': {'stop_loss': 58000.0, 'position_size_crypto': 0.5, 'position_size_usd': 30000.0}},
+    {'timestamp': '2025-08-20 01:00:00', 'asset': 'ETH-USD', 'signal': 'SELL', 'strength': 'Low',
+     'trend': 'Bearish', 'close_price': 3000.0, 'trade_plan': {}},
+]
+
+
+class TestArrowIO:
+    """Test cases for arrow_io."""
+
+    def test_frame_to_table_is_zero_copy(self):
+        """Contiguous float64 columns are wrapped without copying."""
+        df = _frame()
+        table = arrow_io.frame_to_table(df)
+        buffer = np.frombuffer(table.column('Close').chunk(0).buffers()[1], dtype=np.float64)
+        assert np.shares_memory(buffer, df['Close'].to_numpy())
+        assert table.schema.field('timestamp').type == pa.timestamp('s')
+
+    def test_candles_round_trip_with_pushdown(self, tmp_path):
+        """Partitioned writes read back per asset and time range."""
+        root = str(tmp_path / 'candles')
+        btc, eth = _frame(0), _frame(1)
+        arrow_io.write_candles(btc, root, 'BTC-USD', 'ONE_HOUR')
+        arrow_io.write_candles(eth, root, 'ETH-USD', 'ONE_HOUR')
+        assert (tmp_path / 'candles' / 'granularity=ONE_HOUR' / 'asset=BTC-USD').is_dir()
+
+        result = arrow_io.read_candles(root, 'BTC-USD', 'ONE_HOUR', start=btc.index[24], end=btc.index[48])
+        np.testing.assert_array_equal(result['EMA_20'].to_numpy(), btc['EMA_20'].iloc[24:48].to_numpy())
+        assert result.index.equals(btc.index[24:48])
+
+    def test_signals_round_trip(self, tmp_path):
+        """Signals survive a Parquet round trip in scan() shape."""
+        root = str(tmp_path / 'signals')
+        arrow_io.write_signals(SIGNALS, root)
+        assert arrow_io.read_signals(root) == SIGNALS
+        assert arrow_io.read_signals(root, asset='ETH-USD') == SIGNALS[1:]
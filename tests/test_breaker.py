@@ -0,0 +1,76 @@
+"""
+Tests for the per-product circuit breaker.
+"""
+
+import logging
+from unittest.mock import Mock
+
+from tokenometry import Tokenometry
+from tokenometry.breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker
+from tokenometry.metrics import MetricsRegistry
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker and its use in Tokenometry."""
+
+    def test_opens_after_threshold_and_probes(self):
+        """Consecutive failures open the breaker; one half-open probe decides what happens next."""
+        clock = Clock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, clock=clock)
+        for _ in range(2):
+            assert breaker.allow()
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(3):
+            breaker.record_failure()
+        assert breaker.state == OPEN and not breaker.allow()
+
+        clock.now = 60
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        clock.now = 120
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED and breaker.allow()
+
+    def test_registry_is_keyed_by_product_and_endpoint(self):
+        """Breakers are independent per (product, endpoint)."""
+        registry = BreakerRegistry(failure_threshold=1)
+        registry.get('DEAD-USD', 'get_public_candles').record_failure()
+        assert registry.get('DEAD-USD', 'get_public_candles') is registry.get('DEAD-USD', 'get_public_candles')
+        assert registry.get('BTC-USD', 'get_public_candles').allow()
+        assert registry.open_products() == ['DEAD-USD']
+
+    def test_dead_market_is_skipped_by_scan(self, base_config, fake_client):
+        """Once open, a failing product costs no requests until the probe is due."""
+        config = dict(base_config, PRODUCT_IDS=['DEAD-USD', 'BTC-USD'], RETRY_ATTEMPTS=1,
+                      CIRCUIT_BREAKER_THRESHOLD=2, CIRCUIT_BREAKER_RESET_SECONDS=3600)
+        bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+        serve = fake_client.get_public_candles
+
+        def get_public_candles(product_id, **kwargs):
+            if product_id == 'DEAD-USD':
+                fake_client.calls.append((product_id, kwargs['granularity']))
+                raise ConnectionError('product not found')
+            return serve(product_id=product_id, **kwargs)
+
+        fake_client.get_public_candles = get_public_candles
+        bot.client = fake_client
+        for _ in range(4):
+            bot.scan()
+        dead_calls = [c for c in fake_client.calls if c[0] == 'DEAD-USD']
+        assert len(dead_calls) == 2
+        assert bot.metrics.short_circuits.value(endpoint='get_public_candles', product_id='DEAD-USD') == 2
+        assert bot.metrics.circuit_state.value(endpoint='get_public_candles', product_id='DEAD-USD') == 2
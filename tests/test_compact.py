@@ -0,0 +1,75 @@
+"""
+Tests for the compact float32 candle representation.
+"""
+
+import logging
+import timeit
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+from tokenometry import Tokenometry
+from tokenometry.compact import FLOAT32_RELATIVE_ERROR, CompactCandles
+from tokenometry.datasources import parse_candles
+from tokenometry.metrics import MetricsRegistry
+
+from .conftest import synthetic_candles
+
+
+class TestCompactCandles:
+    """Test cases for CompactCandles."""
+
+    def test_from_candles_sorts_and_deduplicates(self):
+        """Raw Coinbase candles are sorted ascending with duplicates dropped."""
+        candles = synthetic_candles(50)
+        window = CompactCandles.from_candles(candles + candles[:5])
+        assert len(window) == 50
+        assert np.all(np.diff(window.timestamps) > 0)
+        assert window.ohlcv.dtype == np.float32
+        assert window.timestamps.dtype == np.int64
+
+    def test_compact_parse_is_faster(self):
+        """COMPACT_CANDLES parses a full Coinbase response well ahead of the string DataFrame path."""
+        candles = synthetic_candles(300, 3600)
+
+        def best(compact):
+            return min(timeit.repeat(lambda: parse_candles(candles, compact), number=20, repeat=5))
+
+        pd.testing.assert_frame_equal(parse_candles(candles, True), parse_candles(candles).astype(np.float32)
+                                      .astype(np.float64), check_freq=False)
+        assert best(True) < 0.7 * best(False)
+
+    def test_frame_round_trip_within_precision_bound(self):
+        """Packing an indicator frame keeps values within the float32 bound."""
+        window = CompactCandles.from_candles(synthetic_candles(100))
+        df = window.to_frame().astype(np.float64)
+        df['EMA_20'] = df['Close'].ewm(span=20, adjust=False).mean()
+        packed = CompactCandles.from_frame(df)
+        assert packed.indicator_names == ('EMA_20',)
+        assert packed.indicators.flags['C_CONTIGUOUS']
+        np.testing.assert_allclose(packed['EMA_20'], df['EMA_20'], rtol=2 * FLOAT32_RELATIVE_ERROR)
+        restored = packed.to_frame()
+        assert isinstance(restored.index, pd.DatetimeIndex)
+        assert restored.index.equals(df.index)
+
+    def test_compact_uses_less_memory(self):
+        """The compact window is well under half the float64 frame's footprint."""
+        window = CompactCandles.from_candles(synthetic_candles(300))
+        df = window.to_frame().astype(np.float64)
+        for i in range(12):
+            df[f'IND_{i}'] = df['Close'] * i
+        assert CompactCandles.from_frame(df).nbytes < 0.6 * df.memory_usage(deep=True).sum()
+
+    def test_scan_with_compact_candles(self, base_config, fake_client):
+        """COMPACT_CANDLES parses through CompactCandles and hands the pipeline float64 columns."""
+        results = []
+        for compact in (False, True):
+            bot = Tokenometry(config=dict(base_config, COMPACT_CANDLES=compact),
+                              logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+            bot.client = fake_client
+            frame = bot._calculate_indicators(bot._get_historical_data('BTC-USD', 'ONE_HOUR'))
+            results.append(frame)
+        # No float32 frame is built only to be widened and narrowed again
+        assert (results[1].dtypes == np.float64).all()
+        np.testing.assert_allclose(results[1]['Close'], results[0]['Close'], rtol=FLOAT32_RELATIVE_ERROR)
+        np.testing.assert_allclose(results[1]['RSI_14'].dropna(), results[0]['RSI_14'].dropna(), atol=1e-3)
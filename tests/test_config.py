@@ -0,0 +1,76 @@
+"""
+Tests for the compiled ScannerConfig.
+"""
+
+import logging
+from unittest.mock import Mock
+
+import pytest
+
+from tokenometry import ConfigError, MissingConfigKey, ScannerConfig, Tokenometry
+from tokenometry.metrics import MetricsRegistry
+
+
+class TestScannerConfig:
+    """Test cases for config validation and compilation."""
+
+    def test_column_names_and_thresholds_are_precomputed(self, base_config):
+        """Indicator columns, granularity seconds and risk capital are resolved once."""
+        s = ScannerConfig.from_dict(base_config)
+        assert (s.short_col, s.long_col, s.trend_col) == ('EMA_20', 'EMA_50', 'EMA_50')
+        assert (s.rsi_col, s.macd_hist_col, s.atr_col, s.volume_col) == ('RSI_14', 'MACDh_12_26_9', 'ATRr_14', 'SMA_Volume_20')
+        assert (s.signal_seconds, s.trend_seconds) == (3600, 86400)
+        assert s.capital_to_risk == 1000.0
+        assert s.volume_strong_multiplier == 2.5
+        assert s.scan_priority == 'proximity'
+
+    def test_frozen_and_hashable(self, base_config):
+        """Equal configs compile to equal, hashable, immutable settings."""
+        a, b = ScannerConfig.from_dict(base_config), ScannerConfig.from_dict(dict(base_config))
+        assert a == b and hash(a) == hash(b)
+        assert {a: 1}[b] == 1
+        with pytest.raises(AttributeError):
+            a.rsi_period = 7
+        assert not hasattr(a, '__dict__')
+
+    def test_missing_keys_raise_key_error(self, base_config):
+        """All missing keys are reported at once, as a KeyError."""
+        config = {k: v for k, v in base_config.items() if k not in ('RSI_PERIOD', 'ATR_PERIOD')}
+        with pytest.raises(KeyError) as error:
+            ScannerConfig.from_dict(config)
+        assert isinstance(error.value, MissingConfigKey)
+        assert 'RSI_PERIOD, ATR_PERIOD' in str(error.value)
+
+    def test_volume_keys_only_required_with_filter(self, base_config):
+        """VOLUME_* keys may be omitted when the volume filter is off."""
+        config = {k: v for k, v in base_config.items() if not k.startswith('VOLUME_')}
+        assert ScannerConfig.from_dict(config).volume_col is None
+
+    @pytest.mark.parametrize('override', [
+        {'RSI_PERIOD': 0},
+        {'RSI_PERIOD': 14.5},
+        {'SHORT_PERIOD': True},
+        {'SHORT_PERIOD': 60},
+        {'MACD_FAST': 30},
+        {'RSI_OVERSOLD': 80},
+        {'RSI_OVERBOUGHT': 120},
+        {'RISK_PER_TRADE_PERCENTAGE': 0},
+        {'SIGNAL_INDICATOR_TYPE': 'WMA'},
+        {'GRANULARITY_SIGNAL': 'TWO_HOUR'},
+        {'PRODUCT_IDS': 'BTC-USD'},
+        {'SCAN_PRIORITY': 'volatility'},
+    ])
+    def test_invalid_values_raise_config_error(self, base_config, override):
+        """Wrong types and out-of-range values fail at init, not mid-scan."""
+        with pytest.raises(ConfigError):
+            ScannerConfig.from_dict(dict(base_config, **override))
+
+    def test_scanner_recompiles_on_config_assignment(self, base_config):
+        """Assigning a new config dict re-validates and refreshes settings."""
+        bot = Tokenometry(config=base_config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+        assert bot.settings.rsi_col == 'RSI_14'
+        bot.config = dict(base_config, RSI_PERIOD=7)
+        assert bot.settings.rsi_col == 'RSI_7'
+        with pytest.raises(ConfigError):
+            bot.config = dict(base_config, RSI_PERIOD=-1)
+        assert bot.config['RSI_PERIOD'] == 7
@@ -0,0 +1,127 @@
+"""
+Tests for the pluggable market-data sources.
+"""
+
+import logging
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tokenometry import Tokenometry
+from tokenometry.archive import HistoryArchive
+from tokenometry.compact import CompactCandles
+from tokenometry.datasources import (ArchiveSource, CoinbaseSource, CSVSource, FrameSource, ParquetSource,
+                                     SyntheticSource, parse_candles)
+from tokenometry.metrics import MetricsRegistry
+
+from .conftest import synthetic_candles
+
+
+def _history(n=500, seed=0):
+    return parse_candles(synthetic_candles(n, 3600, seed=seed))
+
+
+def _make_bot(config, source):
+    return Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry(), source=source)
+
+
+class TestDataSources:
+    """Test cases for DataSource implementations."""
+
+    def test_frame_source_window_and_as_of(self):
+        """Windows hold the latest ``limit`` rows up to ``as_of``."""
+        df = _history()
+        source = FrameSource({('BTC-USD', 'ONE_HOUR'): df})
+        window = source.window('BTC-USD', 'ONE_HOUR', 3600, limit=300)
+        assert len(window) == 300 and window.index[-1] == df.index[-1]
+
+        source.as_of = df.index[199]
+        replay = source.window('BTC-USD', 'ONE_HOUR', 3600, limit=300)
+        assert len(replay) == 200 and replay.index[-1] == df.index[199]
+        assert source.window('ETH-USD', 'ONE_HOUR', 3600) is None
+
+    def test_compact_windows_are_float32_rounded(self):
+        """compact=True rounds values like a compact Coinbase parse and returns float64 columns."""
+        df = _history()
+        source = FrameSource({('BTC-USD', 'ONE_HOUR'): df})
+        window = source.window('BTC-USD', 'ONE_HOUR', 3600, compact=True)
+        assert list(window.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert (window.dtypes == np.float64).all()
+        np.testing.assert_array_equal(window['Close'], df['Close'].iloc[-300:].astype(np.float32))
+
+    def test_synthetic_source_is_deterministic(self):
+        """Same seed, same candles; different assets get different walks."""
+        a = SyntheticSource(bars=400, seed=1, end='2024-06-01').window('BTC-USD', 'ONE_HOUR', 3600)
+        b = SyntheticSource(bars=400, seed=1, end='2024-06-01').window('BTC-USD', 'ONE_HOUR', 3600)
+        other = SyntheticSource(bars=400, seed=1, end='2024-06-01').window('ETH-USD', 'ONE_HOUR', 3600)
+        pd.testing.assert_frame_equal(a, b)
+        assert not np.allclose(a['Close'], other['Close'])
+        assert (a['High'] >= a[['Open', 'Close']].max(axis=1)).all()
+        assert (a['Low'] <= a[['Open', 'Close']].min(axis=1)).all()
+        assert (np.diff(a.index.asi8) == 3600 * 10**9).all()
+
+    def test_csv_source(self, tmp_path):
+        """CSV histories are read once from <root>/<granularity>/<asset>.csv."""
+        df = _history()
+        (tmp_path / 'ONE_HOUR').mkdir()
+        df.to_csv(tmp_path / 'ONE_HOUR' / 'BTC-USD.csv')
+        window = CSVSource(str(tmp_path)).window('BTC-USD', 'ONE_HOUR', 3600, limit=50)
+        np.testing.assert_allclose(window['Close'].to_numpy(), df['Close'].to_numpy()[-50:])
+        assert CSVSource(str(tmp_path)).window('ETH-USD', 'ONE_HOUR', 3600) is None
+
+    def test_archive_source_reads_memmapped_rows(self, tmp_path):
+        """Archive windows slice the memory-mapped series without loading it all."""
+        df = _history()
+        HistoryArchive(str(tmp_path)).append('BTC-USD', 'ONE_HOUR', df)
+        source = ArchiveSource(str(tmp_path), as_of=df.index[399])
+        window = source.window('BTC-USD', 'ONE_HOUR', 3600, limit=300)
+        assert window.index[0] == df.index[100] and window.index[-1] == df.index[399]
+        np.testing.assert_allclose(window['Close'].to_numpy(), df['Close'].to_numpy()[100:400])
+        assert source.window('ETH-USD', 'ONE_HOUR', 3600) is None
+        source.close()
+
+    def test_parquet_source(self, tmp_path):
+        """Parquet candle datasets are served through the same interface."""
+        pytest.importorskip('pyarrow')
+        from tokenometry.arrow_io import write_candles
+        df = _history(100)
+        write_candles(CompactCandles.from_frame(df).to_frame().astype(np.float64), str(tmp_path), 'BTC-USD', 'ONE_HOUR')
+        window = ParquetSource(str(tmp_path)).window('BTC-USD', 'ONE_HOUR', 3600)
+        assert len(window) == 100 and window.index[-1] == df.index[-1]
+
+    def test_coinbase_source_creates_client_lazily(self, fake_client):
+        """The REST client is built on first request only."""
+        factory = Mock(return_value=fake_client)
+        source = CoinbaseSource(client_factory=factory)
+        factory.assert_not_called()
+        window = source.window('BTC-USD', 'ONE_HOUR', 3600)
+        factory.assert_called_once()
+        assert len(window) == 300 and window.index.is_monotonic_increasing
+
+
+class TestScannerSources:
+    """Test cases for scanning against local sources."""
+
+    def test_local_source_matches_coinbase_path(self, base_config, fake_client):
+        """A frame source fed the same candles gives the same signals as the REST path."""
+        remote = _make_bot(base_config, None)
+        remote.client = fake_client
+        expected = remote.scan()
+
+        frames = {}
+        for product_id in base_config['PRODUCT_IDS']:
+            for granularity, seconds in base_config['GRANULARITY_SECONDS'].items():
+                frames[(product_id, granularity)] = CoinbaseSource(lambda: fake_client).window(
+                    product_id, granularity, seconds)
+        local = _make_bot(base_config, FrameSource(frames))
+        assert [(s['asset'], s['signal']) for s in local.scan()] == [(s['asset'], s['signal']) for s in expected]
+
+    def test_synthetic_scan_never_touches_network(self, base_config):
+        """Scanning a synthetic source needs no client at all."""
+        bot = _make_bot(base_config, SyntheticSource(bars=400, seed=3))
+        bot.client = Mock(side_effect=AssertionError('network used'))
+        result = bot.scan()
+        assert result.complete
+        assert bot.client.get_public_candles.call_count == 0
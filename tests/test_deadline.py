@@ -0,0 +1,65 @@
+"""
+Tests for deadline-bounded scans.
+"""
+
+import logging
+import time
+from unittest.mock import Mock
+
+import pytest
+from tokenometry import ScanResult, Tokenometry
+from tokenometry.metrics import MetricsRegistry
+
+ASSETS = ['BTC-USD', 'ETH-USD', 'SOL-USD', 'AVAX-USD', 'ADA-USD']
+
+
+def _make_bot(config, client):
+    bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+    bot.client = client
+    return bot
+
+
+class TestScanDeadline:
+    """Test cases for scan(deadline=...)."""
+
+    def test_scan_without_deadline_is_complete(self, base_config, fake_client):
+        """A normal scan evaluates everything and still compares equal to a list."""
+        result = _make_bot(base_config, fake_client).scan()
+        assert isinstance(result, ScanResult) and isinstance(result, list)
+        assert result.complete and result.skipped == []
+
+    def test_deadline_stops_launching_new_assets(self, base_config, fake_client):
+        """Once the budget is spent the remaining assets are reported as skipped."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=ASSETS, SCAN_PRIORITY='config'), fake_client)
+        evaluate = bot._evaluate_asset
+
+        def slow_evaluate(product_id):
+            time.sleep(0.05)
+            return evaluate(product_id)
+
+        bot._evaluate_asset = Mock(side_effect=slow_evaluate)
+        result = bot.scan(deadline=0.08)
+        evaluated = [c.args[0] for c in bot._evaluate_asset.call_args_list]
+        assert not result.complete
+        assert evaluated + result.skipped == ASSETS
+        assert 1 <= len(evaluated) < len(ASSETS)
+        assert bot.metrics.scan_skipped.value(strategy='Test Strategy') == len(result.skipped)
+
+    def test_assets_nearest_to_a_signal_go_first(self, base_config, fake_client):
+        """Proximity ordering puts unseen assets, then the nearest crossings, first."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=ASSETS), fake_client)
+        bot._priority = {'BTC-USD': (2.5, 1e9), 'ETH-USD': (0.1, 1e6), 'SOL-USD': (None, 1e3),
+                         'AVAX-USD': (1.0, 1e8)}
+        assert bot._prioritize(ASSETS) == ['SOL-USD', 'ADA-USD', 'ETH-USD', 'AVAX-USD', 'BTC-USD']
+        bot.config = dict(bot.config, SCAN_PRIORITY='liquidity')
+        assert bot._prioritize(ASSETS) == ['ADA-USD', 'BTC-USD', 'AVAX-USD', 'ETH-USD', 'SOL-USD']
+        with pytest.raises(ValueError):
+            bot.config = dict(bot.config, SCAN_PRIORITY='volatility')
+
+    def test_scan_records_priorities(self, base_config, fake_client):
+        """A scan records each asset's proximity and liquidity for the next one."""
+        bot = _make_bot(base_config, fake_client)
+        bot.scan()
+        proximity, liquidity = bot._priority['BTC-USD']
+        assert proximity is not None and proximity >= 0
+        assert liquidity > 0
@@ -0,0 +1,169 @@
+"""
+Tests for the distributed coordinator, worker and SQLite work queue.
+"""
+
+import logging
+import threading
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from tokenometry import ScanResult, Tokenometry
+from tokenometry.distributed import (DONE, FAILED, LEASED, PENDING, Coordinator, SQLiteWorkQueue, Worker,
+                                     shard)
+from tokenometry.metrics import MetricsRegistry
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    q = SQLiteWorkQueue(str(tmp_path / 'queue.db'), max_attempts=2, clock=clock)
+    yield q
+    q.close()
+
+
+class TestWorkQueue:
+    """Test cases for SQLiteWorkQueue leasing."""
+
+    def test_shard_sizes(self):
+        """Universes split into consecutive shards, the last one partial."""
+        assert shard(['a', 'b', 'c', 'd', 'e'], 2) == [['a', 'b'], ['c', 'd'], ['e']]
+        with pytest.raises(ValueError):
+            shard(['a'], 0)
+
+    def test_items_are_leased_once_in_order(self, queue):
+        """Each item goes to one worker, in submission order."""
+        queue.put('b1', [{'n': 0}, {'n': 1}])
+        first = queue.lease('w1', 30)
+        second = queue.lease('w2', 30)
+        assert (first.payload, second.payload) == ({'n': 0}, {'n': 1})
+        assert queue.lease('w3', 30) is None
+        assert queue.batch_status('b1')[LEASED] == 2
+
+    def test_expired_lease_is_retried_then_failed(self, queue, clock):
+        """A crashed worker's item is re-leased, and failed once attempts run out."""
+        queue.put('b1', [{'n': 0}])
+        item = queue.lease('crashed', 30)
+        clock.now += 31
+        retry = queue.lease('w2', 30)
+        assert retry.id == item.id and retry.attempts == 2
+        # The original worker lost its lease and cannot overwrite the result
+        assert not queue.complete(item.id, 'crashed', {'signals': []})
+        clock.now += 31
+        assert queue.lease('w3', 30) is None
+        assert queue.batch_status('b1')[FAILED] == 1
+
+    def test_extend_keeps_lease(self, queue, clock):
+        """Heartbeats push the lease expiry forward."""
+        queue.put('b1', [{'n': 0}])
+        item = queue.lease('w1', 30)
+        clock.now += 20
+        assert queue.extend(item.id, 'w1', 30)
+        clock.now += 20
+        assert queue.lease('w2', 30) is None
+
+    def test_fail_requeues_until_attempts_exhausted(self, queue):
+        """Explicit failures go back to pending while attempts remain."""
+        queue.put('b1', [{'n': 0}])
+        queue.fail(queue.lease('w1', 30).id, 'w1', 'boom')
+        assert queue.batch_status('b1')[PENDING] == 1
+        queue.fail(queue.lease('w1', 30).id, 'w1', 'boom')
+        assert queue.batch_results('b1')[0]['state'] == FAILED
+        assert queue.batch_results('b1')[0]['error'] == 'boom'
+
+    def test_results_serialise_numpy_scalars(self, queue):
+        """Signal values such as numpy close prices are stored as plain numbers."""
+        queue.put('b1', [{'n': 0}])
+        item = queue.lease('w1', 30)
+        assert queue.complete(item.id, 'w1', {'signals': [{'close_price': np.float64(1.5), 'strength': np.int64(2)}]})
+        [row] = queue.batch_results('b1')
+        assert row['state'] == DONE and row['result']['signals'] == [{'close_price': 1.5, 'strength': 2}]
+
+
+class TestCoordinator:
+    """Test cases for sharded scans across workers."""
+
+    def _factory(self, client):
+        def build(config):
+            bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+            bot.client = client
+            return bot
+        return build
+
+    def test_workers_merge_to_single_process_result(self, tmp_path, base_config, fake_client):
+        """Two workers on one queue produce the same signals as one scanner."""
+        config = dict(base_config, PRODUCT_IDS=['BTC-USD', 'ETH-USD', 'SOL-USD', 'ADA-USD', 'XRP-USD'])
+        expected = self._factory(fake_client)(dict(config)).scan()
+
+        path = str(tmp_path / 'queue.db')
+        coordinator = Coordinator(SQLiteWorkQueue(path), shard_size=2, logger=Mock(spec=logging.Logger))
+        batch = coordinator.submit(config)
+        stop = threading.Event()
+        workers = [Worker(SQLiteWorkQueue(path), worker_id=f'w{i}', scanner_factory=self._factory(fake_client),
+                          logger=Mock(spec=logging.Logger)) for i in range(2)]
+        threads = [threading.Thread(target=w.run, kwargs={'stop': stop, 'idle_sleep': 0.05}) for w in workers]
+        for t in threads:
+            t.start()
+        try:
+            result = coordinator.collect(batch, timeout=30, poll_interval=0.05)
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+
+        assert result.complete
+        assert [s['asset'] for s in result] == [s['asset'] for s in expected]
+        assert [s['signal'] for s in result] == [s['signal'] for s in expected]
+
+    def test_crashing_shard_is_reported_skipped(self, tmp_path, base_config):
+        """A shard that fails on every attempt lists its assets as skipped."""
+        queue = SQLiteWorkQueue(str(tmp_path / 'queue.db'), max_attempts=2)
+        coordinator = Coordinator(queue, shard_size=1, logger=Mock(spec=logging.Logger))
+        batch = coordinator.submit(base_config)
+
+        bot = Mock()
+
+        def scan(deadline=None):
+            if bot.config['PRODUCT_IDS'] == ['ETH-USD']:
+                raise RuntimeError('exchange down')
+            return ScanResult()
+        bot.scan.side_effect = scan
+        build = Mock(return_value=bot)
+        worker = Worker(queue, worker_id='w1', scanner_factory=build, logger=Mock(spec=logging.Logger))
+        while worker.run_once():
+            pass
+
+        result = coordinator.collect(batch, timeout=1, poll_interval=0.01)
+        assert result.skipped == ['ETH-USD']
+        build.assert_called_once()  # one scanner reused across shards
+
+    def test_collect_ends_when_every_worker_died(self, queue, clock, base_config):
+        """Expired leases with no attempts left fail on poll, so an untimed collect returns."""
+        coordinator = Coordinator(queue, shard_size=1, logger=Mock(spec=logging.Logger))
+        batch = coordinator.submit(base_config)
+        for _ in range(queue.max_attempts):
+            while queue.lease('crashed', 30) is not None:
+                pass
+            clock.now += 31
+        assert queue.batch_status(batch)[FAILED] == len(base_config['PRODUCT_IDS'])
+
+        results = []
+        collector = threading.Thread(target=lambda: results.append(coordinator.collect(batch, poll_interval=0.01)),
+                                     daemon=True)
+        collector.start()
+        collector.join(5)
+        assert not collector.is_alive()
+        assert sorted(results[0].skipped) == sorted(base_config['PRODUCT_IDS'])
@@ -0,0 +1,89 @@
+"""
+Tests for the concurrent enrichment stage.
+"""
+
+import threading
+import time
+
+import pytest
+from tokenometry.enrichment import Enricher, EnrichmentSource
+from tokenometry.metrics import MetricsRegistry, ScannerMetrics
+
+ASSETS = ['BTC-USD', 'ETH-USD', 'SOL-USD', 'AVAX-USD']
+
+
+def _enricher(sources):
+    return Enricher(sources, metrics=ScannerMetrics(MetricsRegistry()))
+
+
+class TestEnricher:
+    """Test cases for Enricher."""
+
+    def test_sources_run_concurrently(self):
+        """A round takes about one lookup's latency, not the sum over sources and assets."""
+        def slow(value):
+            def fetch(product_id):
+                time.sleep(0.1)
+                return value
+            return fetch
+
+        sources = [EnrichmentSource('trend', slow('Bullish'), deadline=2),
+                   EnrichmentSource('onchain', slow('Accumulation'), deadline=2)]
+        with _enricher(sources) as enricher:
+            start = time.monotonic()
+            results = enricher.run(ASSETS)
+            elapsed = time.monotonic() - start
+        assert elapsed < 0.5
+        assert results['ETH-USD'] == {'trend': 'Bullish', 'onchain': 'Accumulation'}
+
+    def test_missed_deadline_degrades_to_default(self):
+        """A stalled source resolves to Neutral once its deadline passes."""
+        release = threading.Event()
+
+        def stalled(product_id):
+            release.wait(5)
+            return 'Positive'
+
+        sources = [EnrichmentSource('trend', lambda p: 'Bearish', deadline=1),
+                   EnrichmentSource('sentiment', stalled, deadline=0.1)]
+        enricher = _enricher(sources)
+        try:
+            start = time.monotonic()
+            results = enricher.run(ASSETS)
+            assert time.monotonic() - start < 0.5
+        finally:
+            release.set()
+            enricher.close()
+        assert all(r == {'trend': 'Bearish', 'sentiment': 'Neutral'} for r in results.values())
+        assert enricher.metrics.enrichment.value(source='sentiment', result='timeout') == len(ASSETS)
+
+    def test_errors_and_batch_sources(self):
+        """Failing lookups use the default; batch sources fill every asset from one call."""
+        def flaky(product_id):
+            if product_id == 'SOL-USD':
+                raise ConnectionError('down')
+            return 'Accumulation'
+
+        calls = []
+
+        def sentiment(product_ids):
+            calls.append(list(product_ids))
+            return {p: 'Positive' for p in product_ids if p != 'AVAX-USD'}
+
+        sources = [EnrichmentSource('onchain', flaky, deadline=1),
+                   EnrichmentSource('sentiment', sentiment, deadline=1, batch=True),
+                   EnrichmentSource('data', lambda p: p.lower(), deadline=1, default=None)]
+        with _enricher(sources) as enricher:
+            results = enricher.run(ASSETS)
+        assert calls == [ASSETS]
+        assert results['SOL-USD']['onchain'] == 'Neutral'
+        assert results['BTC-USD'] == {'onchain': 'Accumulation', 'sentiment': 'Positive', 'data': 'btc-usd'}
+        assert results['AVAX-USD']['sentiment'] == 'Neutral'
+        assert enricher.metrics.enrichment.value(source='onchain', result='error') == 1
+
+    def test_rejects_invalid_sources(self):
+        """Duplicate names and non-positive deadlines are rejected."""
+        with pytest.raises(ValueError):
+            EnrichmentSource('trend', len, deadline=0)
+        with pytest.raises(ValueError):
+            Enricher([EnrichmentSource('a', len, 1), EnrichmentSource('a', len, 1)])
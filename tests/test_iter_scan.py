@@ -0,0 +1,98 @@
+"""
+Tests for the streaming iter_scan() and aiter_scan() APIs.
+"""
+
+import asyncio
+import logging
+import time
+from unittest.mock import Mock
+
+from tokenometry import Tokenometry
+from tokenometry.metrics import MetricsRegistry
+
+ASSETS = ['ADA-USD', 'AVAX-USD', 'DOT-USD', 'LINK-USD', 'SOL-USD', 'XRP-USD', 'ETH-USD', 'BTC-USD']
+
+
+def _make_bot(config, client=None):
+    bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+    if client is not None:
+        bot.client = client
+    return bot
+
+
+def _slow_universe(bot, fast='BTC-USD', delay=0.2):
+    """Every asset but ``fast`` is slow and quiet; ``fast`` signals immediately."""
+    def evaluate(product_id):
+        if product_id == fast:
+            return {'asset': product_id, 'signal': 'BUY'}
+        time.sleep(delay)
+        return None
+    bot._evaluate_asset = Mock(side_effect=evaluate)
+
+
+class TestIterScan:
+    """Test cases for iter_scan and aiter_scan."""
+
+    def test_iter_scan_matches_scan(self, base_config, fake_client):
+        """Streaming yields exactly the signals scan() returns."""
+        assert list(_make_bot(base_config, fake_client).iter_scan()) == _make_bot(base_config, fake_client).scan()
+
+    def test_signal_is_yielded_before_later_assets_run(self, base_config):
+        """Serially, a signal is handed over before the next asset is evaluated."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=['BTC-USD'] + ASSETS[:-1]))
+        _slow_universe(bot)
+        iterator = bot.iter_scan()
+        assert next(iterator)['asset'] == 'BTC-USD'
+        assert bot._evaluate_asset.call_count == 1
+        iterator.close()
+
+    def test_first_signal_does_not_wait_for_slow_assets(self, base_config):
+        """With workers, time-to-first-signal is one fast evaluation, wherever the asset is listed."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=ASSETS, SCAN_WORKERS=len(ASSETS)))
+        _slow_universe(bot)
+        start = time.monotonic()
+        iterator = bot.iter_scan()
+        assert next(iterator)['asset'] == 'BTC-USD'
+        assert time.monotonic() - start < 0.1
+        assert list(iterator) == []
+
+    def test_workers_respect_deadline(self, base_config):
+        """Concurrent scans also stop launching assets at the deadline."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=ASSETS, SCAN_PRIORITY='config'))
+        _slow_universe(bot, fast=None, delay=0.1)
+        result = bot.scan(deadline=0.15, workers=2)
+        assert len(result.skipped) == len(ASSETS) - bot._evaluate_asset.call_count
+        assert 0 < len(result.skipped) < len(ASSETS)
+
+    def test_aiter_scan_streams_into_event_loop(self, base_config):
+        """The async iterator delivers signals while other assets are still running."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=ASSETS, SCAN_WORKERS=len(ASSETS)))
+        _slow_universe(bot)
+
+        async def collect():
+            start = time.monotonic()
+            received = []
+            async for signal in bot.aiter_scan():
+                received.append((signal['asset'], time.monotonic() - start))
+            return received
+
+        received = asyncio.run(collect())
+        assert [asset for asset, _ in received] == ['BTC-USD']
+        assert received[0][1] < 0.1
+
+    def test_leaving_aiter_scan_early_stops_starting_assets(self, base_config):
+        """Breaking out of the async for lets the running asset finish and starts no more."""
+        bot = _make_bot(dict(base_config, PRODUCT_IDS=['BTC-USD'] + ASSETS[:-1]))
+        _slow_universe(bot, delay=0.1)
+
+        async def first_signal():
+            iterator = bot.aiter_scan()
+            try:
+                async for signal in iterator:
+                    await asyncio.sleep(0.05)
+                    return signal
+            finally:
+                await iterator.aclose()
+
+        assert asyncio.run(first_signal())['asset'] == 'BTC-USD'
+        assert bot._evaluate_asset.call_count == 2
@@ -0,0 +1,38 @@
+"""
+Tests for the queue-based logging setup.
+"""
+
+import logging
+import logging.handlers
+
+from tokenometry.log import setup_logging, shutdown_logging
+
+
+class TestLogging:
+    """Test cases for setup_logging."""
+
+    def test_setup_is_idempotent(self, tmp_path):
+        """Repeated setup attaches exactly one QueueHandler."""
+        name = 'TokenometryTestIdempotent'
+        log_file = tmp_path / 'test.log'
+        try:
+            for _ in range(5):
+                logger = setup_logging(name, log_file=str(log_file))
+            queue_handlers = [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+            assert len(queue_handlers) == 1
+            assert len(logger.handlers) == 1
+        finally:
+            shutdown_logging(name)
+
+    def test_records_written_once_after_shutdown(self, tmp_path):
+        """Each record reaches the file once, and shutdown flushes the queue."""
+        name = 'TokenometryTestFlush'
+        log_file = tmp_path / 'test.log'
+        setup_logging(name, log_file=str(log_file))
+        logger = setup_logging(name, log_file=str(log_file))
+        logger.info('Fetching %s data for %s...', 'ONE_HOUR', 'BTC-USD')
+        shutdown_logging(name)
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 1
+        assert lines[0].endswith('Fetching ONE_HOUR data for BTC-USD...')
+        assert logger.handlers == []
@@ -0,0 +1,63 @@
+"""
+Tests for the metrics registry and exposition endpoint.
+"""
+
+import urllib.request
+
+import pytest
+from tokenometry.metrics import MetricsRegistry, ScannerMetrics, start_http_server
+from tokenometry.ratelimit import RateLimiter
+
+
+class TestMetrics:
+    """Test cases for the metrics module."""
+
+    def test_counter_and_render(self):
+        """Counters accumulate per label set and render in text format."""
+        registry = MetricsRegistry()
+        counter = registry.counter('test_total', 'A test counter.', ['asset'])
+        counter.inc(asset='BTC-USD')
+        counter.inc(2, asset='BTC-USD')
+        assert counter.value(asset='BTC-USD') == 3.0
+        output = registry.render()
+        assert '# TYPE test_total counter' in output
+        assert 'test_total{asset="BTC-USD"} 3.0' in output
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets are cumulative and include +Inf, sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+        output = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 1' in output
+        assert 'latency_seconds_bucket{le="1.0"} 2' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+        assert 'latency_seconds_count 3' in output
+
+    def test_registry_rejects_conflicting_labels(self):
+        """Re-registering a name with different labels is an error."""
+        registry = MetricsRegistry()
+        registry.counter('dup_total', 'Dup.', ['a'])
+        assert registry.counter('dup_total', 'Dup.', ['a']) is registry.counter('dup_total', 'Dup.', ['a'])
+        with pytest.raises(ValueError):
+            registry.counter('dup_total', 'Dup.', ['b'])
+
+    def test_http_endpoint_serves_registry(self):
+        """The local endpoint exposes the registry at /metrics."""
+        registry = MetricsRegistry()
+        ScannerMetrics(registry).signals.inc(strategy='Test', asset='ETH-USD', signal='BUY')
+        server = start_http_server(port=0, registry=registry)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+            body = urllib.request.urlopen(url, timeout=5).read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'tokenometry_signals_total{strategy="Test",asset="ETH-USD",signal="BUY"} 1.0' in body
+
+    def test_rate_limiter_reports_wait(self):
+        """The limiter lets a burst through and then waits."""
+        limiter = RateLimiter(rate_per_second=50, burst=1)
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() > 0.0
@@ -0,0 +1,147 @@
+"""
+Tests for the on-chain metric cache.
+"""
+
+from tokenometry.metrics import MetricsRegistry, ScannerMetrics
+from tokenometry.onchain import DAY_SECONDS, OnChainCache, RollingSeries
+
+DAY0 = 1_700_006_400 // DAY_SECONDS * DAY_SECONDS
+
+
+class _Response:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeGlassnode:
+    """Serves one point per closed day, valued by its day number."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = []
+
+    def __call__(self, url, params=None):
+        self.requests.append((params['a'], params['s']))
+        closed = int(self.clock()) // DAY_SECONDS * DAY_SECONDS
+        return _Response([{'t': t, 'v': float((t - DAY0) // DAY_SECONDS) - 5}
+                          for t in range(params['s'], closed, DAY_SECONDS)])
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(clock, **kwargs):
+    return OnChainCache('key', fetch=FakeGlassnode(clock), clock=clock,
+                        metrics=ScannerMetrics(MetricsRegistry()), **kwargs)
+
+
+class TestOnChainCache:
+    """Test cases for OnChainCache and RollingSeries."""
+
+    def test_rolling_sum_matches_window(self):
+        """The running sum equals the sum of the points in the last window days."""
+        series = RollingSeries(3)
+        for day, v in enumerate([1.0, 2.0, 3.0, 4.0, 5.0]):
+            series.append(day * DAY_SECONDS, v)
+        assert series.total == 12.0
+        assert not series.append(2 * DAY_SECONDS, 100.0)
+        assert series.resum() == 12.0
+
+    def test_window_is_defined_by_date(self):
+        """A gap in the series shrinks the window instead of reaching further back."""
+        series = RollingSeries(3)
+        for day in (0, 1, 2, 5):
+            series.append(day * DAY_SECONDS, 1.0)
+        assert [t // DAY_SECONDS for t, _ in series.points] == [5]
+        assert series.total == 1.0
+
+    def test_running_sum_is_resummed(self):
+        """Rounding error from large evicted values is cleared every window appends."""
+        series = RollingSeries(3)
+        series.append(0, 1e16)
+        for day in range(1, 6):
+            series.append(day * DAY_SECONDS, 1.0)
+        assert series.total == 3.0
+
+    def test_stale_series_reads_as_no_data(self):
+        """Once the latest point is more than a day past its close, net_flow falls back to None."""
+        clock = Clock(DAY0 + 10 * DAY_SECONDS + 3600)
+        cache = _cache(clock)
+        assert cache.net_flow('BTC') is not None
+        cache.fetch.clock = lambda: DAY0 + 10 * DAY_SECONDS
+        clock.now += DAY_SECONDS
+        assert cache.net_flow('BTC') is None
+        assert cache.status('BTC') == 'Neutral'
+
+    def test_one_request_per_asset_per_day(self):
+        """Lookups within a day are served locally; the next day asks only for the new point."""
+        clock = Clock(DAY0 + 10 * DAY_SECONDS + 3600)
+        cache = _cache(clock)
+        first = cache.net_flow('BTC')
+        assert first == sum(float(d) - 5 for d in range(3, 10))
+
+        clock.now += 6 * 3600
+        assert cache.net_flow('BTC') == first
+        assert len(cache.fetch.requests) == 1
+
+        clock.now += DAY_SECONDS
+        assert cache.net_flow('BTC') == first - (3 - 5) + (10 - 5)
+        assert cache.fetch.requests[-1] == ('BTC', DAY0 + 10 * DAY_SECONDS)
+        assert len(cache.fetch.requests) == 2
+        assert cache.status('BTC') == 'Distribution'
+        assert cache.metrics.cache_requests.value(cache='onchain', result='hit') == 2
+
+    def test_late_point_is_retried_after_delay(self):
+        """A day not yet published is retried only after retry_seconds."""
+        clock = Clock(DAY0 + 10 * DAY_SECONDS + 3600)
+        cache = _cache(clock, retry_seconds=1800)
+        cache.net_flow('BTC')
+        cache.fetch.clock = lambda: DAY0 + 10 * DAY_SECONDS
+        clock.now += DAY_SECONDS
+        cache.net_flow('BTC')
+        clock.now += 600
+        cache.net_flow('BTC')
+        clock.now += 1800
+        cache.net_flow('BTC')
+        assert len(cache.fetch.requests) == 3
+
+    def test_empty_first_response_is_throttled(self):
+        """An asset with no points yet is re-requested only after retry_seconds."""
+        clock = Clock(DAY0 + 10 * DAY_SECONDS)
+        cache = _cache(clock, retry_seconds=1800)
+        cache.fetch.clock = lambda: DAY0
+        cache.net_flow('BTC')
+        clock.now += 600
+        cache.net_flow('BTC')
+        assert len(cache.fetch.requests) == 1
+        clock.now += 1200
+        cache.net_flow('BTC')
+        assert len(cache.fetch.requests) == 2
+
+    def test_persists_series(self, tmp_path):
+        """Series reload from disk and need no request on restart."""
+        path = str(tmp_path / 'onchain.json')
+        clock = Clock(DAY0 + 10 * DAY_SECONDS + 3600)
+        flow = _cache(clock, path=path).net_flow('ETH')
+        restarted = _cache(clock, path=path)
+        assert restarted.net_flow('ETH') == flow
+        assert restarted.fetch.requests == []
+
+    def test_errors_and_missing_key_are_neutral(self):
+        """No key or a failing request reads as Neutral."""
+        def failing(url, params=None):
+            raise ConnectionError('down')
+        assert OnChainCache(None).status('BTC') == 'Neutral'
+        cache = OnChainCache('key', fetch=failing, metrics=ScannerMetrics(MetricsRegistry()))
+        assert cache.status('BTC') == 'Neutral'
@@ -0,0 +1,69 @@
+"""
+Tests for the tiered pre-screening scan.
+"""
+
+import logging
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from tokenometry import Tokenometry
+from tokenometry.datasources import SyntheticSource
+from tokenometry.metrics import MetricsRegistry
+
+
+def _make_bot(config, client):
+    bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+    bot.client = client
+    return bot
+
+
+class TestPrescreen:
+    """Test cases for Tokenometry._prescreen."""
+
+    @pytest.mark.parametrize('indicator_type', ['EMA', 'SMA'])
+    def test_never_drops_a_technical_signal(self, base_config, fake_client, indicator_type):
+        """Every bar where the full pipeline signals passes the pre-screen."""
+        config = dict(base_config, VOLUME_FILTER_ENABLED=False, SIGNAL_INDICATOR_TYPE=indicator_type,
+                      PRESCREEN_ENABLED=True, PRESCREEN_BAND=0.001)
+        bot = _make_bot(config, fake_client)
+        full = bot._get_historical_data('BTC-USD', 'ONE_HOUR')
+        skipped = signalled = 0
+        for end in range(120, len(full) + 1):
+            window = full.iloc[:end].copy()
+            candidate = bot._prescreen('BTC-USD', window)
+            evaluated = bot._generate_signals(bot._calculate_indicators(window.copy()).dropna())
+            if evaluated['Signal'].iloc[-1] != 0:
+                signalled += 1
+                assert candidate
+            skipped += not candidate
+        assert signalled > 0
+        assert skipped > (len(full) - 120) // 2
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_sliding_windows_with_long_periods(self, base_config, seed):
+        """Rolling 300-bar windows with 50/200 EMAs never lose a crossover to EMA seeding."""
+        config = dict(base_config, VOLUME_FILTER_ENABLED=False, SHORT_PERIOD=50, LONG_PERIOD=200,
+                      PRESCREEN_ENABLED=True)
+        bot = _make_bot(config, None)
+        history = SyntheticSource(bars=2600, seed=seed, end='2025-01-01').window('BTC-USD', 'ONE_HOUR', 3600, limit=2600)
+        crossed = 0
+        for end in range(300, len(history) + 1):
+            window = history.iloc[end - 300:end].copy()
+            candidate = bot._prescreen('BTC-USD', window)
+            spread = (window['Close'].ewm(span=50, adjust=False).mean()
+                      - window['Close'].ewm(span=200, adjust=False).mean()).to_numpy()
+            if np.sign(spread[-1]) != np.sign(spread[-2]):
+                crossed += 1
+                assert candidate, window.index[-1]
+        assert crossed > 0
+
+    def test_scan_skips_indicator_work_for_quiet_assets(self, base_config, fake_client):
+        """Quiet assets skip the trend fetch and the full indicator pipeline."""
+        config = dict(base_config, VOLUME_FILTER_ENABLED=False, PRESCREEN_ENABLED=True, PRESCREEN_BAND=0.0)
+        bot = _make_bot(config, fake_client)
+        bot._calculate_indicators = Mock(wraps=bot._calculate_indicators)
+        baseline = _make_bot(dict(base_config, VOLUME_FILTER_ENABLED=False), fake_client).scan()
+        assert bot.scan() == baseline
+        assert bot._calculate_indicators.call_count < len(config['PRODUCT_IDS'])
+        assert bot.metrics.prescreen.value(strategy='Test Strategy', result='skipped') > 0
@@ -0,0 +1,66 @@
+"""
+Tests for headless chart rendering and LTTB downsampling.
+"""
+
+import numpy as np
+import pandas as pd
+from tokenometry.reporting import downsample, lttb_indices, prepare_backtest, render_many
+
+
+def _backtest(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2022-01-01', periods=n, freq='5min')
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    trend = np.where(np.sin(np.arange(n) / 2000) > 0, 'Bullish', 'Bearish')
+    df = pd.DataFrame({'Close': close, 'Trend': trend,
+                       'Portfolio_Value': 10_000 * close / close[0]}, index=index)
+    trades = [{'type': 'BUY', 'date': index[100], 'price': close[100]},
+              {'type': 'STOP-LOSS', 'date': index[5000], 'price': close[5000]}]
+    return df, trades
+
+
+class TestReporting:
+    """Test cases for tokenometry.reporting."""
+
+    def test_lttb_keeps_endpoints_and_extremes(self):
+        """LTTB returns the requested count, both endpoints and an isolated spike."""
+        x = np.arange(10_000)
+        y = np.zeros(10_000)
+        y[4321] = 50.0
+        idx = lttb_indices(x, y, 100)
+        assert len(idx) == 100
+        assert idx[0] == 0 and idx[-1] == 9_999
+        assert 4321 in idx
+        assert np.all(np.diff(idx) > 0)
+        assert len(lttb_indices(x[:50], y[:50], 100)) == 50
+
+    def test_downsample_series(self):
+        """Downsampling keeps a DatetimeIndex and drops NaNs."""
+        df, _ = _backtest()
+        series = df['Close'].copy()
+        series.iloc[:10] = np.nan
+        small = downsample(series, 500)
+        assert len(small) == 500
+        assert small.index[0] == series.index[10]
+        assert small.notna().all()
+
+    def test_prepare_collapses_trend_into_spans(self):
+        """Trend shading becomes one span per contiguous run."""
+        df, trades = _backtest()
+        payload = prepare_backtest(df, trades, 'BTC-USD', max_points=1000)
+        runs = (df['Trend'] != df['Trend'].shift()).sum()
+        assert len(payload['spans']['Bullish']) + len(payload['spans']['Bearish']) == runs
+        assert len(payload['equity']) == 1000
+        assert payload['trades']['STOP-LOSS'][1] == [trades[1]['price']]
+
+    def test_render_many_writes_files(self, tmp_path):
+        """Charts for several assets are written in parallel as PNG and SVG."""
+        backtests = [(p, *_backtest(seed=i)) for i, p in enumerate(['BTC-USD', 'ETH-USD', 'SOL-USD'])]
+        paths = render_many(backtests, str(tmp_path), workers=2, max_points=500)
+        assert sorted(paths) == ['BTC-USD', 'ETH-USD', 'SOL-USD']
+        with open(paths['ETH-USD'], 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+        svg = render_many(backtests[:1], str(tmp_path), fmt='svg', max_points=500)
+        with open(svg['BTC-USD']) as f:
+            assert '<svg' in f.read()
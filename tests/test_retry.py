@@ -0,0 +1,126 @@
+"""
+Tests for retries, backoff and hedged requests.
+"""
+
+import logging
+import random
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from tokenometry import Tokenometry
+from tokenometry.metrics import MetricsRegistry
+from tokenometry.retry import HedgedCaller, RetryPolicy, is_retryable
+
+
+class HttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f'HTTP {status}')
+        self.response = Mock(status_code=status)
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Delays stay within the exponential envelope and the cap."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, rng=random.Random(1))
+        for retry in range(8):
+            delays = [policy.backoff(retry) for _ in range(50)]
+            assert all(0 <= d <= min(1.0, 0.1 * 2 ** retry) for d in delays)
+            assert len(set(delays)) > 1
+
+    def test_retries_transient_errors_only(self):
+        """Timeouts and 5xx are retried; a 404 fails immediately."""
+        sleeps = []
+        policy = RetryPolicy(attempts=3, sleep=sleeps.append)
+        fn = Mock(side_effect=[TimeoutError(), HttpError(503), 'ok'])
+        assert policy.call(fn) == 'ok'
+        assert len(sleeps) == 2
+
+        fn = Mock(side_effect=HttpError(404))
+        with pytest.raises(HttpError):
+            policy.call(fn)
+        assert fn.call_count == 1
+        assert is_retryable(HttpError(429)) and not is_retryable(HttpError(400))
+
+    def test_gives_up_after_attempts(self):
+        """The last error is raised once attempts run out."""
+        fn = Mock(side_effect=ConnectionError('down'))
+        with pytest.raises(ConnectionError):
+            RetryPolicy(attempts=4, sleep=lambda d: None).call(fn)
+        assert fn.call_count == 4
+
+
+class TestHedgedCaller:
+    """Test cases for HedgedCaller."""
+
+    def _warm(self, hedger, n=20):
+        for _ in range(n):
+            hedger.call(lambda: time.sleep(0.001))
+
+    def test_slow_call_is_hedged(self):
+        """A call slower than the latency quantile is duplicated and the fast copy wins."""
+        hedger = HedgedCaller(quantile=0.95, min_samples=20, budget=1.0)
+        self._warm(hedger)
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(None)
+            if len(calls) == 1:
+                release.wait(2)
+                return 'slow'
+            return 'fast'
+
+        on_hedge = Mock()
+        start = time.monotonic()
+        assert hedger.call(fn, timeout=2, on_hedge=on_hedge) == 'fast'
+        assert time.monotonic() - start < 0.5
+        on_hedge.assert_called_once()
+        release.set()
+        hedger.close()
+
+    def test_budget_limits_hedges(self):
+        """Hedges never exceed the budgeted fraction of calls."""
+        hedger = HedgedCaller(quantile=0.5, min_samples=5, budget=0.1)
+        self._warm(hedger, 5)
+        for _ in range(30):
+            hedger.call(lambda: time.sleep(0.005))
+        assert hedger.hedges <= 0.1 * hedger.calls + 1
+        hedger.close()
+
+    def test_timeout_raises(self):
+        """A call that outlives its timeout raises TimeoutError."""
+        hedger = HedgedCaller()
+        release = threading.Event()
+        with pytest.raises(TimeoutError):
+            hedger.call(lambda: release.wait(2), timeout=0.05)
+        release.set()
+        hedger.close()
+
+
+class TestScannerRetries:
+    """Retries wired into Tokenometry._get_historical_data."""
+
+    def test_transient_error_does_not_drop_asset(self, base_config, fake_client):
+        """A failed candle request is retried instead of returning None."""
+        config = dict(base_config, RETRY_ATTEMPTS=3, RETRY_BASE_DELAY=0.0)
+        bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+        fake_client.get_public_candles = Mock(side_effect=_fail_once(fake_client.get_public_candles))
+        bot.client = fake_client
+        data = bot._get_historical_data('BTC-USD', 'ONE_HOUR')
+        assert data is not None and not data.empty
+        assert bot.metrics.request_retries.value(endpoint='get_public_candles') == 1
+
+
+def _fail_once(fn):
+    state = {'failed': False}
+
+    def call(**kwargs):
+        if not state['failed']:
+            state['failed'] = True
+            raise TimeoutError('read timed out')
+        return fn(**kwargs)
+    return call
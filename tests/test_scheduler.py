@@ -0,0 +1,75 @@
+"""
+Tests for the crossover-proximity refresh index.
+"""
+
+import logging
+from unittest.mock import Mock
+
+import pytest
+from tokenometry import Tokenometry
+from tokenometry.metrics import MetricsRegistry
+from tokenometry.scheduler import ProximityIndex
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProximityIndex:
+    """Test cases for ProximityIndex."""
+
+    def test_interval_tiers(self):
+        """Near assets refresh fast, far assets slow, with interpolation between."""
+        index = ProximityIndex(fast_seconds=60, slow_seconds=600, near_atr=0.5, far_atr=3.0)
+        assert index.interval(None) == 60
+        assert index.interval(0.1) == 60
+        assert index.interval(10.0) == 600
+        assert index.interval(1.75) == pytest.approx(330)
+
+    def test_due_follows_schedule(self):
+        """Unknown assets are due at once; scored assets become due on their cadence."""
+        clock = FakeClock()
+        index = ProximityIndex(fast_seconds=60, slow_seconds=600, clock=clock)
+        universe = ['BTC-USD', 'ETH-USD', 'SOL-USD']
+        assert index.due(universe) == universe
+        index.update('BTC-USD', 0.2)
+        index.update('ETH-USD', 5.0)
+        index.update('SOL-USD', 1.0)
+        assert index.due(universe) == []
+        clock.now = 61
+        assert index.due(universe) == ['BTC-USD']
+        index.update('BTC-USD', 10.0)
+        clock.now = 130
+        assert index.due(universe) == []
+        clock.now = 650
+        assert index.due(universe) == ['ETH-USD', 'SOL-USD']
+
+    def test_update_supersedes_previous_entry(self):
+        """Re-scoring an asset replaces its earlier due time."""
+        clock = FakeClock()
+        index = ProximityIndex(fast_seconds=60, slow_seconds=600, clock=clock)
+        index.update('BTC-USD', 5.0)
+        index.update('BTC-USD', 0.1)
+        clock.now = 61
+        assert index.due(['BTC-USD']) == ['BTC-USD']
+        assert index.proximity('BTC-USD') == 0.1
+
+    def test_scan_refreshes_only_due_assets(self, base_config, fake_client):
+        """A second scan inside the slow interval only touches near-cross assets."""
+        config = dict(base_config, PRODUCT_IDS=['BTC-USD', 'ETH-USD', 'SOL-USD', 'AVAX-USD'],
+                      ADAPTIVE_REFRESH_ENABLED=True, REFRESH_FAST_SECONDS=0, PROXIMITY_NEAR_ATR=0.5,
+                      PROXIMITY_FAR_ATR=3.0)
+        bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+        bot.client = fake_client
+        bot.scan()
+        near = [p for p in config['PRODUCT_IDS'] if bot.refresh_index.proximity(p) <= 0.5]
+        assert 0 < len(near) < len(config['PRODUCT_IDS'])
+        assert len(fake_client.calls) == 2 * len(config['PRODUCT_IDS'])
+        fake_client.calls.clear()
+        bot.scan()
+        refreshed = sorted({product_id for product_id, _ in fake_client.calls})
+        assert refreshed == sorted(near)
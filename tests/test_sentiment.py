@@ -0,0 +1,111 @@
+"""
+Tests for the cached news sentiment service.
+"""
+
+from tokenometry.metrics import MetricsRegistry, ScannerMetrics
+from tokenometry.sentiment import SentimentService
+
+
+def keyword_polarity(title):
+    """A deterministic stand-in for TextBlob."""
+    return 0.5 if 'surge' in title else -0.5 if 'crash' in title else 0.0
+
+
+class _Response:
+    def __init__(self, articles):
+        self._articles = articles
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'articles': self._articles}
+
+
+class FakeNewsApi:
+    def __init__(self, headlines):
+        self.headlines = headlines
+        self.queries = []
+
+    def __call__(self, url, params=None):
+        term = params['q']
+        self.queries.append(term)
+        return _Response([{'url': f'https://news/{term}/{i}', 'title': t}
+                          for i, t in enumerate(self.headlines.get(term, []))])
+
+
+class CountingScorer:
+    def __init__(self):
+        self.titles = []
+
+    def __call__(self, title):
+        self.titles.append(title)
+        return keyword_polarity(title)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _service(news, scorer, clock, **kwargs):
+    return SentimentService('key', fetch=news, scorer=scorer, clock=clock,
+                            metrics=ScannerMetrics(MetricsRegistry()), **kwargs)
+
+
+class TestSentimentService:
+    """Test cases for SentimentService."""
+
+    def test_labels_match_average_polarity(self):
+        """Labels follow the thresholds applied to the per-asset average."""
+        news = FakeNewsApi({'BTC': ['BTC surge', 'BTC flat'], 'ETH': ['ETH crash', 'ETH crash again'], 'SOL': []})
+        service = _service(news, keyword_polarity, Clock())
+        assert service.label_many(['BTC-USD', 'ETH-USD', 'SOL-USD']) == {
+            'BTC-USD': 'Positive', 'ETH-USD': 'Negative', 'SOL-USD': 'Neutral'}
+
+    def test_only_new_headlines_are_scored(self):
+        """Cached headlines are not rescored and article lists are reused within fetch_ttl."""
+        news = FakeNewsApi({'BTC': ['BTC surge', 'BTC flat']})
+        scorer, clock = CountingScorer(), Clock()
+        service = _service(news, scorer, clock, fetch_ttl=60)
+        service.sentiment('BTC-USD')
+        service.sentiment('BTC-USD')
+        assert news.queries == ['BTC']
+
+        clock.now = 120
+        news.headlines['BTC'].append('BTC surge again')
+        service.sentiment('BTC-USD')
+        assert news.queries == ['BTC', 'BTC']
+        assert scorer.titles == ['BTC surge', 'BTC flat', 'BTC surge again']
+        assert service.metrics.cache_requests.value(cache='sentiment', result='hit') == 4
+
+    def test_polarity_expires_after_ttl(self):
+        """Headlines are rescored once their polarity expires."""
+        news = FakeNewsApi({'BTC': ['BTC surge']})
+        scorer, clock = CountingScorer(), Clock()
+        service = _service(news, scorer, clock, ttl=100, fetch_ttl=0)
+        service.sentiment('BTC-USD')
+        clock.now = 101
+        service.sentiment('BTC-USD')
+        assert scorer.titles == ['BTC surge', 'BTC surge']
+        assert service.purge() == 1
+
+    def test_process_pool_scoring(self):
+        """Scoring in a process pool gives the same labels."""
+        news = FakeNewsApi({'BTC': ['BTC surge %d' % i for i in range(8)], 'ETH': ['ETH crash'] * 8})
+        service = _service(news, keyword_polarity, Clock(), workers=2)
+        try:
+            assert service.label_many(['BTC-USD', 'ETH-USD']) == {'BTC-USD': 'Positive', 'ETH-USD': 'Negative'}
+        finally:
+            service.close()
+
+    def test_fetch_errors_are_neutral(self):
+        """An asset whose news cannot be fetched is Neutral."""
+        def failing(url, params=None):
+            raise ConnectionError('down')
+        service = _service(failing, keyword_polarity, Clock())
+        assert service.sentiment('BTC-USD') == 'Neutral'
+        assert SentimentService(None).sentiment('BTC-USD') == 'Neutral'
@@ -0,0 +1,121 @@
+"""
+Tests for single-flight de-duplication of candle requests.
+"""
+
+import logging
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from tokenometry import Tokenometry
+from tokenometry.datasources import CoinbaseSource
+from tokenometry.metrics import MetricsRegistry
+from tokenometry.singleflight import SingleFlight
+
+from .conftest import FakeClient
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight and its use in Tokenometry."""
+
+    def _concurrently(self, n, target):
+        barrier = threading.Barrier(n)
+        results = [None] * n
+
+        def run(i):
+            barrier.wait()
+            try:
+                results[i] = target(i)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Identical in-flight calls run once and every caller gets the result."""
+        group = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(None)
+            time.sleep(0.1)
+            return 'candles'
+
+        results = self._concurrently(6, lambda i: group.do('BTC-USD', fn))
+        assert len(calls) == 1
+        assert [r[0] for r in results] == ['candles'] * 6
+        assert sum(joined for _, joined in results) == 5
+        assert group.in_flight() == 0
+        assert group.do('BTC-USD', fn) == ('candles', False)
+
+    def test_errors_are_shared(self):
+        """Waiters receive the leader's exception."""
+        group = SingleFlight()
+
+        def fn():
+            time.sleep(0.05)
+            raise ConnectionError('down')
+
+        results = self._concurrently(3, lambda i: group.do('key', fn))
+        assert all(isinstance(r, ConnectionError) for r in results)
+        with pytest.raises(ConnectionError):
+            group.do('key', fn)
+
+    def test_strategies_coalesce_candle_requests(self, base_config, fake_client):
+        """Two scanners asking for the same window at once make one network call."""
+        group = SingleFlight()
+        registry = MetricsRegistry()
+        serve = fake_client.get_public_candles
+
+        def slow_candles(**kwargs):
+            time.sleep(0.1)
+            return serve(**kwargs)
+
+        fake_client.get_public_candles = slow_candles
+        source = CoinbaseSource(lambda: fake_client)
+        bots = [Tokenometry(config=base_config, logger=Mock(spec=logging.Logger), metrics=registry,
+                            singleflight=group, source=source) for _ in range(2)]
+        frames = self._concurrently(2, lambda i: bots[i]._get_historical_data('BTC-USD', 'ONE_DAY'))
+        assert len(fake_client.calls) == 1
+        assert frames[0].equals(frames[1]) and frames[0] is not frames[1]
+        assert bots[0].metrics.cache_requests.value(cache='candle_singleflight', result='hit') == 1
+
+    def test_default_strategies_coalesce(self, base_config, fake_client):
+        """Two strategies built with no source or client share the default client and one request."""
+        serve = fake_client.get_public_candles
+
+        def slow_candles(**kwargs):
+            time.sleep(0.1)
+            return serve(**kwargs)
+
+        fake_client.get_public_candles = slow_candles
+        with patch.dict('tokenometry.datasources._SHARED_CLIENTS', clear=True), \
+                patch('tokenometry.datasources._create_rest_client', return_value=fake_client) as factory:
+            bots = [Tokenometry(config=dict(base_config, STRATEGY_NAME=name), logger=Mock(spec=logging.Logger),
+                                metrics=MetricsRegistry()) for name in ('Day', 'Swing')]
+            self._concurrently(2, lambda i: bots[i]._get_historical_data('BTC-USD', 'ONE_DAY'))
+        factory.assert_called_once()
+        assert len(fake_client.calls) == 1
+
+    def test_scanners_with_different_clients_do_not_share(self, base_config):
+        """Scanners on the shared default group never receive each other's candles."""
+        clients = [FakeClient(), FakeClient()]
+        for client in clients:
+            serve = client.get_public_candles
+
+            def slow_candles(serve=serve, **kwargs):
+                time.sleep(0.1)
+                return serve(**kwargs)
+            client.get_public_candles = slow_candles
+        bots = [Tokenometry(config=base_config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry())
+                for _ in range(2)]
+        for bot, client in zip(bots, clients):
+            bot.client = client
+        self._concurrently(2, lambda i: bots[i]._get_historical_data('BTC-USD', 'ONE_DAY'))
+        assert [len(c.calls) for c in clients] == [1, 1]
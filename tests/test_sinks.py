@@ -0,0 +1,73 @@
+"""
+Tests for the buffered signal sinks.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+
+import pytest
+from tokenometry.sinks import BufferedSignalWriter, JsonlSink, SignalSink, SQLiteSink
+
+
+def _signal(i, asset='BTC-USD'):
+    return {'timestamp': f'2025-08-19 {i % 24:02d}:00:00', 'asset': asset, 'signal': 'BUY',
+            'strength': 'Medium', 'trend': 'Bullish', 'close_price': 100.0 + i,
+            'trade_plan': {'stop_loss': 95.0, 'position_size_crypto': 1.0, 'position_size_usd': 100.0}}
+
+
+class RecordingSink(SignalSink):
+    def __init__(self, gate=None):
+        self.batches = []
+        self.gate = gate
+
+    def write_batch(self, signals):
+        if self.gate is not None:
+            self.gate.wait()
+        self.batches.append(list(signals))
+
+
+class TestBufferedSignalWriter:
+    """Test cases for BufferedSignalWriter and the built-in sinks."""
+
+    def test_batches_and_flushes_on_close(self):
+        """Signals are written in batches and everything is flushed on close."""
+        sink = RecordingSink()
+        with BufferedSignalWriter(sink, batch_size=10, flush_interval=60) as writer:
+            writer.submit_many(_signal(i) for i in range(25))
+        assert [len(b) for b in sink.batches] == [10, 10, 5]
+        assert writer.written == 25
+
+    def test_backpressure_when_queue_is_full(self):
+        """A full queue blocks submit and then raises queue.Full after the timeout."""
+        gate = threading.Event()
+        writer = BufferedSignalWriter(RecordingSink(gate), max_queue=2, batch_size=1,
+                                      flush_interval=0, put_timeout=0.05)
+        try:
+            with pytest.raises(queue.Full):
+                for i in range(10):
+                    writer.submit(_signal(i))
+        finally:
+            gate.set()
+            writer.close()
+
+    def test_sqlite_sink_uses_wal(self, tmp_path):
+        """The SQLite sink stores every signal in WAL mode."""
+        path = str(tmp_path / 'signals.db')
+        with BufferedSignalWriter(SQLiteSink(path), batch_size=4, flush_interval=0.01) as writer:
+            writer.submit_many(_signal(i) for i in range(9))
+            writer.flush()
+        conn = sqlite3.connect(path)
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        rows = conn.execute('SELECT asset, close_price, trade_plan FROM signals ORDER BY id').fetchall()
+        conn.close()
+        assert len(rows) == 9
+        assert json.loads(rows[0][2])['stop_loss'] == 95.0
+
+    def test_jsonl_sink(self, tmp_path):
+        """The JSONL sink appends one object per line."""
+        path = tmp_path / 'signals.jsonl'
+        with BufferedSignalWriter(JsonlSink(str(path))) as writer:
+            writer.submit(_signal(1, 'ETH-USD'))
+        assert [json.loads(line)['asset'] for line in path.read_text().splitlines()] == ['ETH-USD']
@@ -0,0 +1,69 @@
+"""
+Tests for the persisted signal state store.
+"""
+
+import logging
+from unittest.mock import Mock
+
+from tokenometry import Tokenometry
+from tokenometry.metrics import MetricsRegistry
+from tokenometry.state import SignalStateStore
+
+
+def _make_bot(config, client, state_store):
+    bot = Tokenometry(config=config, logger=Mock(spec=logging.Logger), metrics=MetricsRegistry(),
+                      state_store=state_store)
+    bot.client = client
+    generate = bot._generate_signals
+
+    def always_buy(data):
+        data = generate(data)
+        data.iloc[-1, data.columns.get_loc('Signal')] = 1
+        return data
+
+    bot._generate_signals = always_buy
+    bot._get_trend = Mock(wraps=lambda product_id: 'Bullish')
+    return bot
+
+
+class TestSignalStateStore:
+    """Test cases for SignalStateStore and its use in scan()."""
+
+    def test_state_survives_reopen(self, tmp_path):
+        """Recorded emissions are reloaded from disk."""
+        path = str(tmp_path / 'state.db')
+        store = SignalStateStore(path)
+        store.record('S', 'BTC-USD', 'BUY', 1_700_000_000)
+        store.close()
+
+        store = SignalStateStore(path)
+        assert store.last('S', 'BTC-USD') == ('BUY', 1_700_000_000)
+        assert store.last('S', 'ETH-USD') is None
+        store.close()
+
+    def test_is_new_and_already_emitted_for(self):
+        """Only a different signal or a later candle counts as new."""
+        store = SignalStateStore(':memory:')
+        assert store.is_new('S', 'BTC-USD', 'BUY', 100)
+        store.record('S', 'BTC-USD', 'BUY', 100)
+        assert not store.is_new('S', 'BTC-USD', 'BUY', 100)
+        assert store.is_new('S', 'BTC-USD', 'SELL', 100)
+        assert store.is_new('S', 'BTC-USD', 'BUY', 200)
+        assert store.already_emitted_for('S', 'BTC-USD', 100)
+        assert not store.already_emitted_for('S', 'BTC-USD', 200)
+        assert not store.already_emitted_for('Other', 'BTC-USD', 100)
+        store.clear('S')
+        assert store.last('S', 'BTC-USD') is None
+
+    def test_repeat_scan_suppresses_signals_and_trend_fetch(self, base_config, fake_client, tmp_path):
+        """A second scan over the same candles emits nothing and skips the trend fetch."""
+        config = dict(base_config, VOLUME_FILTER_ENABLED=False)
+        store = SignalStateStore(str(tmp_path / 'state.db'))
+        bot = _make_bot(config, fake_client, store)
+
+        first = bot.scan()
+        assert {s['asset'] for s in first} == set(config['PRODUCT_IDS'])
+
+        assert bot.scan() == []
+        assert bot._get_trend.call_count == len(config['PRODUCT_IDS'])
+        store.close()
@@ -4,6 +4,10 @@ Tests for the Tokenometry package.
 
 import pytest
 import logging
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 from tokenometry import Tokenometry
 
@@ -44,7 +48,7 @@ class TestTokenometry:
     
     def test_tokenometry_initialization(self, mock_logger, sample_config):
         """Test that Tokenometry initializes correctly."""
-        with patch('tokenometry.core.RESTClient'):
+        with patch('tokenometry.core.shared_rest_client'):
             bot = Tokenometry(config=sample_config, logger=mock_logger)
             assert bot.config == sample_config
             assert bot.logger == mock_logger
@@ -55,22 +59,58 @@ class TestTokenometry:
         invalid_config = {"STRATEGY_NAME": "Invalid"}
         
         with pytest.raises(KeyError):
-            with patch('tokenometry.core.RESTClient'):
+            with patch('tokenometry.core.shared_rest_client'):
                 Tokenometry(config=invalid_config, logger=mock_logger)
     
     def test_strategy_name_access(self, mock_logger, sample_config):
         """Test accessing strategy name from configuration."""
-        with patch('tokenometry.core.RESTClient'):
+        with patch('tokenometry.core.shared_rest_client'):
             bot = Tokenometry(config=sample_config, logger=mock_logger)
             assert bot.config["STRATEGY_NAME"] == "Test Strategy"
     
     def test_product_ids_configuration(self, mock_logger, sample_config):
         """Test that product IDs are configured correctly."""
-        with patch('tokenometry.core.RESTClient'):
+        with patch('tokenometry.core.shared_rest_client'):
             bot = Tokenometry(config=sample_config, logger=mock_logger)
             assert "BTC-USD" in bot.config["PRODUCT_IDS"]
             assert len(bot.config["PRODUCT_IDS"]) == 1
 
+    def test_client_created_on_first_use(self, mock_logger, sample_config):
+        """Test that the Coinbase client is only built when first needed."""
+        with patch('tokenometry.core.shared_rest_client') as factory:
+            bot = Tokenometry(config=sample_config, logger=mock_logger)
+            factory.assert_not_called()
+            assert bot.client is factory.return_value
+            assert bot.client is factory.return_value
+            factory.assert_called_once()
+
+    def test_client_created_once_under_concurrent_first_use(self, mock_logger, sample_config):
+        """Test that scan workers racing on first use share one client."""
+        def slow_client(*args):
+            time.sleep(0.05)
+            return Mock()
+
+        with patch('tokenometry.core.shared_rest_client', side_effect=slow_client) as factory:
+            bot = Tokenometry(config=sample_config, logger=mock_logger)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                clients = list(pool.map(lambda _: bot.client, range(4)))
+            factory.assert_called_once()
+            assert all(c is clients[0] for c in clients)
+
+
+class TestImport:
+    """Regression tests for package import cost."""
+
+    def test_import_is_lazy(self):
+        """Test that `import tokenometry` defers pandas, numpy, the Coinbase SDK and dotenv."""
+        code = (
+            "import sys\n"
+            "import tokenometry\n"
+            "print(','.join(m for m in ('pandas', 'numpy', 'coinbase', 'dotenv') if m in sys.modules))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert output.strip() == ""
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
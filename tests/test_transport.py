@@ -0,0 +1,73 @@
+"""
+Tests for the shared pooled HTTP session.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from tokenometry import transport
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    """Give every test its own shared session."""
+    transport.close_session()
+    yield
+    transport.close_session()
+    transport._pool_size = transport.DEFAULT_POOL_SIZE
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    peers = set()
+
+    def do_GET(self):
+        self.peers.add(self.client_address)
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport:
+    """Test cases for the transport module."""
+
+    def test_session_is_shared(self):
+        """Every caller gets the same session object."""
+        assert transport.get_session() is transport.get_session()
+
+    def test_pool_size_only_grows_in_place(self):
+        """A larger pool size enlarges the shared session; a smaller one leaves it alone."""
+        first = transport.get_session(pool_size=4)
+        assert transport.get_session(pool_size=32) is first
+        assert first.get_adapter('https://api.coinbase.com')._pool_maxsize == 32
+        assert transport.get_session(pool_size=8) is first
+        assert first.get_adapter('https://api.coinbase.com')._pool_maxsize == 32
+
+    def test_attach_session_replaces_client_session(self):
+        """A Coinbase-style client is pointed at the shared session."""
+        client = SimpleNamespace(session=object())
+        assert transport.attach_session(client).session is transport.get_session()
+
+    def test_connections_are_reused(self):
+        """Sequential requests reuse one kept-alive TCP connection."""
+        _KeepAliveHandler.peers = set()
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/'
+            for _ in range(5):
+                assert transport.http_get(url).status_code == 200
+        finally:
+            transport.close_session()
+            server.shutdown()
+            server.server_close()
+        assert len(_KeepAliveHandler.peers) == 1
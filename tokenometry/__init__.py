@@ -6,9 +6,13 @@ supporting multiple trading strategies including day trading, swing trading,
 and long-term investment approaches.
 
 Example:
-    >>> from tokenometry import Tokenometry
+    >>> from tokenometry import Tokenometry, load_env
+    >>> load_env()  # optional: read API keys from .env
     >>> bot = Tokenometry(config=config, logger=logger)
     >>> signals = bot.scan()
+
+Submodules and their heavy dependencies (pandas, numpy, the Coinbase SDK) are
+imported on first attribute access, so ``import tokenometry`` stays cheap.
 """
 
 __version__ = "1.0.6"
@@ -17,6 +21,29 @@ __email__ = "your.email@example.com"
 __license__ = "MIT"
 __url__ = "https://github.com/nguyenph88/Tokenometry"
 
-from .core import Tokenometry
+import importlib
+
+# Public name -> submodule that defines it, resolved lazily by __getattr__.
+_LAZY_ATTRS = {
+    "Tokenometry": "core",
+    "ScanResult": "core",
+    "ScannerConfig": "config",
+    "ConfigError": "config",
+    "MissingConfigKey": "config",
+    "load_env": "env",
+}
+
+__all__ = ["Tokenometry", "ScanResult", "ScannerConfig", "ConfigError", "MissingConfigKey", "load_env"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["Tokenometry"]
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
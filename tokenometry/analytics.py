@@ -0,0 +1,236 @@
+# analytics.py
+# Vectorized performance analytics over equity curves and structured trade arrays.
+#
+# Curve functions accept a 1-D equity curve or a 2-D (runs, bars) array of
+# curves from a parameter sweep and reduce along the last axis.
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+YEAR_SECONDS = 365 * 86400  # crypto trades every day
+
+TRADE_DTYPE = np.dtype([
+    ('entry_index', np.int64),
+    ('exit_index', np.int64),
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('size', np.float64),
+])
+
+
+def periods_per_year(granularity_seconds: float) -> float:
+    """Bars per year for a candle size, e.g. 8760 for one hour."""
+    return YEAR_SECONDS / granularity_seconds
+
+
+def returns(equity: np.ndarray) -> np.ndarray:
+    """Simple per-bar returns; one element shorter than the curve."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[..., 1:] / equity[..., :-1] - 1.0
+
+
+def total_return(equity: np.ndarray) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[..., -1] / equity[..., 0] - 1.0
+
+
+def cagr(equity: np.ndarray, periods: float) -> np.ndarray:
+    """Compound annual growth rate for a curve sampled ``periods`` times a year."""
+    equity = np.asarray(equity, dtype=np.float64)
+    years = (equity.shape[-1] - 1) / periods
+    if years <= 0:
+        # A single point spans no time, so there is no growth rate
+        return np.full(equity.shape[:-1], np.nan)[()]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (equity[..., -1] / equity[..., 0]) ** (1.0 / years) - 1.0
+
+
+def sharpe(equity: np.ndarray, periods: float, risk_free: float = 0.0) -> np.ndarray:
+    """Annualised Sharpe ratio of per-bar returns; ``risk_free`` is an annual rate."""
+    excess = returns(equity) - risk_free / periods
+    std = excess.std(axis=-1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(std > 0, excess.mean(axis=-1) / std * np.sqrt(periods), np.nan)
+
+
+def sortino(equity: np.ndarray, periods: float, risk_free: float = 0.0) -> np.ndarray:
+    """Annualised Sortino ratio: mean excess return over downside deviation."""
+    excess = returns(equity) - risk_free / periods
+    downside = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2, axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(downside > 0, excess.mean(axis=-1) / downside * np.sqrt(periods), np.nan)
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """Fractional distance below the running peak at every bar (0 at new highs, negative below)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity / np.maximum.accumulate(equity, axis=-1) - 1.0
+
+
+def max_drawdown(equity: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deepest drawdown and longest time under water.
+
+    Returns:
+        (depth, duration): depth as a negative fraction, duration in bars
+        from a peak until the curve regains it (or the end of the curve).
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    dd = drawdown(equity)
+    bars = np.arange(equity.shape[-1])
+    last_peak = np.maximum.accumulate(np.where(dd >= 0, bars, 0), axis=-1)
+    return dd.min(axis=-1), (bars - last_peak).max(axis=-1)
+
+
+def rolling_sharpe(equity: np.ndarray, window: int, periods: float) -> np.ndarray:
+    """Annualised Sharpe over a sliding window of returns; NaN until the window fills."""
+    r = returns(equity)
+    out = np.full(r.shape[:-1] + (r.shape[-1] + 1,), np.nan)
+    if r.shape[-1] >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(r, window, axis=-1)
+        std = windows.std(axis=-1, ddof=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[..., window:] = np.where(std > 0, windows.mean(axis=-1) / std * np.sqrt(periods), np.nan)
+    return out
+
+
+def rolling_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    """Drawdown from the highest value of the trailing ``window`` bars."""
+    equity = np.asarray(equity, dtype=np.float64)
+    out = np.full(equity.shape, np.nan)
+    if equity.shape[-1] >= window:
+        peaks = np.lib.stride_tricks.sliding_window_view(equity, window, axis=-1).max(axis=-1)
+        out[..., window - 1:] = equity[..., window - 1:] / peaks - 1.0
+    return out
+
+
+def trades_from_ledger(trades: Sequence[Dict], index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Converts a milestone trade ledger to a structured trade array.
+
+    Entries ('BUY') are paired in order with exits ('SELL' or 'STOP-LOSS'),
+    as the milestone ``analyze_performance`` functions do; an open position
+    at the end is ignored.
+
+    Args:
+        trades: Dicts with 'type', 'date', 'price' and (for buys) 'size'
+        index: The backtest frame's index, used to locate trade bars
+
+    Returns:
+        An array of ``TRADE_DTYPE`` records.
+
+    Raises:
+        ValueError: A paired trade's date is not in ``index``
+    """
+    buys = [t for t in trades if t['type'] == 'BUY']
+    sells = [t for t in trades if t['type'] in ('SELL', 'STOP-LOSS')]
+    n = min(len(buys), len(sells))
+    out = np.empty(n, dtype=TRADE_DTYPE)
+    if n:
+        dates = pd.DatetimeIndex([t['date'] for t in buys[:n]] + [t['date'] for t in sells[:n]])
+        positions = index.get_indexer(dates)
+        if (positions < 0).any():
+            raise ValueError(f'Trade date {dates[positions < 0][0]} is not in the index.')
+        out['entry_index'] = positions[:n]
+        out['exit_index'] = positions[n:]
+        out['entry_price'] = [t['price'] for t in buys[:n]]
+        out['exit_price'] = [t['price'] for t in sells[:n]]
+        out['size'] = [t.get('size', 1.0) for t in buys[:n]]
+    return out
+
+
+def trade_pnl(trades: np.ndarray) -> np.ndarray:
+    """Profit or loss of each trade in quote currency."""
+    return (trades['exit_price'] - trades['entry_price']) * trades['size']
+
+
+def trade_returns(trades: np.ndarray) -> np.ndarray:
+    """Fractional return of each trade."""
+    return trades['exit_price'] / trades['entry_price'] - 1.0
+
+
+def win_rate(trades: np.ndarray) -> float:
+    return float(np.mean(trade_pnl(trades) > 0)) if len(trades) else float('nan')
+
+
+def profit_factor(trades: np.ndarray) -> float:
+    """Gross profit over gross loss (inf without losing trades)."""
+    pnl = trade_pnl(trades)
+    loss = -pnl[pnl < 0].sum()
+    return float(pnl[pnl > 0].sum() / loss) if loss > 0 else float('inf')
+
+
+def exposure(trades: np.ndarray, n_bars: int) -> float:
+    """Fraction of bars spent in a position (entry bar through exit bar)."""
+    if n_bars == 0:
+        return 0.0
+    delta = np.zeros(n_bars + 1, dtype=np.int64)
+    np.add.at(delta, trades['entry_index'], 1)
+    np.add.at(delta, trades['exit_index'] + 1, -1)
+    return float(np.count_nonzero(np.cumsum(delta[:-1])) / n_bars)
+
+
+def excursions(trades: np.ndarray, high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Maximum adverse and favourable excursion of each long trade.
+
+    Computed with one ``reduceat`` over the high and low arrays; trades must
+    be sorted and non-overlapping, as a single-position backtest produces.
+
+    Returns:
+        (mae, mfe) as fractions of the entry price; MAE is <= 0, MFE >= 0.
+    """
+    if len(trades) == 0:
+        return np.empty(0), np.empty(0)
+    # A sentinel bar lets the last exit+1 be a valid reduceat boundary
+    high = np.append(np.asarray(high, dtype=np.float64), np.nan)
+    low = np.append(np.asarray(low, dtype=np.float64), np.nan)
+    bounds = np.column_stack((trades['entry_index'], trades['exit_index'] + 1)).ravel()
+    worst = np.minimum.reduceat(low, bounds)[::2]
+    best = np.maximum.reduceat(high, bounds)[::2]
+    entry = trades['entry_price']
+    return np.minimum(worst / entry - 1.0, 0.0), np.maximum(best / entry - 1.0, 0.0)
+
+
+def summarize(equity: np.ndarray, periods: float, trades: Optional[np.ndarray] = None,
+              high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None,
+              risk_free: float = 0.0) -> Dict[str, float]:
+    """
+    All headline metrics for one backtest.
+
+    Args:
+        equity: Portfolio value per bar
+        periods: Bars per year (see ``periods_per_year``)
+        trades: Optional ``TRADE_DTYPE`` array for trade statistics
+        high: Optional bar highs, with ``low``, for MAE/MFE
+        low: Optional bar lows
+        risk_free: Annual risk-free rate
+
+    Returns:
+        A flat dict of metric name to value.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    depth, duration = max_drawdown(equity)
+    summary = {
+        'total_return': float(total_return(equity)),
+        'cagr': float(cagr(equity, periods)),
+        'sharpe': float(sharpe(equity, periods, risk_free)),
+        'sortino': float(sortino(equity, periods, risk_free)),
+        'max_drawdown': float(depth),
+        'max_drawdown_duration': int(duration),
+    }
+    if trades is not None:
+        summary.update({
+            'trades': len(trades),
+            'win_rate': win_rate(trades),
+            'profit_factor': profit_factor(trades),
+            'exposure': exposure(trades, len(equity)),
+            'avg_trade_return': float(trade_returns(trades).mean()) if len(trades) else float('nan'),
+        })
+        if high is not None and low is not None and len(trades):
+            mae, mfe = excursions(trades, high, low)
+            summary.update({'avg_mae': float(mae.mean()), 'avg_mfe': float(mfe.mean()),
+                            'worst_mae': float(mae.min()), 'best_mfe': float(mfe.max())})
+    return summary
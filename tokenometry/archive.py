@@ -0,0 +1,195 @@
+# archive.py
+# On-disk, memory-mapped candle history for out-of-core backtests.
+
+import json
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .compact import OHLCV_COLUMNS, CompactCandles
+
+TIMESTAMP_FILE = 'timestamp.i8'
+META_FILE = 'meta.json'
+
+
+def _to_epoch_seconds(index) -> np.ndarray:
+    if isinstance(index, pd.DatetimeIndex):
+        return index.as_unit('s').asi8
+    return np.asarray(index, dtype=np.int64)
+
+
+class ArchivedSeries:
+    """
+    One (asset, granularity) history mapped lazily from disk.
+
+    Nothing is read at open time beyond ``meta.json``; columns are
+    ``np.memmap`` views, so only the pages a backtest touches become resident.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            meta = json.load(f)
+        self.columns: List[str] = meta['columns']
+        self.dtype = np.dtype(meta['dtype'])
+        # A crash between writing data and meta leaves extra bytes; trust the shorter
+        sizes = [os.path.getsize(os.path.join(path, TIMESTAMP_FILE)) // 8]
+        sizes += [os.path.getsize(self._column_path(c)) // self.dtype.itemsize for c in self.columns]
+        self._length = min([meta['length']] + sizes)
+        self._maps = {}
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.path, f'{column}.{self.dtype.kind}{self.dtype.itemsize}')
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _map(self, key: str, path: str, dtype) -> np.ndarray:
+        if key not in self._maps:
+            if self._length == 0:
+                self._maps[key] = np.empty(0, dtype=dtype)
+            else:
+                self._maps[key] = np.memmap(path, dtype=dtype, mode='r', shape=(self._length,))
+        return self._maps[key]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Memory-mapped int64 epoch seconds (the index sidecar)."""
+        return self._map(TIMESTAMP_FILE, os.path.join(self.path, TIMESTAMP_FILE), np.int64)
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped values of one column."""
+        if name not in self.columns:
+            raise KeyError(name)
+        return self._map(name, self._column_path(name), self.dtype)
+
+    def locate(self, start=None, end=None) -> Tuple[int, int]:
+        """Row range [i, j) covering timestamps in [start, end); a binary search on the sidecar."""
+        timestamps = self.timestamps
+        i = 0 if start is None else int(np.searchsorted(timestamps, _to_epoch_seconds(pd.DatetimeIndex([start]))[0]))
+        j = len(timestamps) if end is None else int(np.searchsorted(timestamps, _to_epoch_seconds(pd.DatetimeIndex([end]))[0]))
+        return i, j
+
+    def frame(self, start=None, end=None, rows: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+        """
+        Materialises a row range as a Tokenometry-style DataFrame.
+
+        Args:
+            start: Inclusive start timestamp (anything ``pd.Timestamp`` accepts)
+            end: Exclusive end timestamp
+            rows: Explicit [i, j) row range, overriding start/end
+
+        Returns:
+            A DataFrame with a DatetimeIndex and the archived columns.
+        """
+        i, j = rows if rows is not None else self.locate(start, end)
+        data = {c: np.asarray(self.column(c)[i:j], dtype=np.float64) for c in self.columns}
+        index = pd.to_datetime(np.asarray(self.timestamps[i:j]), unit='s')
+        index.name = 'timestamp'
+        return pd.DataFrame(data, index=index)
+
+    def iter_frames(self, chunk_rows: int = 100_000, warmup: int = 0,
+                    start=None, end=None) -> Iterator[pd.DataFrame]:
+        """
+        Pages through the history in fixed-size chunks.
+
+        Each chunk is preceded by ``warmup`` rows of the previous one, so
+        rolling and recursive indicators can be computed per chunk; drop the
+        first ``warmup`` rows of every chunk but the first after computing.
+        """
+        first, last = self.locate(start, end)
+        for i in range(first, last, chunk_rows):
+            yield self.frame(rows=(max(first, i - warmup), min(last, i + chunk_rows)))
+
+    def close(self) -> None:
+        """Drops the memory maps."""
+        self._maps.clear()
+
+
+class HistoryArchive:
+    """
+    A directory of fixed-width column files, one set per (asset, granularity):
+
+        <root>/<granularity>/<asset>/timestamp.i8   int64 epoch seconds, ascending
+        <root>/<granularity>/<asset>/<Column>.f8    one value per timestamp
+        <root>/<granularity>/<asset>/meta.json      columns, dtype, length
+
+    Appends only write rows newer than the last stored timestamp, so the
+    archive can be topped up from each scan.
+    """
+
+    def __init__(self, root: str, dtype=np.float64):
+        self.root = root
+        self.dtype = np.dtype(dtype)
+
+    def _path(self, asset: str, granularity: str) -> str:
+        return os.path.join(self.root, granularity, asset)
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """Stored (asset, granularity) pairs."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted((asset, granularity)
+                      for granularity in os.listdir(self.root)
+                      for asset in os.listdir(os.path.join(self.root, granularity))
+                      if os.path.exists(os.path.join(self.root, granularity, asset, META_FILE)))
+
+    def open(self, asset: str, granularity: str) -> ArchivedSeries:
+        """Maps one series; raises FileNotFoundError if it was never written."""
+        return ArchivedSeries(self._path(asset, granularity))
+
+    def append(self, asset: str, granularity: str, data: Union[pd.DataFrame, CompactCandles],
+               columns: Optional[Sequence[str]] = None) -> int:
+        """
+        Appends candles newer than what is already stored.
+
+        Args:
+            asset: Product ID, e.g. 'BTC-USD'
+            granularity: Coinbase granularity name
+            data: A DataFrame with a DatetimeIndex (as returned by the scanner)
+                or a CompactCandles window
+            columns: Columns to store when creating the series; defaults to OHLCV
+
+        Returns:
+            The number of rows written.
+        """
+        if isinstance(data, CompactCandles):
+            data = data.to_frame()
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        path = self._path(asset, granularity)
+        meta_path = os.path.join(path, META_FILE)
+
+        if os.path.exists(meta_path):
+            series = ArchivedSeries(path)
+            columns, dtype, length = series.columns, series.dtype, len(series)
+            last = int(series.timestamps[-1]) if length else None
+            series.close()
+        else:
+            os.makedirs(path, exist_ok=True)
+            columns, dtype, length, last = list(columns or OHLCV_COLUMNS), self.dtype, 0, None
+
+        timestamps = _to_epoch_seconds(data.index)
+        if last is not None:
+            keep = timestamps > last
+            data, timestamps = data[keep], timestamps[keep]
+        if len(timestamps) == 0:
+            return 0
+
+        with open(os.path.join(path, TIMESTAMP_FILE), 'r+b' if length else 'wb') as f:
+            f.seek(length * 8)
+            f.truncate()
+            f.write(timestamps.astype('<i8').tobytes())
+        for column in columns:
+            with open(os.path.join(path, f'{column}.{dtype.kind}{dtype.itemsize}'), 'r+b' if length else 'wb') as f:
+                f.seek(length * dtype.itemsize)
+                f.truncate()
+                f.write(data[column].to_numpy(dtype=dtype).tobytes())
+
+        # Meta is written last and atomically, so readers never see a length past the data
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'columns': list(columns), 'dtype': dtype.str, 'length': length + len(timestamps)}, f)
+        os.replace(tmp_path, meta_path)
+        return len(timestamps)
@@ -0,0 +1,266 @@
+# arena.py
+# A shared-memory arena of candle and indicator arrays for multi-process workers.
+
+import logging
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .compact import OHLCV_COLUMNS
+
+# Before Python 3.13 every attach registers the block with the resource tracker
+_ATTACH_TRACKED = sys.version_info < (3, 13)
+_MAGIC = b'TKNARENA'
+_ALIGN = 64
+
+_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('n_slots', '<i8'),
+    ('capacity', '<i8'),
+    ('n_fields', '<i8'),
+    ('dtype', 'S8'),
+])
+_FIELD_DTYPE = np.dtype('S32')
+_SLOT_DTYPE = np.dtype([
+    ('asset', 'S32'),
+    ('granularity', 'S16'),
+    ('length', '<i8'),
+])
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _layout(n_slots: int, capacity: int, n_fields: int, dtype: np.dtype) -> Tuple[int, int, int, int, int]:
+    """Returns byte offsets of the field names, slot table, timestamps, values, and the total size."""
+    fields_offset = _aligned(_HEADER_DTYPE.itemsize)
+    slots_offset = _aligned(fields_offset + n_fields * _FIELD_DTYPE.itemsize)
+    timestamps_offset = _aligned(slots_offset + n_slots * _SLOT_DTYPE.itemsize)
+    values_offset = _aligned(timestamps_offset + n_slots * capacity * 8)
+    total = values_offset + n_slots * n_fields * capacity * dtype.itemsize
+    return fields_offset, slots_offset, timestamps_offset, values_offset, total
+
+
+def _open_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # Processes that only attach must not unlink the block on exit
+    if not _ATTACH_TRACKED:
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class CandleArena:
+    """
+    OHLCV and indicator arrays for many (asset, granularity) pairs in one
+    ``multiprocessing.shared_memory`` block.
+
+    Layout: a small header (slot count, rows per slot, field names, dtype),
+    a slot table of (asset, granularity, length), then an int64 timestamp
+    block of shape (n_slots, capacity) and a value block of shape
+    (n_slots, n_fields, capacity). Each field of each slot is contiguous, so
+    workers read and write slices in place and the parent builds pandas views
+    over the same memory; only the arena name crosses process boundaries.
+
+    Create it in the parent with ``CandleArena.create`` and open it in workers
+    with ``CandleArena.attach(name)``. The creator should ``unlink()`` it when
+    done.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        header = np.ndarray((1,), dtype=_HEADER_DTYPE, buffer=shm.buf)[0]
+        if bytes(header['magic']) != _MAGIC:
+            raise ValueError(f"Shared memory block '{shm.name}' is not a candle arena.")
+        self.n_slots = int(header['n_slots'])
+        self.capacity = int(header['capacity'])
+        n_fields = int(header['n_fields'])
+        self.dtype = np.dtype(header['dtype'].decode())
+        fields_offset, slots_offset, timestamps_offset, values_offset, _ = _layout(
+            self.n_slots, self.capacity, n_fields, self.dtype)
+
+        names = np.ndarray((n_fields,), dtype=_FIELD_DTYPE, buffer=shm.buf, offset=fields_offset)
+        self.fields: Tuple[str, ...] = tuple(n.decode() for n in names)
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+        self._slots = np.ndarray((self.n_slots,), dtype=_SLOT_DTYPE, buffer=shm.buf, offset=slots_offset)
+        self._timestamps = np.ndarray((self.n_slots, self.capacity), dtype=np.int64,
+                                      buffer=shm.buf, offset=timestamps_offset)
+        self._values = np.ndarray((self.n_slots, n_fields, self.capacity), dtype=self.dtype,
+                                  buffer=shm.buf, offset=values_offset)
+        self._slot_index = {(s['asset'].decode(), s['granularity'].decode()): i
+                            for i, s in enumerate(self._slots)}
+
+    @classmethod
+    def create(cls, keys: Iterable[Tuple[str, str]], fields: Sequence[str] = OHLCV_COLUMNS,
+               capacity: int = 300, dtype=np.float64, name: Optional[str] = None) -> 'CandleArena':
+        """
+        Allocates an arena.
+
+        Args:
+            keys: (asset, granularity) pairs, one slot each
+            fields: Column names stored per slot (OHLCV plus any indicators)
+            capacity: Maximum candles per slot
+            dtype: Value dtype, float64 or float32
+            name: Optional shared memory name; generated if omitted
+
+        Returns:
+            The arena, owned by the calling process.
+        """
+        keys = list(dict.fromkeys(keys))
+        fields = list(fields)
+        dtype = np.dtype(dtype)
+        if dtype not in (np.dtype(np.float64), np.dtype(np.float32)):
+            raise ValueError('dtype must be float64 or float32.')
+        for asset, granularity in keys:
+            if len(asset.encode()) > 32 or len(granularity.encode()) > 16:
+                raise ValueError(f"Key {(asset, granularity)} exceeds the 32/16 byte slot key limits.")
+        if any(len(f.encode()) > 32 for f in fields):
+            raise ValueError('Field names are limited to 32 bytes.')
+
+        fields_offset, slots_offset, _, _, total = _layout(len(keys), capacity, len(fields), dtype)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=total)
+        np.ndarray((1,), dtype=_HEADER_DTYPE, buffer=shm.buf)[0] = (
+            _MAGIC, len(keys), capacity, len(fields), dtype.str.encode())
+        np.ndarray((len(fields),), dtype=_FIELD_DTYPE, buffer=shm.buf, offset=fields_offset)[:] = [
+            f.encode() for f in fields]
+        slots = np.ndarray((len(keys),), dtype=_SLOT_DTYPE, buffer=shm.buf, offset=slots_offset)
+        for i, (asset, granularity) in enumerate(keys):
+            slots[i] = (asset.encode(), granularity.encode(), 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'CandleArena':
+        """Opens an existing arena by name without copying it."""
+        return cls(_open_shared_memory(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self._slot_index)
+
+    def _slot(self, asset: str, granularity: str) -> int:
+        try:
+            return self._slot_index[(asset, granularity)]
+        except KeyError:
+            raise KeyError(f"No arena slot for {(asset, granularity)}") from None
+
+    def length(self, asset: str, granularity: str) -> int:
+        return int(self._slots['length'][self._slot(asset, granularity)])
+
+    def timestamps(self, asset: str, granularity: str) -> np.ndarray:
+        """Zero-copy view of a slot's int64 epoch-second timestamps."""
+        slot = self._slot(asset, granularity)
+        return self._timestamps[slot, :self._slots['length'][slot]]
+
+    def values(self, asset: str, granularity: str) -> np.ndarray:
+        """Zero-copy (n_fields, length) view of a slot's values."""
+        slot = self._slot(asset, granularity)
+        return self._values[slot, :, :self._slots['length'][slot]]
+
+    def column(self, asset: str, granularity: str, field: str) -> np.ndarray:
+        """Zero-copy view of one field of one slot; writes go straight to shared memory."""
+        slot = self._slot(asset, granularity)
+        return self._values[slot, self._field_index[field], :self._slots['length'][slot]]
+
+    def write(self, asset: str, granularity: str, timestamps: np.ndarray,
+              columns: Mapping[str, np.ndarray]) -> None:
+        """
+        Stores a window in a slot, replacing its previous contents.
+
+        Fields missing from ``columns`` are filled with NaN.
+        """
+        slot = self._slot(asset, granularity)
+        n = len(timestamps)
+        if n > self.capacity:
+            raise ValueError(f"Window of {n} candles exceeds arena capacity {self.capacity}.")
+        self._timestamps[slot, :n] = timestamps
+        block = self._values[slot]
+        block[:, :n] = np.nan
+        for field, column in columns.items():
+            block[self._field_index[field], :n] = column
+        self._slots['length'][slot] = n
+
+    def write_frame(self, asset: str, granularity: str, df: pd.DataFrame) -> None:
+        """Stores a Tokenometry DataFrame (DatetimeIndex, OHLCV and indicator columns)."""
+        timestamps = df.index.as_unit('s').asi8 if isinstance(df.index, pd.DatetimeIndex) else df.index.to_numpy()
+        self.write(asset, granularity, timestamps,
+                   {c: df[c].to_numpy() for c in df.columns if c in self._field_index})
+
+    def frame(self, asset: str, granularity: str) -> pd.DataFrame:
+        """
+        A DataFrame over the slot's shared buffers.
+
+        The values are not copied: the frame's single block is the slot's
+        (n_fields, length) array, so writes by workers are visible through it.
+        """
+        values = self.values(asset, granularity)
+        index = pd.to_datetime(self.timestamps(asset, granularity), unit='s')
+        index.name = 'timestamp'
+        return pd.DataFrame(values.T, index=index, columns=list(self.fields), copy=False)
+
+    def close(self) -> None:
+        """Releases this process's mapping (views must no longer be used)."""
+        self._slots = self._timestamps = self._values = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroys the shared block; call once, from the creator."""
+        if _ATTACH_TRACKED:
+            # A worker sharing this process's tracker dropped the registration
+            # on attach; restore it so ``unlink`` has one to remove.
+            resource_tracker.register(self._shm._name, 'shared_memory')
+        self._shm.unlink()
+
+    def __enter__(self) -> 'CandleArena':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __reduce__(self):
+        # Pickling an arena ships only its name; the receiver attaches.
+        return (CandleArena.attach, (self.name,))
+
+
+def compute_indicators(arena_name: str, asset: str, granularity: str, config: dict) -> Tuple[str, str]:
+    """
+    Process-pool entry point: computes a slot's indicators in place.
+
+    Attaches to the arena, runs the scanner's indicator pipeline on the slot's
+    OHLCV, and writes every indicator column the arena has a field for back
+    into shared memory. Only the arena name, the key and the config are
+    pickled.
+
+    Returns:
+        The (asset, granularity) key, so callers can match completions.
+    """
+    from .core import Tokenometry
+    from .metrics import MetricsRegistry
+
+    logger = logging.getLogger('Tokenometry.arena')
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+
+    arena = CandleArena.attach(arena_name)
+    try:
+        scanner = Tokenometry(config=config, logger=logger, metrics=MetricsRegistry())
+        window = arena.frame(asset, granularity)[list(OHLCV_COLUMNS)].astype(np.float64)
+        result = scanner._calculate_indicators(window)
+        for field in arena.fields:
+            if field not in OHLCV_COLUMNS and field in result.columns:
+                arena.column(asset, granularity, field)[:] = result[field].to_numpy()
+        del window, result
+    finally:
+        arena.close()
+    return asset, granularity
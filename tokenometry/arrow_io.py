@@ -0,0 +1,217 @@
+# arrow_io.py
+# Arrow and Parquet readers/writers for candle windows, indicator frames and signals.
+#
+# pyarrow is an optional dependency: pip install "tokenometry[arrow]"
+
+import uuid
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .compact import CompactCandles
+
+CANDLE_PARTITIONS = ('granularity', 'asset', 'date')
+SIGNAL_PARTITIONS = ('asset', 'date')
+
+_TRADE_PLAN_FIELDS = ('stop_loss', 'position_size_crypto', 'position_size_usd')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset  # noqa: F401
+    except ImportError as e:
+        raise ImportError('Arrow/Parquet support requires pyarrow: pip install "tokenometry[arrow]"') from e
+    return pyarrow
+
+
+def _column_array(pa, values: np.ndarray):
+    """Wraps a numpy column without copying when it is contiguous and null-free."""
+    return pa.array(np.ascontiguousarray(values))
+
+
+def frame_to_table(data: Union[pd.DataFrame, CompactCandles], asset: Optional[str] = None,
+                   granularity: Optional[str] = None):
+    """
+    Converts a candle window or indicator frame to an Arrow table.
+
+    Numeric columns are wrapped zero-copy where numpy already holds them
+    contiguously; the DatetimeIndex becomes a ``timestamp[s]`` column. Asset
+    and granularity, when given, are added as dictionary-encoded columns and
+    a ``date`` column is derived for partitioning.
+
+    Args:
+        data: A scanner DataFrame (e.g. from ``_calculate_indicators``) or CompactCandles
+        asset: Optional product ID column value
+        granularity: Optional granularity column value
+
+    Returns:
+        A ``pyarrow.Table``.
+    """
+    pa = _require_pyarrow()
+    if isinstance(data, CompactCandles):
+        epoch = data.timestamps
+        columns = {name: data.column(name) for name in data.columns}
+    else:
+        epoch = data.index.as_unit('s').asi8 if isinstance(data.index, pd.DatetimeIndex) else data.index.to_numpy()
+        columns = {name: data[name].to_numpy() for name in data.columns}
+
+    arrays = {'timestamp': _column_array(pa, np.asarray(epoch, dtype=np.int64)).view(pa.timestamp('s'))}
+    arrays.update({name: _column_array(pa, values) for name, values in columns.items()})
+    n = len(epoch)
+    if asset is not None:
+        arrays['asset'] = pa.DictionaryArray.from_arrays(pa.array(np.zeros(n, dtype=np.int32)), [asset])
+    if granularity is not None:
+        arrays['granularity'] = pa.DictionaryArray.from_arrays(pa.array(np.zeros(n, dtype=np.int32)), [granularity])
+    if asset is not None or granularity is not None:
+        arrays['date'] = arrays['timestamp'].cast(pa.date32())
+    return pa.table(arrays)
+
+
+def table_to_frame(table) -> pd.DataFrame:
+    """
+    Converts an Arrow table back to a scanner-style DataFrame.
+
+    Returns:
+        A DataFrame indexed by a DatetimeIndex named 'timestamp', without the
+        partition columns.
+    """
+    drop = [c for c in ('asset', 'granularity', 'date') if c in table.column_names]
+    df = table.drop(drop).to_pandas()
+    df['timestamp'] = pd.to_datetime(df['timestamp']).astype('datetime64[ns]')
+    return df.set_index('timestamp').sort_index()
+
+
+def signals_to_table(signals: Sequence[Dict]):
+    """
+    Converts ``scan()`` results to an Arrow table.
+
+    The nested ``trade_plan`` is flattened into ``stop_loss``,
+    ``position_size_crypto`` and ``position_size_usd`` columns (null for SELL
+    signals and BUYs without a plan).
+    """
+    pa = _require_pyarrow()
+    timestamps = pd.to_datetime([s['timestamp'] for s in signals])
+    columns = {
+        'timestamp': pa.array(timestamps.as_unit('s').asi8, type=pa.int64()).view(pa.timestamp('s')),
+        'asset': pa.array([s['asset'] for s in signals], type=pa.string()),
+        'signal': pa.array([s['signal'] for s in signals], type=pa.string()),
+        'strength': pa.array([s.get('strength') for s in signals], type=pa.string()),
+        'trend': pa.array([s.get('trend') for s in signals], type=pa.string()),
+        'close_price': pa.array([float(s['close_price']) for s in signals], type=pa.float64()),
+    }
+    for field in _TRADE_PLAN_FIELDS:
+        columns[field] = pa.array([(s.get('trade_plan') or {}).get(field) for s in signals], type=pa.float64())
+    columns['date'] = columns['timestamp'].cast(pa.date32())
+    return pa.table(columns)
+
+
+def table_to_signals(table) -> List[Dict]:
+    """Converts a signals table back to the list-of-dicts shape returned by ``scan()``."""
+    signals = []
+    for row in table.to_pylist():
+        plan = {f: row[f] for f in _TRADE_PLAN_FIELDS if row.get(f) is not None}
+        signals.append({
+            'timestamp': row['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
+            'asset': row['asset'],
+            'signal': row['signal'],
+            'strength': row['strength'],
+            'trend': row['trend'],
+            'close_price': row['close_price'],
+            'trade_plan': plan,
+        })
+    return signals
+
+
+def write_dataset(table, root: str, partition_cols: Sequence[str]) -> None:
+    """
+    Writes a table as a hive-partitioned Parquet dataset (``asset=BTC-USD/date=2025-08-19/...``).
+
+    New files are added next to existing ones, so repeated writes append.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    partition_cols = [c for c in partition_cols if c in table.column_names]
+    schema = pa.schema([table.schema.field(c) for c in partition_cols])
+    ds.write_dataset(
+        table, root, format='parquet',
+        partitioning=ds.partitioning(schema, flavor='hive'),
+        basename_template=f'part-{uuid.uuid4().hex}-{{i}}.parquet',
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+
+def read_dataset(root: str, partition_cols: Sequence[str], columns: Optional[Sequence[str]] = None,
+                 start=None, end=None, **equals):
+    """
+    Reads a partitioned dataset with filters pushed down to the scan.
+
+    Partition equality filters (e.g. ``asset='BTC-USD'``) prune directories;
+    the time range prunes ``date`` partitions and Parquet row groups.
+
+    Args:
+        root: Dataset directory
+        partition_cols: Partition columns the dataset was written with
+        columns: Optional column projection
+        start: Inclusive start timestamp
+        end: Exclusive end timestamp
+        **equals: Column equality filters
+
+    Returns:
+        A ``pyarrow.Table``.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    # Partition values are inferred from the directory names as plain strings
+    dataset = ds.dataset(root, format='parquet', partitioning='hive')
+    expression = None
+
+    def _and(condition):
+        return condition if expression is None else expression & condition
+
+    for name, value in equals.items():
+        if value is not None:
+            expression = _and(ds.field(name) == value)
+    if start is not None:
+        start = pd.Timestamp(start)
+        expression = _and(ds.field('timestamp') >= pa.scalar(start.to_pydatetime(), pa.timestamp('s')))
+        if 'date' in partition_cols:
+            expression = _and(ds.field('date') >= str(start.date()))
+    if end is not None:
+        end = pd.Timestamp(end)
+        expression = _and(ds.field('timestamp') < pa.scalar(end.to_pydatetime(), pa.timestamp('s')))
+        if 'date' in partition_cols:
+            expression = _and(ds.field('date') <= str(end.date()))
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+
+
+def write_candles(data: Union[pd.DataFrame, CompactCandles], root: str, asset: str, granularity: str) -> None:
+    """Appends a candle window or indicator frame to a dataset partitioned by granularity, asset and date."""
+    write_dataset(frame_to_table(data, asset, granularity), root, CANDLE_PARTITIONS)
+
+
+def read_candles(root: str, asset: str, granularity: str, start=None, end=None,
+                 columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Reads one asset's candles (and any stored indicators) for a time range."""
+    if columns is not None:
+        columns = ['timestamp'] + [c for c in columns if c != 'timestamp']
+    table = read_dataset(root, CANDLE_PARTITIONS, columns=columns, start=start, end=end,
+                         asset=asset, granularity=granularity)
+    df = table_to_frame(table)
+    return df[~df.index.duplicated(keep='last')]
+
+
+def write_signals(signals: Sequence[Dict], root: str) -> None:
+    """Appends scan results to a dataset partitioned by asset and date."""
+    if signals:
+        write_dataset(signals_to_table(signals), root, SIGNAL_PARTITIONS)
+
+
+def read_signals(root: str, asset: Optional[str] = None, start=None, end=None) -> List[Dict]:
+    """Reads stored signals, optionally for one asset and time range, oldest first."""
+    table = read_dataset(root, SIGNAL_PARTITIONS, start=start, end=end, asset=asset)
+    return table_to_signals(table.sort_by('timestamp'))
+
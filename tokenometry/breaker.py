@@ -0,0 +1,103 @@
+# breaker.py
+# Circuit breakers that stop calling products which keep failing.
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    A consecutive-failure circuit breaker.
+
+    Closed: calls go through; ``failure_threshold`` failures in a row open it.
+    Open: calls are refused until ``reset_timeout`` seconds have passed.
+    Half-open: a single probe call is let through; success closes the
+    breaker, failure opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1.')
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a call may be made now; in half-open state only one caller gets True."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self.clock()
+
+
+class BreakerRegistry:
+    """Circuit breakers created on demand, one per (product, endpoint)."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, product_id: str, endpoint: str) -> CircuitBreaker:
+        key = (product_id, endpoint)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock)
+            return breaker
+
+    def states(self) -> Dict[Tuple[str, str], str]:
+        """Current state of every breaker, keyed by (product, endpoint)."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.state for key, breaker in breakers.items()}
+
+    def open_products(self, endpoint: Optional[str] = None) -> list:
+        """Products whose breaker (for ``endpoint``, or any endpoint) is currently refusing calls."""
+        return sorted({p for (p, e), state in self.states().items()
+                       if state == OPEN and (endpoint is None or e == endpoint)})
@@ -0,0 +1,150 @@
+# compact.py
+# A compact, columnar float32 representation of candle windows and indicators.
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# float32 keeps a 24-bit significand: round-to-nearest storage of any value
+# has a relative error of at most 2**-24 (about 6e-8, roughly 7 significant
+# digits). Concretely:
+#   * a 100,000.00 USD price is stored within +/-0.0060 USD;
+#   * a 0.00001234 USD price keeps ~7 significant digits (within ~7e-13 USD);
+#   * whole-unit volumes are exact up to 2**24 = 16,777,216 and otherwise
+#     carry the same relative bound.
+# Indicators are computed in float64 from the stored prices and only rounded
+# when stored, so errors do not accumulate across the EMA/RSI recurrences. A crossover whose
+# short/long MA spread is below ~2 * FLOAT32_RELATIVE_ERROR of the price can
+# compare differently than in float64; such a cross is noise at any
+# realistic tick size.
+FLOAT32_RELATIVE_ERROR = 2.0 ** -24
+
+_COINBASE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class CompactCandles:
+    """
+    One (asset, granularity) window stored as contiguous numpy blocks.
+
+    Attributes:
+        timestamps: int64 epoch seconds, ascending and unique, shape (n,)
+        ohlcv: float32 block of shape (5, n); row i is OHLCV_COLUMNS[i]
+        indicators: float32 block of shape (k, n); row i is indicator_names[i]
+        indicator_names: Names of the indicator rows
+
+    Each field is a contiguous row, so column access is a zero-copy view. A
+    float64 DataFrame with a DatetimeIndex, OHLCV and the ~12 indicator
+    columns of ``_calculate_indicators`` costs about 144 bytes per candle plus
+    per-frame overhead; this layout costs 8 + 4 * 17 = 76 bytes per candle and
+    a few hundred bytes per window.
+    """
+
+    __slots__ = ('timestamps', 'ohlcv', 'indicators', 'indicator_names', '_index')
+
+    def __init__(self, timestamps: np.ndarray, ohlcv: np.ndarray,
+                 indicators: Optional[np.ndarray] = None, indicator_names: Sequence[str] = ()):
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.ohlcv = np.ascontiguousarray(ohlcv, dtype=np.float32)
+        n = self.timestamps.shape[0]
+        if self.ohlcv.shape != (len(OHLCV_COLUMNS), n):
+            raise ValueError(f"ohlcv must have shape (5, {n}), got {self.ohlcv.shape}")
+        if indicators is None:
+            indicators = np.empty((0, n), dtype=np.float32)
+        self.indicators = np.ascontiguousarray(indicators, dtype=np.float32)
+        self.indicator_names = tuple(indicator_names)
+        if self.indicators.shape != (len(self.indicator_names), n):
+            raise ValueError(f"indicators must have shape ({len(self.indicator_names)}, {n}), got {self.indicators.shape}")
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.indicator_names)}
+
+    def __len__(self) -> int:
+        return self.timestamps.shape[0]
+
+    @property
+    def columns(self) -> List[str]:
+        return list(OHLCV_COLUMNS) + list(self.indicator_names)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the numpy blocks."""
+        return self.timestamps.nbytes + self.ohlcv.nbytes + self.indicators.nbytes
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a zero-copy float32 view of one OHLCV or indicator column."""
+        if name in OHLCV_COLUMNS:
+            return self.ohlcv[OHLCV_COLUMNS.index(name)]
+        try:
+            return self.indicators[self._index[name]]
+        except KeyError:
+            raise KeyError(name) from None
+
+    __getitem__ = column
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[dict]) -> 'CompactCandles':
+        """
+        Builds a window straight from Coinbase ``get_public_candles`` dicts.
+
+        Skips the intermediate DataFrame; duplicates are dropped and rows sorted
+        by timestamp, matching ``Tokenometry._get_historical_data``.
+        """
+        candles = list(candles)
+        timestamps = np.fromiter((int(c['start']) for c in candles), dtype=np.int64, count=len(candles))
+        ohlcv = np.empty((len(OHLCV_COLUMNS), len(candles)), dtype=np.float32)
+        for row, field in enumerate(_COINBASE_FIELDS):
+            ohlcv[row] = np.fromiter((float(c[field]) for c in candles), dtype=np.float64, count=len(candles))
+        timestamps, first = np.unique(timestamps, return_index=True)
+        return cls(timestamps, ohlcv[:, first])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, indicator_columns: Optional[Sequence[str]] = None) -> 'CompactCandles':
+        """
+        Packs a Tokenometry DataFrame (DatetimeIndex, OHLCV, indicators).
+
+        Args:
+            df: Candle window, optionally with indicator columns
+            indicator_columns: Indicator columns to keep; defaults to every
+                numeric non-OHLCV column
+
+        Returns:
+            The compact window.
+        """
+        if indicator_columns is None:
+            indicator_columns = [c for c in df.columns
+                                 if c not in OHLCV_COLUMNS and pd.api.types.is_numeric_dtype(df[c])]
+        timestamps = df.index.as_unit('s').asi8 if isinstance(df.index, pd.DatetimeIndex) else df.index.to_numpy()
+        ohlcv = df[list(OHLCV_COLUMNS)].to_numpy(dtype=np.float32).T
+        indicators = df[list(indicator_columns)].to_numpy(dtype=np.float32).T
+        return cls(timestamps, ohlcv, indicators.reshape(len(indicator_columns), len(df)), indicator_columns)
+
+    def to_frame(self, datetime_index: bool = True, dtype=None) -> pd.DataFrame:
+        """
+        Builds a DataFrame over the stored columns.
+
+        Args:
+            datetime_index: Index by a DatetimeIndex (what the scanner expects)
+                instead of the raw int64 epoch seconds
+            dtype: Column dtype; by default the float32 blocks are wrapped
+                without copying, ``np.float64`` widens them in one pass
+
+        Returns:
+            A DataFrame with OHLCV and indicator columns.
+        """
+        ohlcv = self.ohlcv if dtype is None else self.ohlcv.astype(dtype)
+        indicators = self.indicators if dtype is None else self.indicators.astype(dtype)
+        data = {name: ohlcv[i] for i, name in enumerate(OHLCV_COLUMNS)}
+        data.update({name: indicators[i] for i, name in enumerate(self.indicator_names)})
+        index = pd.to_datetime(self.timestamps, unit='s') if datetime_index else pd.Index(self.timestamps)
+        df = pd.DataFrame(data, index=index, copy=False)
+        df.index.name = 'timestamp'
+        return df
+
+    def with_indicators(self, indicators: Dict[str, np.ndarray]) -> 'CompactCandles':
+        """Returns a window whose indicator block holds the given columns, in one allocation."""
+        names = list(indicators)
+        block = np.empty((len(names), len(self)), dtype=np.float32)
+        for i, name in enumerate(names):
+            block[i] = indicators[name]
+        return CompactCandles(self.timestamps, self.ohlcv, block, names)
@@ -0,0 +1,202 @@
+# config.py
+# Validated, immutable strategy settings compiled once from a config dict.
+
+import numbers
+from typing import Dict, NamedTuple, Optional
+
+INDICATOR_TYPES = ('EMA', 'SMA')
+SCAN_PRIORITIES = ('proximity', 'liquidity', 'config')
+
+REQUIRED_KEYS = (
+    'STRATEGY_NAME', 'PRODUCT_IDS', 'GRANULARITY_SIGNAL', 'GRANULARITY_TREND', 'GRANULARITY_SECONDS',
+    'TREND_PERIOD', 'SHORT_PERIOD', 'LONG_PERIOD', 'RSI_PERIOD', 'RSI_OVERBOUGHT', 'RSI_OVERSOLD',
+    'MACD_FAST', 'MACD_SLOW', 'MACD_SIGNAL', 'ATR_PERIOD',
+    'HYPOTHETICAL_PORTFOLIO_SIZE', 'RISK_PER_TRADE_PERCENTAGE', 'ATR_STOP_LOSS_MULTIPLIER',
+)
+VOLUME_FILTER_KEYS = ('VOLUME_MA_PERIOD', 'VOLUME_SPIKE_MULTIPLIER')
+
+
+class ConfigError(ValueError):
+    """A config value has the wrong type or is out of range."""
+
+
+class MissingConfigKey(ConfigError, KeyError):
+    """Required config keys are absent."""
+
+    def __str__(self) -> str:
+        return ValueError.__str__(self)
+
+
+def _period(config: Dict, key: str) -> int:
+    value = config[key]
+    if isinstance(value, bool) or not isinstance(value, numbers.Integral):
+        raise ConfigError(f'{key} must be an integer, got {value!r}.')
+    if value < 1:
+        raise ConfigError(f'{key} must be at least 1, got {value}.')
+    return int(value)
+
+
+def _number(config: Dict, key: str, low: Optional[float] = None, high: Optional[float] = None,
+            strict_low: bool = False, default: Optional[float] = None) -> float:
+    value = config[key] if default is None else config.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, numbers.Real):
+        raise ConfigError(f'{key} must be a number, got {value!r}.')
+    if low is not None and (value <= low if strict_low else value < low):
+        raise ConfigError(f"{key} must be {'above' if strict_low else 'at least'} {low}, got {value}.")
+    if high is not None and value > high:
+        raise ConfigError(f'{key} must be at most {high}, got {value}.')
+    return float(value)
+
+
+def _indicator(config: Dict, key: str) -> str:
+    value = config.get(key, 'EMA')
+    if not isinstance(value, str) or value.upper() not in INDICATOR_TYPES:
+        raise ConfigError(f'{key} must be one of {INDICATOR_TYPES}, got {value!r}.')
+    return value.upper()
+
+
+def _scan_priority(config: Dict) -> str:
+    value = config.get('SCAN_PRIORITY', 'proximity')
+    if value not in SCAN_PRIORITIES:
+        raise ConfigError(f'SCAN_PRIORITY must be one of {SCAN_PRIORITIES}, got {value!r}.')
+    return value
+
+
+def _granularity_seconds(config: Dict, key: str) -> int:
+    name = config[key]
+    seconds = config['GRANULARITY_SECONDS'].get(name)
+    if seconds is None:
+        raise ConfigError(f"{key} '{name}' is missing from GRANULARITY_SECONDS.")
+    if isinstance(seconds, bool) or not isinstance(seconds, numbers.Integral) or seconds < 1:
+        raise ConfigError(f"GRANULARITY_SECONDS['{name}'] must be a positive integer, got {seconds!r}.")
+    return int(seconds)
+
+
+class ScannerConfig(NamedTuple):
+    """
+    The strategy parameters the scan hot path reads, checked and resolved once.
+
+    Indicator column names (``RSI_14``, ``MACDh_12_26_9``, ``SMA_Volume_20``),
+    granularity seconds and derived thresholds are precomputed. Being a
+    tuple it is immutable, has no per-instance ``__dict__`` and is hashable,
+    so it can key caches. ``PRODUCT_IDS`` is validated but not stored: the
+    asset list is scan scope, not strategy identity.
+    """
+
+    strategy_name: str
+    granularity_signal: str
+    granularity_trend: str
+    signal_seconds: int
+    trend_seconds: int
+    trend_indicator: str
+    trend_period: int
+    trend_col: str
+    signal_indicator: str
+    short_period: int
+    long_period: int
+    short_col: str
+    long_col: str
+    rsi_period: int
+    rsi_col: str
+    rsi_overbought: float
+    rsi_oversold: float
+    macd_fast: int
+    macd_slow: int
+    macd_signal: int
+    macd_col: str
+    macd_signal_col: str
+    macd_hist_col: str
+    atr_period: int
+    atr_col: str
+    volume_filter: bool
+    volume_ma_period: int
+    volume_col: Optional[str]
+    volume_spike_multiplier: float
+    volume_strong_multiplier: float
+    stop_loss_atr_multiplier: float
+    capital_to_risk: float
+    compact_candles: bool
+    prescreen_enabled: bool
+    prescreen_band: float
+    scan_priority: str
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> 'ScannerConfig':
+        """
+        Validates a strategy config dict and compiles it.
+
+        Raises:
+            MissingConfigKey: Required keys are absent (a ``KeyError``)
+            ConfigError: A value has the wrong type or is out of range (a ``ValueError``)
+        """
+        volume_filter = bool(config.get('VOLUME_FILTER_ENABLED', False))
+        required = REQUIRED_KEYS + (VOLUME_FILTER_KEYS if volume_filter else ())
+        missing = [key for key in required if key not in config]
+        if missing:
+            raise MissingConfigKey(f"Config is missing required keys: {', '.join(missing)}.")
+
+        product_ids = config['PRODUCT_IDS']
+        if isinstance(product_ids, str) or not all(isinstance(p, str) for p in product_ids):
+            raise ConfigError('PRODUCT_IDS must be a list of product ID strings.')
+        if not isinstance(config['GRANULARITY_SECONDS'], dict):
+            raise ConfigError('GRANULARITY_SECONDS must map granularity names to seconds.')
+
+        trend_indicator = _indicator(config, 'TREND_INDICATOR_TYPE')
+        signal_indicator = _indicator(config, 'SIGNAL_INDICATOR_TYPE')
+        trend_period = _period(config, 'TREND_PERIOD')
+        short_period, long_period = _period(config, 'SHORT_PERIOD'), _period(config, 'LONG_PERIOD')
+        if short_period >= long_period:
+            raise ConfigError(f'SHORT_PERIOD ({short_period}) must be below LONG_PERIOD ({long_period}).')
+        rsi_period = _period(config, 'RSI_PERIOD')
+        rsi_overbought = _number(config, 'RSI_OVERBOUGHT', 0, 100)
+        rsi_oversold = _number(config, 'RSI_OVERSOLD', 0, 100)
+        if rsi_oversold >= rsi_overbought:
+            raise ConfigError(f'RSI_OVERSOLD ({rsi_oversold}) must be below RSI_OVERBOUGHT ({rsi_overbought}).')
+        fast, slow, signal = _period(config, 'MACD_FAST'), _period(config, 'MACD_SLOW'), _period(config, 'MACD_SIGNAL')
+        if fast >= slow:
+            raise ConfigError(f'MACD_FAST ({fast}) must be below MACD_SLOW ({slow}).')
+        atr_period = _period(config, 'ATR_PERIOD')
+        volume_ma_period = _period(config, 'VOLUME_MA_PERIOD') if volume_filter else 0
+        spike = _number(config, 'VOLUME_SPIKE_MULTIPLIER', 0, strict_low=True) if volume_filter else 0.0
+        portfolio = _number(config, 'HYPOTHETICAL_PORTFOLIO_SIZE', 0, strict_low=True)
+        risk = _number(config, 'RISK_PER_TRADE_PERCENTAGE', 0, 100, strict_low=True)
+        macd_suffix = f'{fast}_{slow}_{signal}'
+
+        return cls(
+            strategy_name=str(config['STRATEGY_NAME']),
+            granularity_signal=config['GRANULARITY_SIGNAL'],
+            granularity_trend=config['GRANULARITY_TREND'],
+            signal_seconds=_granularity_seconds(config, 'GRANULARITY_SIGNAL'),
+            trend_seconds=_granularity_seconds(config, 'GRANULARITY_TREND'),
+            trend_indicator=trend_indicator,
+            trend_period=trend_period,
+            trend_col=f'{trend_indicator}_{trend_period}',
+            signal_indicator=signal_indicator,
+            short_period=short_period,
+            long_period=long_period,
+            short_col=f'{signal_indicator}_{short_period}',
+            long_col=f'{signal_indicator}_{long_period}',
+            rsi_period=rsi_period,
+            rsi_col=f'RSI_{rsi_period}',
+            rsi_overbought=rsi_overbought,
+            rsi_oversold=rsi_oversold,
+            macd_fast=fast,
+            macd_slow=slow,
+            macd_signal=signal,
+            macd_col=f'MACD_{macd_suffix}',
+            macd_signal_col=f'MACDs_{macd_suffix}',
+            macd_hist_col=f'MACDh_{macd_suffix}',
+            atr_period=atr_period,
+            atr_col=f'ATRr_{atr_period}',
+            volume_filter=volume_filter,
+            volume_ma_period=volume_ma_period,
+            volume_col=f'SMA_Volume_{volume_ma_period}' if volume_filter else None,
+            volume_spike_multiplier=spike,
+            volume_strong_multiplier=spike + 1,
+            stop_loss_atr_multiplier=_number(config, 'ATR_STOP_LOSS_MULTIPLIER', 0, strict_low=True),
+            capital_to_risk=portfolio * risk / 100,
+            compact_candles=bool(config.get('COMPACT_CANDLES', False)),
+            prescreen_enabled=bool(config.get('PRESCREEN_ENABLED', False)),
+            prescreen_band=_number(config, 'PRESCREEN_BAND', 0, default=0.005),
+            scan_priority=_scan_priority(config),
+        )
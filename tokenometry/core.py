@@ -1,20 +1,67 @@
 # scanner_library.py
 # This file contains the reusable Tokenometry class.
 
+import asyncio
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
-from coinbase.rest import RESTClient
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
 import warnings
 import logging
 import sys
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .breaker import OPEN, STATE_VALUES, BreakerRegistry
+from .config import ScannerConfig
+from .datasources import CoinbaseSource, DataSource, shared_rest_client
+from .log import setup_logging
+from .metrics import REGISTRY, MetricsRegistry, ScannerMetrics
+from .ratelimit import RateLimiter
+from .retry import HedgedCaller, RetryPolicy
+from .scheduler import ProximityIndex
+from .singleflight import CANDLE_REQUESTS, SingleFlight
+from .sinks import BufferedSignalWriter
+from .state import SignalStateStore
+
+
+def _ema_last_two(closes: np.ndarray, period: int):
+    """
+    The last two values of ``ewm(span=period, adjust=False)`` over ``closes``.
+
+    With ``a = 2 / (period + 1)`` the recursion unrolls to
+    ``ema[t] = (1 - a)**t * x[0] + a * sum((1 - a)**(t - i) * x[i], i = 1..t)``.
+    """
+    alpha = 2.0 / (period + 1)
+    n = len(closes)
+    weights = (1.0 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    weights[1:] *= alpha
+    last = float(weights @ closes)
+    weights = (1.0 - alpha) ** np.arange(n - 2, -1, -1, dtype=np.float64)
+    weights[1:] *= alpha
+    return last, float(weights @ closes[:-1])
+
+
+class ScanResult(list):
+    """
+    The signals of one scan.
+
+    A plain list of signal dicts, plus ``skipped``: the assets a
+    deadline-bounded scan did not get to, in priority order.
+    """
+
+    def __init__(self, signals=(), skipped=None):
+        super().__init__(signals)
+        self.skipped: List[str] = list(skipped or [])
+
+    @property
+    def complete(self) -> bool:
+        """True if every due asset was evaluated."""
+        return not self.skipped
+
 
 class Tokenometry:
     """
@@ -25,16 +72,69 @@ class Tokenometry:
     and long-term investment approaches. It now includes a signal strength model.
     """
     
-    def __init__(self, config: Dict, logger: Optional[logging.Logger] = None):
+    def __init__(self, config: Dict, logger: Optional[logging.Logger] = None,
+                 metrics: Optional[MetricsRegistry] = None, sink: Optional[BufferedSignalWriter] = None,
+                 state_store: Optional[SignalStateStore] = None, singleflight: Optional[SingleFlight] = None,
+                 source: Optional[DataSource] = None):
         """
         Initialize the Tokenometry scanner.
         
         Args:
-            config: Configuration dictionary containing strategy parameters
+            config: Configuration dictionary containing strategy parameters;
+                compiled into ``settings`` (a ``ScannerConfig``), which raises
+                ``MissingConfigKey`` or ``ConfigError`` if it is invalid
             logger: Optional logger instance
+            metrics: Optional metrics registry; defaults to the shared
+                ``tokenometry.metrics.REGISTRY``
+            sink: Optional buffered writer that persists every emitted signal
+                off the scan thread
+            state_store: Optional store of the last signal per (strategy, asset);
+                when set, scan() only returns new transitions
+            singleflight: Group that coalesces identical in-flight candle
+                requests; defaults to one shared by the whole process. Scanners
+                coalesce when they use the same client, as scanners on the
+                default client with the same pool size and timeout do
+            source: Where candles come from; defaults to the Coinbase REST
+                API through ``client``. Local sources from
+                ``tokenometry.datasources`` skip the network entirely
         """
         self.config = config
-        self.client = RESTClient()
+        self.sink = sink
+        self.state_store = state_store
+        self.singleflight = singleflight if singleflight is not None else CANDLE_REQUESTS
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.source = source if source is not None else CoinbaseSource(client_factory=lambda: self.client)
+        self._priority = {}
+        self.refresh_index = None
+        if config.get('ADAPTIVE_REFRESH_ENABLED', False):
+            granularity_seconds = config['GRANULARITY_SECONDS'][config['GRANULARITY_SIGNAL']]
+            self.refresh_index = ProximityIndex(
+                fast_seconds=config.get('REFRESH_FAST_SECONDS', 0),
+                slow_seconds=config.get('REFRESH_SLOW_SECONDS', 4 * granularity_seconds),
+                near_atr=config.get('PROXIMITY_NEAR_ATR', 0.5),
+                far_atr=config.get('PROXIMITY_FAR_ATR', 3.0),
+            )
+        self.metrics = ScannerMetrics(metrics if metrics is not None else REGISTRY)
+        rate_limit = config.get('RATE_LIMIT_PER_SECOND')
+        self.rate_limiter = RateLimiter(rate_limit, config.get('RATE_LIMIT_BURST', 1)) if rate_limit else None
+        self.retry_policy = RetryPolicy(
+            attempts=config.get('RETRY_ATTEMPTS', 3),
+            base_delay=config.get('RETRY_BASE_DELAY', 0.25),
+            max_delay=config.get('RETRY_MAX_DELAY', 4.0),
+        )
+        threshold = config.get('CIRCUIT_BREAKER_THRESHOLD', 5)
+        self.breakers = BreakerRegistry(
+            failure_threshold=threshold,
+            reset_timeout=config.get('CIRCUIT_BREAKER_RESET_SECONDS', 300),
+        ) if threshold else None
+        self.hedger = None
+        if config.get('HEDGE_ENABLED', False):
+            self.hedger = HedgedCaller(
+                quantile=config.get('HEDGE_QUANTILE', 0.95),
+                min_samples=config.get('HEDGE_MIN_SAMPLES', 20),
+                budget=config.get('HEDGE_BUDGET', 0.1),
+            )
         
         # Set up logging
         if logger:
@@ -46,82 +146,141 @@ class Tokenometry:
         warnings.simplefilter(action='ignore', category=pd.errors.SettingWithCopyWarning)
         warnings.simplefilter(action='ignore', category=FutureWarning)
             
-        self.logger.info(f"Initialized Tokenometry with '{config['STRATEGY_NAME']}' strategy")
+        self.logger.info("Initialized Tokenometry with '%s' strategy", config['STRATEGY_NAME'])
     
+    @property
+    def client(self):
+        """
+        The Coinbase REST client, resolved on first use (once, even from concurrent scan workers).
+
+        Unless one is assigned, this is the process-wide client for the
+        configured ``HTTP_POOL_SIZE`` and ``REQUEST_TIMEOUT_SECONDS``.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = shared_rest_client(self.config.get('HTTP_POOL_SIZE'),
+                                                      self.config.get('REQUEST_TIMEOUT_SECONDS', 10))
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    @property
+    def config(self) -> Dict:
+        """The strategy config dict; assigning a new one re-validates and recompiles ``settings``."""
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict):
+        self.settings = ScannerConfig.from_dict(value)
+        self._config = value
+
     def _setup_logging(self) -> logging.Logger:
-        """Sets up logging configuration."""
-        logger = logging.getLogger('Tokenometry')
-        logger.setLevel(logging.INFO)
-        
-        # Create handlers
-        c_handler = logging.StreamHandler()
-        f_handler = logging.FileHandler('tokenometry.log')
-        c_handler.setLevel(logging.INFO)
-        f_handler.setLevel(logging.INFO)
-        
-        # Create formatters and add it to handlers
-        log_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        c_handler.setFormatter(log_format)
-        f_handler.setFormatter(log_format)
-        
-        # Add handlers to the logger
-        logger.addHandler(c_handler)
-        logger.addHandler(f_handler)
-        
-        return logger
+        """Sets up logging configuration (once per process, off the scan thread)."""
+        return setup_logging('Tokenometry')
     
+    def _granularity_seconds(self, granularity):
+        """Seconds per candle of the signal or trend granularity, from the compiled settings."""
+        s = self.settings
+        return s.signal_seconds if granularity == s.granularity_signal else s.trend_seconds
+
     def _get_historical_data(self, product_id, granularity):
         """Fetches a rolling window of historical data."""
-        self.logger.info(f"Fetching {granularity} data for {product_id}...")
+        if not self.source.remote:
+            return self._get_local_data(product_id, granularity)
+        breaker = None
+        if self.breakers is not None:
+            breaker = self.breakers.get(product_id, 'get_public_candles')
+            if not breaker.allow():
+                self.metrics.short_circuits.inc(endpoint='get_public_candles', product_id=product_id)
+                self.logger.debug("Circuit open for %s, skipping %s request.", product_id, granularity)
+                return None
+        self.logger.info("Fetching %s data for %s...", granularity, product_id)
         try:
             # Fetch the max 300 candles per request
-            granularity_seconds = self.config['GRANULARITY_SECONDS'][granularity]
-            duration_seconds = 300 * granularity_seconds
+            duration_seconds = 300 * self._granularity_seconds(granularity)
             start_time = int(time.time() - duration_seconds)
             end_time = int(time.time())
 
-            response = self.client.get_public_candles(
-                product_id=product_id, 
-                start=str(start_time), 
-                end=str(end_time), 
-                granularity=granularity
-            )
-            
-            # Convert response to dictionary and extract candles
-            response_dict = response.to_dict()
-            candles = response_dict.get('candles', [])
+            def fetch():
+                # Every attempt, retried or hedged, takes its own rate-limiter token
+                if self.rate_limiter is not None:
+                    self.metrics.rate_limit_wait.observe(self.rate_limiter.acquire(), limiter='coinbase')
+                with self.metrics.request_duration.time(endpoint='get_public_candles', granularity=granularity):
+                    return self.source.request(product_id, granularity, start_time, end_time)
+
+            # Concurrent requests for the same latest window through the same client share
+            # one network call; scanners with their own client (or local source) never mix
+            key = (id(self.source.identity), product_id, granularity, duration_seconds)
+            candles, joined = self.singleflight.do(
+                key, lambda: self._call_with_retries(fetch, 'get_public_candles', product_id))
+            self.metrics.record_cache('candle_singleflight', joined)
+
             if not candles: 
-                self.logger.warning(f"No price data from Coinbase for {product_id}.")
+                self.logger.warning("No price data from Coinbase for %s.", product_id)
+                self._record_breaker(breaker, product_id, ok=False)
                 return None
-                
-            df = pd.DataFrame(candles)
-            df.rename(columns={'start': 'timestamp', 'low': 'Low', 'high': 'High', 'open': 'Open', 'close': 'Close', 'volume': 'Volume'}, inplace=True)
-            df['timestamp'] = pd.to_datetime(pd.to_numeric(df['timestamp']), unit='s')
-            for col in ['Low', 'High', 'Open', 'Close', 'Volume']: 
-                df[col] = pd.to_numeric(df[col])
-            df.drop_duplicates(subset='timestamp', inplace=True)
-            df.set_index('timestamp', inplace=True)
-            df.sort_index(inplace=True)
-            return df
+            self._record_breaker(breaker, product_id, ok=True)
+            return self.source.parse(candles, compact=self.settings.compact_candles)
+        except Exception as e:
+            self.metrics.request_errors.inc(endpoint='get_public_candles', product_id=product_id)
+            self.logger.error("Error fetching price data for %s: %s", product_id, e)
+            self._record_breaker(breaker, product_id, ok=False)
+            return None
+
+    def _get_local_data(self, product_id, granularity):
+        """Reads the latest 300-candle window from a local source (no rate limit, retries or breakers)."""
+        try:
+            df = self.source.window(product_id, granularity, self._granularity_seconds(granularity),
+                                    limit=300, compact=self.settings.compact_candles)
         except Exception as e:
-            self.logger.error(f"Error fetching price data for {product_id}: {e}")
+            self.logger.error("Error reading %s data for %s: %s", granularity, product_id, e)
             return None
+        if df is None:
+            self.logger.warning("No %s data for %s in %s.", granularity, product_id, type(self.source).__name__)
+        return df
+
+    def _record_breaker(self, breaker, product_id: str, ok: bool) -> None:
+        """Feeds a request outcome to the product's circuit breaker and publishes its state."""
+        if breaker is None:
+            return
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+            if breaker.state == OPEN:
+                self.logger.warning("Circuit opened for %s after %d consecutive failures; retrying in %ss.",
+                                    product_id, breaker.failures, breaker.reset_timeout)
+        self.metrics.circuit_state.set(STATE_VALUES[breaker.state], endpoint='get_public_candles', product_id=product_id)
     
+    def _call_with_retries(self, fetch, endpoint: str, product_id: str):
+        """Runs a request under the retry policy, hedging each attempt when enabled."""
+        timeout = self.config.get('REQUEST_TIMEOUT_SECONDS', 10)
+
+        def hedged():
+            return self.hedger.call(fetch, timeout=timeout,
+                                    on_hedge=lambda: self.metrics.request_hedges.inc(endpoint=endpoint))
+
+        def on_retry(retry, error, delay):
+            self.metrics.request_retries.inc(endpoint=endpoint)
+            self.logger.warning("Retrying %s for %s in %.2fs (retry %d): %s", endpoint, product_id, delay, retry, error)
+
+        return self.retry_policy.call(hedged if self.hedger is not None else fetch, on_retry=on_retry)
+
     def _get_trend(self, product_id):
         """Determines the main trend using the configured trend timeframe and indicator."""
-        df_trend = self._get_historical_data(product_id, self.config['GRANULARITY_TREND'])
+        s = self.settings
+        df_trend = self._get_historical_data(product_id, s.granularity_trend)
         if df_trend is None or df_trend.empty: 
             return "Unknown"
         
-        cfg = self.config
-        trend_indicator_type = cfg.get('TREND_INDICATOR_TYPE', 'EMA').upper()
-        trend_period = cfg['TREND_PERIOD']
-        trend_col = f"{trend_indicator_type}_{trend_period}"
-
-        if trend_indicator_type == 'SMA':
-            df_trend = self._calculate_sma(df_trend, trend_period, trend_col)
-        else: # Default to EMA
-            df_trend = self._calculate_ema(df_trend, trend_period, trend_col)
+        trend_col = s.trend_col
+        if s.trend_indicator == 'SMA':
+            df_trend = self._calculate_sma(df_trend, s.trend_period, trend_col)
+        else:
+            df_trend = self._calculate_ema(df_trend, s.trend_period, trend_col)
             
         df_trend.dropna(inplace=True)
         
@@ -136,24 +295,23 @@ class Tokenometry:
         if df is None: 
             return None
         self.logger.info("Calculating technical indicators...")
-        cfg = self.config
-        signal_indicator_type = cfg.get('SIGNAL_INDICATOR_TYPE', 'EMA').upper()
-
-        if signal_indicator_type == 'SMA':
-            df = self._calculate_sma(df, cfg['SHORT_PERIOD'], f"SMA_{cfg['SHORT_PERIOD']}")
-            df = self._calculate_sma(df, cfg['LONG_PERIOD'], f"SMA_{cfg['LONG_PERIOD']}")
-        else: # Default to EMA
-            df = self._calculate_ema(df, cfg['SHORT_PERIOD'], f"EMA_{cfg['SHORT_PERIOD']}")
-            df = self._calculate_ema(df, cfg['LONG_PERIOD'], f"EMA_{cfg['LONG_PERIOD']}")
-
-        df = self._calculate_rsi(df, cfg['RSI_PERIOD'])
-        df = self._calculate_macd(df, cfg['MACD_FAST'], cfg['MACD_SLOW'], cfg['MACD_SIGNAL'])
-        df = self._calculate_atr(df, cfg['ATR_PERIOD'])
+        s = self.settings
+
+        if s.signal_indicator == 'SMA':
+            df = self._calculate_sma(df, s.short_period, s.short_col)
+            df = self._calculate_sma(df, s.long_period, s.long_col)
+        else:
+            df = self._calculate_ema(df, s.short_period, s.short_col)
+            df = self._calculate_ema(df, s.long_period, s.long_col)
+
+        df = self._calculate_rsi(df, s.rsi_period)
+        df = self._calculate_macd(df, s.macd_fast, s.macd_slow, s.macd_signal)
+        df = self._calculate_atr(df, s.atr_period)
         
         # Calculate volume moving average if the filter is enabled
-        if cfg.get('VOLUME_FILTER_ENABLED', False):
-            df = self._calculate_sma(df, cfg['VOLUME_MA_PERIOD'], f"SMA_Volume_{cfg['VOLUME_MA_PERIOD']}", column='Volume')
-            
+        if s.volume_filter:
+            df = self._calculate_sma(df, s.volume_ma_period, s.volume_col, column='Volume')
+
         return df
 
     def _calculate_sma(self, df: pd.DataFrame, period: int, column_name: str, column: str = 'Close') -> pd.DataFrame:
@@ -208,11 +366,11 @@ class Tokenometry:
         Returns:
             A string: "Low", "Medium", or "Strong".
         """
-        cfg = self.config
+        s = self.settings
         score = 0
         
         # 1. RSI Score (Max 1 point)
-        rsi = row[f"RSI_{cfg['RSI_PERIOD']}"]
+        rsi = row[s.rsi_col]
         if signal_type == 'BUY':
             if rsi < 30: score += 1.0
             elif rsi < 50: score += 0.5
@@ -221,7 +379,7 @@ class Tokenometry:
             elif rsi > 50: score += 0.5
             
         # 2. MACD Score (Max 1 point)
-        macd_hist = row[f"MACDh_{cfg['MACD_FAST']}_{cfg['MACD_SLOW']}_{cfg['MACD_SIGNAL']}"]
+        macd_hist = row[s.macd_hist_col]
         avg_hist = row['Close'] * 0.001 # Heuristic: 0.1% of price as a baseline for histogram size
         if signal_type == 'BUY' and macd_hist > 0:
             if macd_hist > avg_hist * 2: score += 1.0
@@ -231,12 +389,11 @@ class Tokenometry:
             elif abs(macd_hist) > avg_hist: score += 0.5
             
         # 3. Volume Score (Max 1 point)
-        if cfg.get('VOLUME_FILTER_ENABLED', False):
+        if s.volume_filter:
             volume = row['Volume']
-            avg_volume = row[f"SMA_Volume_{cfg['VOLUME_MA_PERIOD']}"]
-            multiplier = cfg['VOLUME_SPIKE_MULTIPLIER']
-            if volume > avg_volume * (multiplier + 1): score += 1.0 # e.g., > 3x for a 2.0 multiplier
-            elif volume > avg_volume * multiplier: score += 0.5
+            avg_volume = row[s.volume_col]
+            if volume > avg_volume * s.volume_strong_multiplier: score += 1.0 # e.g., > 3x for a 2.0 multiplier
+            elif volume > avg_volume * s.volume_spike_multiplier: score += 0.5
             
         # Classify strength based on total score
         if score >= 2.5: return "Strong"
@@ -247,91 +404,368 @@ class Tokenometry:
         """Generates technical signals based on the configured strategy."""
         if df is None: 
             return None
-        self.logger.info(f"Generating signals on {self.config['GRANULARITY_SIGNAL']} chart...")
-        cfg = self.config
-        indicator_type = cfg.get('SIGNAL_INDICATOR_TYPE', 'EMA').upper()
-        short_col = f"{indicator_type}_{cfg['SHORT_PERIOD']}"
-        long_col = f"{indicator_type}_{cfg['LONG_PERIOD']}"
-        rsi_col = f"RSI_{cfg['RSI_PERIOD']}"
-        macd_line_col = f"MACD_{cfg['MACD_FAST']}_{cfg['MACD_SLOW']}_{cfg['MACD_SIGNAL']}"
-        macd_signal_col = f"MACDs_{cfg['MACD_FAST']}_{cfg['MACD_SLOW']}_{cfg['MACD_SIGNAL']}"
+        s = self.settings
+        self.logger.info("Generating signals on %s chart...", s.granularity_signal)
+        short_col, long_col, rsi_col = s.short_col, s.long_col, s.rsi_col
+        macd_line_col, macd_signal_col = s.macd_col, s.macd_signal_col
         
         df['Signal'] = 0
         
         # --- Volume Filter Condition ---
-        volume_filter = (df['Volume'] > df[f"SMA_Volume_{cfg['VOLUME_MA_PERIOD']}"] * cfg['VOLUME_SPIKE_MULTIPLIER']) if cfg.get('VOLUME_FILTER_ENABLED', False) else True
+        volume_filter = (df['Volume'] > df[s.volume_col] * s.volume_spike_multiplier) if s.volume_filter else True
         
         # --- Signal Logic ---
         golden_cross = (df[short_col] > df[long_col]) & (df[short_col].shift(1) <= df[long_col].shift(1))
-        rsi_buy_filter = df[rsi_col] < cfg['RSI_OVERBOUGHT']
+        rsi_buy_filter = df[rsi_col] < s.rsi_overbought
         macd_buy_filter = df[macd_line_col] > df[macd_signal_col]
         df.loc[golden_cross & rsi_buy_filter & macd_buy_filter & volume_filter, 'Signal'] = 1
         
         death_cross = (df[short_col] < df[long_col]) & (df[short_col].shift(1) >= df[long_col].shift(1))
-        rsi_sell_filter = df[rsi_col] > cfg['RSI_OVERSOLD']
+        rsi_sell_filter = df[rsi_col] > s.rsi_oversold
         macd_sell_filter = df[macd_line_col] < df[macd_signal_col]
         df.loc[death_cross & rsi_sell_filter & macd_sell_filter & volume_filter, 'Signal'] = -1
         return df
 
-    def scan(self):
+    def _latest_moving_averages(self, data):
+        """
+        Returns the short/long MAs at the last two bars of the window.
+        
+        EMAs are seeded from the window's first close, exactly as
+        ``ewm(adjust=False)`` in the full pipeline is, so the pre-screen sees
+        the same crossovers. Only the last two values are needed, and each is
+        a single dot product with the EMA weights. SMAs are read straight off
+        the tail of the close series.
+        
+        Returns:
+            tuple: (short_now, long_now, short_prev, long_prev), or None if the
+            window is too short to judge.
+        """
+        s = self.settings
+        short_period, long_period = s.short_period, s.long_period
+        closes = data['Close'].to_numpy(dtype=np.float64)
+
+        if s.signal_indicator == 'SMA':
+            if len(closes) < long_period + 1:
+                return None
+            return (closes[-short_period:].mean(), closes[-long_period:].mean(),
+                    closes[-short_period - 1:-1].mean(), closes[-long_period - 1:-1].mean())
+
+        if len(closes) < 3:
+            return None
+        short_now, short_prev = _ema_last_two(closes, short_period)
+        long_now, long_prev = _ema_last_two(closes, long_period)
+        return short_now, long_now, short_prev, long_prev
+
+    def _latest_atr(self, data):
+        """Average True Range over the last ATR_PERIOD bars, computed on the tail only."""
+        period = self.settings.atr_period
+        tail = data.iloc[-(period + 1):]
+        if len(tail) < period + 1:
+            return None
+        high = tail['High'].to_numpy(dtype=np.float64)[1:]
+        low = tail['Low'].to_numpy(dtype=np.float64)[1:]
+        prev_close = tail['Close'].to_numpy(dtype=np.float64)[:-1]
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return float(true_range.mean())
+
+    def _record_proximity(self, product_id, data):
+        """Scores how many ATRs the short/long MAs are apart and reschedules the asset."""
+        if data is None or data.empty:
+            return
+        proximity = None
+        averages = self._latest_moving_averages(data)
+        atr = self._latest_atr(data)
+        if averages is not None and atr:
+            proximity = abs(averages[0] - averages[1]) / atr
+        latest = data.iloc[-1]
+        self._priority[product_id] = (proximity, float(latest['Close'] * latest['Volume']))
+        if self.refresh_index is not None:
+            self.refresh_index.update(product_id, proximity)
+
+    def _prioritize(self, product_ids):
+        """
+        Orders assets for a deadline-bounded scan according to ``SCAN_PRIORITY``.
+
+        'proximity' (default) puts assets whose MAs are closest to crossing, in
+        ATRs, first; 'liquidity' puts the largest latest quote volume first;
+        'config' keeps the configured order. Assets not yet seen come first,
+        since nothing is known about them.
+        """
+        priority = self.settings.scan_priority
+        if priority == 'config':
+            return list(product_ids)
+
+        def key(product_id):
+            proximity, liquidity = self._priority.get(product_id, (None, None))
+            if priority == 'proximity':
+                return (proximity is not None, proximity if proximity is not None else 0.0)
+            return (liquidity is not None, -liquidity if liquidity is not None else 0.0)
+
+        return sorted(product_ids, key=key)
+
+    def _prescreen(self, product_id, data):
+        """
+        Cheap first-tier check of whether an asset can signal on its latest candle.
+        
+        An asset is a candidate if its short/long MAs crossed on the latest bar
+        or are within ``PRESCREEN_BAND`` (a fraction of price) of each other, and
+        its volume passes the volume filter when that is enabled.
+        
+        Returns:
+            bool: True if the asset should get the full indicator pipeline.
+        """
+        s = self.settings
+        candidate = True
+        if s.volume_filter:
+            volumes = data['Volume'].to_numpy(dtype=np.float64)
+            period = s.volume_ma_period
+            if len(volumes) >= period and volumes[-1] <= volumes[-period:].mean() * s.volume_spike_multiplier:
+                candidate = False
+
+        averages = self._latest_moving_averages(data) if candidate else None
+        if averages is not None:
+            short_now, long_now, short_prev, long_prev = averages
+            spread_now, spread_prev = short_now - long_now, short_prev - long_prev
+            crossed = (spread_now > 0 >= spread_prev) or (spread_now < 0 <= spread_prev)
+            close = data['Close'].iloc[-1]
+            candidate = crossed or abs(spread_now) <= s.prescreen_band * abs(close)
+
+        self.metrics.prescreen.inc(strategy=s.strategy_name, result='candidate' if candidate else 'skipped')
+        if not candidate:
+            self.logger.debug("Pre-screen: %s is not near a crossover, skipping.", product_id)
+        return candidate
+
+    def scan(self, deadline: Optional[float] = None, workers: Optional[int] = None):
         """
         Runs one full analysis cycle for all configured assets and returns the results.
         
+        Args:
+            deadline: Optional time budget in seconds. Assets are evaluated in
+                ``SCAN_PRIORITY`` order and no new asset is started once the
+                budget is spent; assets already in flight are finished.
+            workers: Assets evaluated concurrently; defaults to ``SCAN_WORKERS`` (1)
+        
         Returns:
-            list: A list of dictionaries, where each dictionary represents a signal.
+            ScanResult: A list of dictionaries, where each dictionary represents a
+            signal, with ``skipped`` listing assets left out by the deadline.
+        """
+        signals = ScanResult()
+        iterator = self.iter_scan(deadline, workers)
+        while True:
+            try:
+                signals.append(next(iterator))
+            except StopIteration as done:
+                signals.skipped = done.value
+                return signals
+
+    def iter_scan(self, deadline: Optional[float] = None, workers: Optional[int] = None,
+                  stop: Optional[threading.Event] = None) -> Iterator[Dict]:
         """
-        self.logger.info(f"Starting new scan with '{self.config['STRATEGY_NAME']}' strategy.")
-        signals = []
+        Runs one analysis cycle, yielding each signal as soon as its asset is evaluated.
         
-        for product_id in self.config['PRODUCT_IDS']:
-            trend = self._get_trend(product_id)
-            self.logger.info(f"Trend for {product_id} on {self.config['GRANULARITY_TREND']} chart: {trend}")
-
-            data = self._get_historical_data(product_id, self.config['GRANULARITY_SIGNAL'])
-            if data is not None and not data.empty:
-                data = self._calculate_indicators(data)
-                data.dropna(inplace=True)
-                data = self._generate_signals(data)
-                
-                latest_row = data.iloc[-1]
-                tech_signal = latest_row['Signal']
-                
-                final_signal = "HOLD"
-                if tech_signal == 1 and trend == "Bullish":
-                    final_signal = "BUY"
-                elif tech_signal == -1 and trend == "Bearish":
-                    final_signal = "SELL"
-                
-                if final_signal != "HOLD":
-                    trade_plan = {}
-                    signal_strength = self._calculate_signal_strength(latest_row, final_signal)
-                    
-                    if final_signal == "BUY":
-                        cfg = self.config
-                        atr_col = f"ATRr_{cfg['ATR_PERIOD']}"
-                        if atr_col in latest_row.index:
-                            latest_atr = latest_row[atr_col]
-                            stop_loss = latest_row['Close'] - (latest_atr * cfg['ATR_STOP_LOSS_MULTIPLIER'])
-                            capital_to_risk = cfg['HYPOTHETICAL_PORTFOLIO_SIZE'] * (cfg['RISK_PER_TRADE_PERCENTAGE'] / 100)
-                            stop_loss_dist = latest_row['Close'] - stop_loss
-                            if stop_loss_dist > 0:
-                                position_size = capital_to_risk / stop_loss_dist
-                                trade_plan = {
-                                    'stop_loss': round(stop_loss, 4),
-                                    'position_size_crypto': round(position_size, 6),
-                                    'position_size_usd': round(position_size * latest_row['Close'], 2)
-                                }
-
-                    signal_data = {
-                        'timestamp': latest_row.name.strftime('%Y-%m-%d %H:%M:%S'),
-                        'asset': product_id,
-                        'signal': final_signal,
-                        'strength': signal_strength,
-                        'trend': trend,
-                        'close_price': latest_row['Close'],
-                        'trade_plan': trade_plan
-                    }
-                    signals.append(signal_data)
+        With ``workers`` > 1 assets are evaluated concurrently and signals are
+        yielded in completion order, so the first signal does not wait for
+        the slowest asset. ``deadline`` and ``workers`` are as for ``scan``;
+        once the optional ``stop`` event is set no further assets are started.
+        
+        Yields:
+            dict: One signal per actionable asset.
+        
+        Returns:
+            list: The assets skipped because the deadline passed, as the
+            generator's return value (``StopIteration.value``).
+        """
+        strategy = self.config['STRATEGY_NAME']
+        self.logger.info("Starting new scan with '%s' strategy.", strategy)
+        start = time.perf_counter()
+        skipped: List[str] = []
+        found = 0
+        try:
+            for signal_data in self._iter_signals(deadline, workers, skipped, stop):
+                found += 1
+                yield signal_data
+        finally:
+            self.metrics.scan_duration.observe(time.perf_counter() - start, strategy=strategy)
+        if skipped:
+            self.logger.warning("Scan deadline of %.2fs reached; skipped %d assets: %s",
+                                deadline, len(skipped), ', '.join(skipped))
+        self.logger.info("Scan complete. Found %d actionable signals.", found)
+        return skipped
+
+    async def aiter_scan(self, deadline: Optional[float] = None,
+                         workers: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Async counterpart of ``iter_scan`` for use inside an event loop.
+        
+        The scan runs on a worker thread and each signal is delivered to the
+        loop as soon as it is produced; leaving the ``async for`` early stops
+        the scan from starting further assets.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for signal_data in self.iter_scan(deadline, workers, stop):
+                    loop.call_soon_threadsafe(queue.put_nowait, signal_data)
+                    if stop.is_set():
+                        break
+            except BaseException as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            await producer
+
+    def _iter_signals(self, deadline: Optional[float], workers: Optional[int], skipped: List[str],
+                      stop: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """Evaluates the due assets and yields the actionable signals; fills ``skipped``."""
+        strategy = self.config['STRATEGY_NAME']
+        workers = workers or self.config.get('SCAN_WORKERS', 1)
+        product_ids = self.config['PRODUCT_IDS']
+        if self.refresh_index is not None:
+            product_ids = self.refresh_index.due(product_ids)
+            self.logger.info("Adaptive refresh: %d of %d assets due.", len(product_ids), len(self.config['PRODUCT_IDS']))
+        stop_at = None
+        if deadline is not None:
+            stop_at = time.monotonic() + deadline
+            product_ids = self._prioritize(product_ids)
+        remaining = iter(product_ids)
+
+        def next_asset():
+            if stop is not None and stop.is_set():
+                return None
+            product_id = next(remaining, None)
+            if product_id is not None and stop_at is not None and time.monotonic() >= stop_at:
+                # Skipped assets stay unscheduled, so adaptive refresh treats them as due next scan
+                skipped.append(product_id)
+                skipped.extend(remaining)
+                self.metrics.scan_skipped.inc(len(skipped), strategy=strategy)
+                return None
+            return product_id
+
+        if workers <= 1:
+            product_id = next_asset()
+            while product_id is not None:
+                signal_data = self._finish_asset(product_id, self._evaluate_asset(product_id))
+                if signal_data is not None:
+                    yield signal_data
+                product_id = next_asset()
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tokenometry-scan') as executor:
+            in_flight = {}
+            for _ in range(workers):
+                product_id = next_asset()
+                if product_id is None:
+                    break
+                in_flight[executor.submit(self._evaluate_asset, product_id)] = product_id
+            while in_flight:
+                finished, _ = wait_futures(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    product_id = in_flight.pop(future)
+                    signal_data = self._finish_asset(product_id, future.result())
+                    next_id = next_asset()
+                    if next_id is not None:
+                        in_flight[executor.submit(self._evaluate_asset, next_id)] = next_id
+                    if signal_data is not None:
+                        yield signal_data
+
+    def _finish_asset(self, product_id, signal_data):
+        """Persists an evaluated asset's signal and reschedules it; returns the signal."""
+        if signal_data is not None and self.sink is not None:
+            self.sink.submit(signal_data)
+        if self.refresh_index is not None and not self.refresh_index.is_scheduled(product_id):
+            # No fresh data to score: try again on the fast cadence
+            self.refresh_index.update(product_id, None)
+        return signal_data
+
+    def _evaluate_asset(self, product_id):
+        """
+        Runs the full trend + signal pipeline for one asset.
+        
+        Returns:
+            dict: The signal for the asset, or None if it is a HOLD.
+        """
+        s = self.settings
+        strategy = s.strategy_name
+        data = self._get_historical_data(product_id, s.granularity_signal)
+        self._record_proximity(product_id, data)
+        if data is None or data.empty:
+            return None
+
+        # Tier 1: rule out assets that cannot cross on the latest candle
+        if s.prescreen_enabled and not self._prescreen(product_id, data):
+            return None
+
+        # A signal already went out for this candle; re-evaluating can only repeat it
+        if self.state_store is not None and self.state_store.already_emitted_for(
+                strategy, product_id, data.index[-1].timestamp()):
+            self.logger.debug("%s already signalled on its latest candle, skipping.", product_id)
+            return None
+
+        trend = self._get_trend(product_id)
+        self.logger.info("Trend for %s on %s chart: %s", product_id, s.granularity_trend, trend)
+
+        data = self._calculate_indicators(data)
+        data.dropna(inplace=True)
+        data = self._generate_signals(data)
+        
+        latest_row = data.iloc[-1]
+        tech_signal = latest_row['Signal']
         
-        self.logger.info(f"Scan complete. Found {len(signals)} actionable signals.")
-        return signals
+        final_signal = "HOLD"
+        if tech_signal == 1 and trend == "Bullish":
+            final_signal = "BUY"
+        elif tech_signal == -1 and trend == "Bearish":
+            final_signal = "SELL"
+        
+        if final_signal == "HOLD":
+            return None
+        candle_ts = latest_row.name.timestamp()
+        if self.state_store is not None and not self.state_store.is_new(strategy, product_id, final_signal, candle_ts):
+            return None
+
+        trade_plan = {}
+        signal_strength = self._calculate_signal_strength(latest_row, final_signal)
+        
+        if final_signal == "BUY":
+            if s.atr_col in latest_row.index:
+                latest_atr = latest_row[s.atr_col]
+                stop_loss = latest_row['Close'] - (latest_atr * s.stop_loss_atr_multiplier)
+                capital_to_risk = s.capital_to_risk
+                stop_loss_dist = latest_row['Close'] - stop_loss
+                if stop_loss_dist > 0:
+                    position_size = capital_to_risk / stop_loss_dist
+                    trade_plan = {
+                        'stop_loss': round(stop_loss, 4),
+                        'position_size_crypto': round(position_size, 6),
+                        'position_size_usd': round(position_size * latest_row['Close'], 2)
+                    }
+
+        signal_data = {
+            'timestamp': latest_row.name.strftime('%Y-%m-%d %H:%M:%S'),
+            'asset': product_id,
+            'signal': final_signal,
+            'strength': signal_strength,
+            'trend': trend,
+            'close_price': latest_row['Close'],
+            'trade_plan': trade_plan
+        }
+        self.metrics.signals.inc(strategy=strategy, asset=product_id, signal=final_signal)
+        if self.state_store is not None:
+            self.state_store.record(strategy, product_id, final_signal, candle_ts)
+        return signal_data
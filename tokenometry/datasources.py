@@ -0,0 +1,312 @@
+# datasources.py
+# Pluggable market-data sources: Coinbase REST, local archives and a synthetic generator.
+
+import os
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .compact import OHLCV_COLUMNS, CompactCandles
+from .transport import attach_session
+
+
+def _create_rest_client(pool_size: Optional[int] = None, timeout: Optional[int] = None):
+    """Imports the Coinbase SDK and builds a client on the shared pooled session."""
+    from coinbase.rest import RESTClient
+    return attach_session(RESTClient(timeout=timeout), pool_size)
+
+
+_SHARED_CLIENTS: Dict[Tuple[Optional[int], Optional[int]], Any] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def shared_rest_client(pool_size: Optional[int] = None, timeout: Optional[int] = None):
+    """
+    The process-wide REST client for a pool size and timeout, built on first use.
+
+    Scanners that do not bring their own client share it, so their identical
+    candle requests coalesce in the single-flight group.
+    """
+    key = (pool_size, timeout)
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(key)
+        if client is None:
+            client = _SHARED_CLIENTS[key] = _create_rest_client(pool_size, timeout)
+        return client
+
+
+def parse_candles(candles: List[dict], compact: bool = False) -> pd.DataFrame:
+    """
+    Converts Coinbase candle dicts to a Tokenometry frame.
+
+    Args:
+        candles: ``get_public_candles`` dicts with string fields, any order
+        compact: Parse straight into a ``CompactCandles`` block, skipping the
+            string DataFrame; values are rounded to float32 and widened to
+            float64 once for the indicator pipeline
+
+    Returns:
+        An OHLCV DataFrame with a sorted, de-duplicated DatetimeIndex.
+    """
+    if compact:
+        return CompactCandles.from_candles(candles).to_frame(dtype=np.float64)
+    df = pd.DataFrame(candles)
+    df.rename(columns={'start': 'timestamp', 'low': 'Low', 'high': 'High', 'open': 'Open', 'close': 'Close', 'volume': 'Volume'}, inplace=True)
+    df['timestamp'] = pd.to_datetime(pd.to_numeric(df['timestamp']), unit='s')
+    for col in ['Low', 'High', 'Open', 'Close', 'Volume']:
+        df[col] = pd.to_numeric(df[col])
+    df.drop_duplicates(subset='timestamp', inplace=True)
+    df.set_index('timestamp', inplace=True)
+    df.sort_index(inplace=True)
+    return df
+
+
+def _compact(df: pd.DataFrame) -> pd.DataFrame:
+    return CompactCandles.from_frame(df[list(OHLCV_COLUMNS)], indicator_columns=[]).to_frame(dtype=np.float64)
+
+
+class DataSource:
+    """
+    Interface for candle providers.
+
+    ``window`` returns the latest ``limit`` candles ending at ``end``; local
+    sources treat ``end=None`` as their ``as_of`` replay time, or the end of
+    the stored history when that is unset. ``remote`` sources are called
+    through the scanner's rate limiter, retries, circuit breakers and
+    single-flight group via ``request``/``parse`` instead.
+    """
+
+    remote = False
+
+    @property
+    def identity(self) -> Any:
+        """Requests coalesce only between sources with the same identity; by default the source itself."""
+        return self
+
+    def window(self, product_id: str, granularity: str, granularity_seconds: int, limit: int = 300,
+               end: Optional[pd.Timestamp] = None, compact: bool = False) -> Optional[pd.DataFrame]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class CoinbaseSource(DataSource):
+    """
+    Candles from the Coinbase public REST API, 300 per request.
+
+    The client is created on first use by ``client_factory`` (by default a
+    pooled ``RESTClient``), so constructing the source makes no connection.
+    """
+
+    remote = True
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None,
+                 pool_size: Optional[int] = None, timeout: Optional[int] = 10):
+        self._client_factory = client_factory or (lambda: _create_rest_client(pool_size, timeout))
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    @property
+    def identity(self):
+        # Sources on one client ask the same API the same question
+        return self.client
+
+    def request(self, product_id: str, granularity: str, start: int, end: int) -> List[dict]:
+        """One ``get_public_candles`` call; returns the raw candle dicts."""
+        response = self.client.get_public_candles(
+            product_id=product_id,
+            start=str(start),
+            end=str(end),
+            granularity=granularity
+        )
+        return response.to_dict().get('candles', [])
+
+    @staticmethod
+    def parse(candles: List[dict], compact: bool = False) -> pd.DataFrame:
+        return parse_candles(candles, compact)
+
+    def window(self, product_id, granularity, granularity_seconds, limit=300, end=None, compact=False):
+        end_time = int(pd.Timestamp.now(tz='UTC').timestamp() if end is None else pd.Timestamp(end).timestamp())
+        candles = self.request(product_id, granularity, end_time - limit * granularity_seconds, end_time)
+        return self.parse(candles, compact) if candles else None
+
+
+class FrameSource(DataSource):
+    """
+    Serves windows from whole histories held in memory.
+
+    Subclasses override ``_load`` to read a history once; after that every
+    window is a binary search and a slice. Set ``as_of`` to replay the
+    scanner at a past time in a backtest.
+    """
+
+    def __init__(self, frames: Optional[Dict[Tuple[str, str], pd.DataFrame]] = None, as_of=None):
+        self._frames: Dict[Tuple[str, str], Optional[pd.DataFrame]] = dict(frames or {})
+        self._lock = threading.Lock()
+        self.as_of = as_of
+
+    def _load(self, product_id: str, granularity: str) -> Optional[pd.DataFrame]:
+        return None
+
+    def history(self, product_id: str, granularity: str) -> Optional[pd.DataFrame]:
+        """The full stored history of one (asset, granularity), loaded once."""
+        key = (product_id, granularity)
+        with self._lock:
+            if key not in self._frames:
+                df = self._load(product_id, granularity)
+                if df is not None:
+                    df = df[~df.index.duplicated(keep='last')].sort_index()
+                self._frames[key] = df
+            return self._frames[key]
+
+    def window(self, product_id, granularity, granularity_seconds, limit=300, end=None, compact=False):
+        df = self.history(product_id, granularity)
+        if df is None:
+            return None
+        end = end if end is not None else self.as_of
+        stop = len(df) if end is None else int(df.index.searchsorted(pd.Timestamp(end), side='right'))
+        window = df.iloc[max(0, stop - limit):stop]
+        if window.empty:
+            return None
+        return _compact(window) if compact else window.copy()
+
+
+class CSVSource(FrameSource):
+    """Reads ``<root>/<granularity>/<product_id>.csv`` files with a 'timestamp' column and OHLCV columns."""
+
+    def __init__(self, root: str, as_of=None):
+        super().__init__(as_of=as_of)
+        self.root = root
+
+    def _load(self, product_id, granularity):
+        path = os.path.join(self.root, granularity, f'{product_id}.csv')
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path, index_col='timestamp', parse_dates=['timestamp'])
+
+
+class ParquetSource(FrameSource):
+    """Reads a candle dataset written by ``tokenometry.arrow_io.write_candles`` (needs pyarrow)."""
+
+    def __init__(self, root: str, as_of=None):
+        super().__init__(as_of=as_of)
+        self.root = root
+
+    def _load(self, product_id, granularity):
+        from .arrow_io import read_candles
+        df = read_candles(self.root, product_id, granularity, columns=list(OHLCV_COLUMNS))
+        return df if len(df) else None
+
+
+class ArchiveSource(DataSource):
+    """
+    Serves windows straight from a memory-mapped ``HistoryArchive``.
+
+    Nothing is loaded up front: a window is a binary search on the
+    timestamp sidecar and a copy of ``limit`` rows, so multi-year archives
+    cost only the pages each scan touches.
+    """
+
+    def __init__(self, root: str, as_of=None):
+        from .archive import HistoryArchive
+        self.archive = HistoryArchive(root)
+        self.as_of = as_of
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _open(self, product_id: str, granularity: str):
+        key = (product_id, granularity)
+        with self._lock:
+            if key not in self._series:
+                try:
+                    self._series[key] = self.archive.open(product_id, granularity)
+                except FileNotFoundError:
+                    self._series[key] = None
+            return self._series[key]
+
+    def window(self, product_id, granularity, granularity_seconds, limit=300, end=None, compact=False):
+        series = self._open(product_id, granularity)
+        if series is None or len(series) == 0:
+            return None
+        end = end if end is not None else self.as_of
+        if end is None:
+            stop = len(series)
+        else:
+            stop = int(np.searchsorted(series.timestamps, int(pd.Timestamp(end).timestamp()), side='right'))
+        if stop == 0:
+            return None
+        df = series.frame(rows=(max(0, stop - limit), stop))
+        return _compact(df) if compact else df
+
+    def close(self) -> None:
+        with self._lock:
+            for series in self._series.values():
+                if series is not None:
+                    series.close()
+            self._series.clear()
+
+
+class SyntheticSource(FrameSource):
+    """
+    Deterministic random-walk candles for benchmarks and tests.
+
+    Each (asset, granularity) gets ``bars`` candles of geometric Brownian
+    motion seeded from the asset name and ``seed``, ending at ``end``
+    (default: the latest whole bar), so runs are repeatable with no files
+    or network.
+    """
+
+    def __init__(self, bars: int = 1000, seed: int = 0, drift: float = 0.0, volatility: float = 0.02,
+                 base_price: float = 100.0, granularity_seconds: Optional[Dict[str, int]] = None,
+                 end=None, as_of=None):
+        """
+        Args:
+            bars: Candles generated per (asset, granularity)
+            seed: Mixed into every asset's seed
+            drift: Mean log return per bar
+            volatility: Standard deviation of log returns per bar
+            base_price: First open
+            granularity_seconds: Seconds per granularity name; defaults to
+                the scanner's value for the first requested window
+            end: Timestamp of the last bar
+            as_of: Replay time, as for ``FrameSource``
+        """
+        super().__init__(as_of=as_of)
+        self.bars = bars
+        self.seed = seed
+        self.drift = drift
+        self.volatility = volatility
+        self.base_price = base_price
+        self.granularity_seconds = dict(granularity_seconds or {})
+        self.end = pd.Timestamp.now(tz='UTC').timestamp() if end is None else pd.Timestamp(end).timestamp()
+
+    def _load(self, product_id, granularity):
+        step = self.granularity_seconds[granularity]
+        rng = np.random.default_rng([zlib.crc32(f'{product_id}/{granularity}'.encode()), self.seed])
+        log_returns = rng.normal(self.drift, self.volatility, self.bars)
+        close = self.base_price * np.exp(np.cumsum(log_returns))
+        open_ = np.concatenate(([self.base_price], close[:-1]))
+        wick = np.abs(rng.normal(0.0, self.volatility / 2, (2, self.bars))) * close
+        last = int(self.end) // step * step
+        index = pd.to_datetime(last - step * np.arange(self.bars - 1, -1, -1), unit='s')
+        index.name = 'timestamp'
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) + wick[0],
+            'Low': np.minimum(open_, close) - wick[1],
+            'Close': close,
+            'Volume': rng.lognormal(7.0, 0.5, self.bars),
+        }, index=index)
+
+    def window(self, product_id, granularity, granularity_seconds, limit=300, end=None, compact=False):
+        self.granularity_seconds.setdefault(granularity, granularity_seconds)
+        return super().window(product_id, granularity, granularity_seconds, limit, end, compact)
@@ -0,0 +1,339 @@
+# distributed.py
+# Coordinator/worker scanning over a pluggable work queue with leases and retries.
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from .core import ScanResult, Tokenometry
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _json_default(value):
+    # numpy scalars (close prices, strengths) become plain Python numbers
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+class WorkItem:
+    """One leased shard: its ID, batch, payload and attempt number."""
+
+    __slots__ = ('id', 'batch', 'payload', 'attempts')
+
+    def __init__(self, id: str, batch: str, payload: Dict, attempts: int):
+        self.id = id
+        self.batch = batch
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"WorkItem({self.id!r}, batch={self.batch!r}, attempts={self.attempts})"
+
+
+class WorkQueue:
+    """
+    Interface for work-queue backends.
+
+    Items are leased rather than popped: a worker that crashes stops
+    extending its lease, the lease expires and the item becomes available
+    again, up to ``max_attempts`` leases in total.
+    """
+
+    def put(self, batch: str, payloads: List[Dict]) -> List[str]:
+        raise NotImplementedError
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[WorkItem]:
+        raise NotImplementedError
+
+    def extend(self, item_id: str, worker_id: str, lease_seconds: float) -> bool:
+        raise NotImplementedError
+
+    def complete(self, item_id: str, worker_id: str, result: Dict) -> bool:
+        raise NotImplementedError
+
+    def fail(self, item_id: str, worker_id: str, error: str) -> None:
+        raise NotImplementedError
+
+    def batch_status(self, batch: str) -> Dict[str, int]:
+        """Counts a batch's items by state; expired leases with no attempts left count as failed."""
+        raise NotImplementedError
+
+    def batch_results(self, batch: str) -> List[Dict]:
+        raise NotImplementedError
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    A work queue in one SQLite file (WAL mode), shared by processes on one host.
+
+    Leasing runs in a ``BEGIN IMMEDIATE`` transaction, so two workers never
+    lease the same item. Results are stored as JSON next to their item.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS work_items ('
+                'id TEXT PRIMARY KEY, batch TEXT NOT NULL, seq INTEGER NOT NULL, payload TEXT NOT NULL, '
+                'state TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, '
+                'lease_until REAL, result TEXT, error TEXT)')
+            conn.execute('CREATE INDEX IF NOT EXISTS work_items_state ON work_items (state, lease_until)')
+            conn.execute('CREATE INDEX IF NOT EXISTS work_items_batch ON work_items (batch, seq)')
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; isolation_level=None so transactions are explicit
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def put(self, batch: str, payloads: List[Dict]) -> List[str]:
+        ids = [uuid.uuid4().hex for _ in payloads]
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO work_items (id, batch, seq, payload, state) VALUES (?, ?, ?, ?, ?)',
+                [(i, batch, seq, json.dumps(p), PENDING) for seq, (i, p) in enumerate(zip(ids, payloads))])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return ids
+
+    def _fail_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        """Gives up on expired leases that used up their attempts."""
+        conn.execute(
+            "UPDATE work_items SET state = ?, error = 'lease expired' "
+            'WHERE state = ? AND lease_until < ? AND attempts >= ?',
+            (FAILED, LEASED, now, self.max_attempts))
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[WorkItem]:
+        now = self.clock()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._fail_expired(conn, now)
+            row = conn.execute(
+                'SELECT id, batch, payload, attempts FROM work_items '
+                'WHERE state = ? OR (state = ? AND lease_until < ?) ORDER BY batch, seq LIMIT 1',
+                (PENDING, LEASED, now)).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            item_id, batch, payload, attempts = row
+            conn.execute(
+                'UPDATE work_items SET state = ?, worker = ?, lease_until = ?, attempts = ? WHERE id = ?',
+                (LEASED, worker_id, now + lease_seconds, attempts + 1, item_id))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return WorkItem(item_id, batch, json.loads(payload), attempts + 1)
+
+    def extend(self, item_id: str, worker_id: str, lease_seconds: float) -> bool:
+        cursor = self._connect().execute(
+            'UPDATE work_items SET lease_until = ? WHERE id = ? AND worker = ? AND state = ?',
+            (self.clock() + lease_seconds, item_id, worker_id, LEASED))
+        return cursor.rowcount == 1
+
+    def complete(self, item_id: str, worker_id: str, result: Dict) -> bool:
+        """Stores a result; returns False if the lease was lost to another worker."""
+        cursor = self._connect().execute(
+            'UPDATE work_items SET state = ?, result = ?, lease_until = NULL WHERE id = ? AND worker = ? AND state = ?',
+            (DONE, json.dumps(result, default=_json_default), item_id, worker_id, LEASED))
+        return cursor.rowcount == 1
+
+    def fail(self, item_id: str, worker_id: str, error: str) -> None:
+        """Releases a failed item for another attempt, or marks it failed once attempts run out."""
+        self._connect().execute(
+            'UPDATE work_items SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+            'error = ?, worker = NULL, lease_until = NULL WHERE id = ? AND worker = ? AND state = ?',
+            (self.max_attempts, FAILED, PENDING, error, item_id, worker_id, LEASED))
+
+    def batch_status(self, batch: str) -> Dict[str, int]:
+        """Counts a batch's items by state, failing dead leases first so polling ends without workers."""
+        conn = self._connect()
+        self._fail_expired(conn, self.clock())
+        rows = conn.execute(
+            'SELECT state, COUNT(*) FROM work_items WHERE batch = ? GROUP BY state', (batch,)).fetchall()
+        status = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        status.update(dict(rows))
+        return status
+
+    def batch_results(self, batch: str) -> List[Dict]:
+        """Every item of a batch in submission order, with its state, payload, result and error."""
+        rows = self._connect().execute(
+            'SELECT id, state, payload, result, error FROM work_items WHERE batch = ? ORDER BY seq',
+            (batch,)).fetchall()
+        return [{'id': i, 'state': state, 'payload': json.loads(payload),
+                 'result': json.loads(result) if result else None, 'error': error}
+                for i, state, payload, result, error in rows]
+
+    def purge(self, batch: str) -> None:
+        """Deletes a finished batch."""
+        self._connect().execute('DELETE FROM work_items WHERE batch = ?', (batch,))
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def shard(product_ids: List[str], shard_size: int) -> List[List[str]]:
+    """Splits a universe into consecutive shards of at most ``shard_size`` assets."""
+    if shard_size < 1:
+        raise ValueError('shard_size must be at least 1.')
+    return [product_ids[i:i + shard_size] for i in range(0, len(product_ids), shard_size)]
+
+
+class Coordinator:
+    """
+    Publishes a scan as sharded work items and merges the workers' results.
+
+    The config travels with every item, so it must be JSON-serialisable.
+    """
+
+    def __init__(self, queue: WorkQueue, shard_size: int = 10, logger: Optional[logging.Logger] = None):
+        self.queue = queue
+        self.shard_size = shard_size
+        self.logger = logger or logging.getLogger('Tokenometry')
+
+    def submit(self, config: Dict) -> str:
+        """Shards ``config['PRODUCT_IDS']`` into work items; returns the batch ID."""
+        batch = uuid.uuid4().hex
+        shards = shard(list(config['PRODUCT_IDS']), self.shard_size)
+        self.queue.put(batch, [{'config': dict(config, PRODUCT_IDS=s)} for s in shards])
+        self.logger.info("Submitted batch %s: %d assets in %d shards.", batch, len(config['PRODUCT_IDS']), len(shards))
+        return batch
+
+    def collect(self, batch: str, timeout: Optional[float] = None, poll_interval: float = 0.25) -> ScanResult:
+        """
+        Waits for a batch and merges its signals.
+
+        Returns:
+            A ScanResult with the signals of every finished shard in shard
+            order; assets of failed shards, of shards still open at
+            ``timeout`` and those the workers skipped are listed in ``skipped``.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.queue.batch_status(batch)
+            if status[PENDING] == 0 and status[LEASED] == 0:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                self.logger.warning("Batch %s timed out with %d shards unfinished.",
+                                    batch, status[PENDING] + status[LEASED])
+                break
+            time.sleep(poll_interval)
+
+        merged = ScanResult()
+        for item in self.queue.batch_results(batch):
+            if item['state'] == DONE:
+                merged.extend(item['result']['signals'])
+                merged.skipped.extend(item['result'].get('skipped', []))
+            else:
+                if item['state'] == FAILED:
+                    self.logger.error("Shard %s failed: %s", item['id'], item['error'])
+                merged.skipped.extend(item['payload']['config']['PRODUCT_IDS'])
+        return merged
+
+    def scan(self, config: Dict, timeout: Optional[float] = None) -> ScanResult:
+        """Submits a scan and waits for its merged result."""
+        return self.collect(self.submit(config), timeout=timeout)
+
+
+class Worker:
+    """
+    Leases shards, scans them and stores the signals.
+
+    While a shard is being scanned a heartbeat thread extends its lease
+    every ``lease_seconds / 3``; if the worker dies the lease lapses and
+    another worker retries the shard. One scanner per strategy is kept
+    across shards, so caches, breakers and connection pools are reused.
+    """
+
+    def __init__(self, queue: WorkQueue, worker_id: Optional[str] = None, lease_seconds: float = 60.0,
+                 scanner_factory: Callable[[Dict], Tokenometry] = None, logger: Optional[logging.Logger] = None):
+        self.queue = queue
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+        self.lease_seconds = lease_seconds
+        self.logger = logger or logging.getLogger('Tokenometry')
+        self.scanner_factory = scanner_factory or (lambda config: Tokenometry(config=config, logger=self.logger))
+        self._scanners: Dict[str, Tokenometry] = {}
+
+    def _scanner(self, config: Dict) -> Tokenometry:
+        scanner = self._scanners.get(config['STRATEGY_NAME'])
+        if scanner is None:
+            scanner = self._scanners[config['STRATEGY_NAME']] = self.scanner_factory(config)
+        scanner.config = config
+        return scanner
+
+    def _heartbeat(self, item: WorkItem, stop: threading.Event) -> None:
+        while not stop.wait(self.lease_seconds / 3):
+            if not self.queue.extend(item.id, self.worker_id, self.lease_seconds):
+                self.logger.warning("Lost the lease on shard %s.", item.id)
+                return
+
+    def run_once(self) -> bool:
+        """
+        Leases and processes one shard.
+
+        Returns:
+            False if the queue had nothing to lease.
+        """
+        item = self.queue.lease(self.worker_id, self.lease_seconds)
+        if item is None:
+            return False
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(item, stop), daemon=True)
+        heartbeat.start()
+        try:
+            config = item.payload['config']
+            result = self._scanner(config).scan(deadline=config.get('SHARD_DEADLINE_SECONDS'))
+        except Exception as e:
+            self.logger.error("Shard %s failed on attempt %d: %s", item.id, item.attempts, e)
+            self.queue.fail(item.id, self.worker_id, repr(e))
+            return True
+        finally:
+            stop.set()
+            heartbeat.join()
+        if not self.queue.complete(item.id, self.worker_id, {'signals': list(result), 'skipped': result.skipped}):
+            self.logger.warning("Shard %s was reassigned before it completed; result discarded.", item.id)
+        return True
+
+    def run(self, stop: Optional[threading.Event] = None, idle_sleep: float = 1.0,
+            max_items: Optional[int] = None) -> int:
+        """
+        Processes shards until ``stop`` is set or ``max_items`` shards were handled.
+
+        Returns:
+            The number of shards processed.
+        """
+        stop = stop or threading.Event()
+        processed = 0
+        while not stop.is_set() and (max_items is None or processed < max_items):
+            if self.run_once():
+                processed += 1
+            else:
+                stop.wait(idle_sleep)
+        return processed
@@ -0,0 +1,121 @@
+# enrichment.py
+# Concurrent per-asset enrichment (trend, sentiment, on-chain, ...) under per-source deadlines.
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .metrics import REGISTRY, ScannerMetrics
+
+NEUTRAL = 'Neutral'
+
+
+class EnrichmentSource:
+    """
+    One independent lookup to run for every asset.
+
+    ``fetch`` is called once per asset with the product ID, or, when
+    ``batch`` is true, once per round with the whole asset list and must
+    return a dict keyed by product ID. Results not ready within ``deadline``
+    seconds of the round's start, and lookups that raise, resolve to
+    ``default``.
+    """
+
+    def __init__(self, name: str, fetch: Callable, deadline: float, default: Any = NEUTRAL, batch: bool = False):
+        if deadline <= 0:
+            raise ValueError(f"Deadline for source '{name}' must be positive.")
+        self.name = name
+        self.fetch = fetch
+        self.deadline = deadline
+        self.default = default
+        self.batch = batch
+
+    def __repr__(self) -> str:
+        return f"EnrichmentSource({self.name!r}, deadline={self.deadline})"
+
+
+class Enricher:
+    """
+    Runs every source for every asset concurrently.
+
+    All lookups of a round are submitted to one thread pool at once and
+    collected against each source's deadline, measured from the start of the
+    round, so a round takes as long as the slowest deadline rather than the
+    sum of all requests. Lookups that miss their deadline keep running in the
+    background but their results are discarded.
+    """
+
+    def __init__(self, sources: Sequence[EnrichmentSource], max_workers: int = 32,
+                 metrics: Optional[ScannerMetrics] = None, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            sources: The sources to run; names must be unique
+            max_workers: Threads shared by all lookups
+            metrics: Optional ScannerMetrics for outcome counters and round duration
+            logger: Logger for timeouts and errors
+        """
+        names = [source.name for source in sources]
+        if len(set(names)) != len(names):
+            raise ValueError('Enrichment source names must be unique.')
+        self.sources = list(sources)
+        self.metrics = metrics or ScannerMetrics(REGISTRY)
+        self.logger = logger or logging.getLogger('Tokenometry')
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tokenometry-enrich')
+
+    def run(self, product_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Enriches a list of assets.
+
+        Returns:
+            ``{product_id: {source_name: value}}`` with every source present for
+            every asset; timed-out or failed lookups hold the source's default.
+        """
+        product_ids = list(product_ids)
+        results: Dict[str, Dict[str, Any]] = {p: {} for p in product_ids}
+        with self.metrics.enrichment_duration.time():
+            start = time.monotonic()
+            pending = []
+            for source in self.sources:
+                if source.batch:
+                    pending.append((source, None, self._executor.submit(source.fetch, product_ids)))
+                else:
+                    pending.extend((source, p, self._executor.submit(source.fetch, p)) for p in product_ids)
+
+            for source in sorted(self.sources, key=lambda s: s.deadline):
+                futures = [(p, f) for s, p, f in pending if s is source]
+                wait_futures([f for _, f in futures], timeout=max(0.0, start + source.deadline - time.monotonic()))
+                for product_id, future in futures:
+                    self._collect(source, product_id, future, product_ids, results)
+        return results
+
+    def _collect(self, source: EnrichmentSource, product_id: Optional[str], future: Future,
+                 product_ids: List[str], results: Dict[str, Dict[str, Any]]) -> None:
+        targets = product_ids if product_id is None else [product_id]
+        if not future.done():
+            future.cancel()
+            self.metrics.enrichment.inc(len(targets), source=source.name, result='timeout')
+            self.logger.warning("Enrichment source '%s' missed its %.1fs deadline for %s.",
+                                source.name, source.deadline, ', '.join(targets))
+            value = {p: source.default for p in targets}
+        elif future.exception() is not None:
+            self.metrics.enrichment.inc(len(targets), source=source.name, result='error')
+            self.logger.error("Enrichment source '%s' failed for %s: %s",
+                              source.name, ', '.join(targets), future.exception())
+            value = {p: source.default for p in targets}
+        else:
+            self.metrics.enrichment.inc(len(targets), source=source.name, result='ok')
+            value = future.result() if product_id is None else {product_id: future.result()}
+        for p in targets:
+            results[p][source.name] = value.get(p, source.default)
+
+    def close(self) -> None:
+        """Stops accepting work; lookups still running finish in the background."""
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self) -> 'Enricher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,24 @@
+# env.py
+# Explicit environment loading; importing tokenometry never reads .env on its own.
+
+import os
+from typing import Optional
+
+
+def load_env(path: Optional[str] = None, override: bool = False) -> bool:
+    """
+    Loads API keys and other settings from a ``.env`` file into ``os.environ``.
+
+    Args:
+        path: Path to the .env file; defaults to searching from the working directory
+        override: Whether values from the file replace variables already set
+
+    Returns:
+        True if a file was found and loaded, False otherwise.
+    """
+    from dotenv import find_dotenv, load_dotenv
+
+    dotenv_path = path or find_dotenv(usecwd=True)
+    if not dotenv_path or not os.path.exists(dotenv_path):
+        return False
+    return load_dotenv(dotenv_path, override=override)
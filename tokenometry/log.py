@@ -0,0 +1,80 @@
+# log.py
+# Idempotent, non-blocking logging setup shared by every Tokenometry instance.
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+from typing import Dict, Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_lock = threading.Lock()
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def setup_logging(name: str = 'Tokenometry', level: int = logging.INFO,
+                  log_file: Optional[str] = 'tokenometry.log') -> logging.Logger:
+    """
+    Configures a logger whose records are written by a background thread.
+
+    The logger gets a single ``QueueHandler``; a ``QueueListener`` drains the
+    queue into the console and file handlers, so disk and console I/O stay off
+    the scan thread. Calling this again for the same name is a no-op, so many
+    instances never duplicate handlers.
+
+    Args:
+        name: Logger name
+        level: Level applied to the logger and its output handlers
+        log_file: Path of the log file, or None for console output only
+
+    Returns:
+        The configured logger.
+    """
+    logger = logging.getLogger(name)
+    with _lock:
+        if name in _listeners:
+            return logger
+
+        log_format = logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler()]
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setLevel(level)
+            handler.setFormatter(log_format)
+
+        log_queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+
+        logger.setLevel(level)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return logger
+
+
+def shutdown_logging(name: Optional[str] = None) -> None:
+    """
+    Flushes queued records and stops the background writer(s).
+
+    Args:
+        name: Logger to shut down; all configured loggers if omitted
+    """
+    with _lock:
+        names = [name] if name is not None else list(_listeners)
+        for logger_name in names:
+            listener = _listeners.pop(logger_name, None)
+            if listener is None:
+                continue
+            listener.stop()
+            logger = logging.getLogger(logger_name)
+            for handler in list(logger.handlers):
+                if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+                    logger.removeHandler(handler)
+            for handler in listener.handlers:
+                handler.close()
+
+
+atexit.register(shutdown_logging)
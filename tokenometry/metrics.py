@@ -0,0 +1,289 @@
+# metrics.py
+# A small, dependency-free metrics registry with Prometheus text exposition.
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class holding the name, help text, label names and per-label-set state."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Renders the metric in the Prometheus text exposition format."""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError('Counters can only be incremented by non-negative amounts.')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}' for key, v in items]
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}' for key, v in items]
+
+
+class Histogram(_Metric):
+    """A cumulative histogram with fixed upper bounds."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            state['counts'][index] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Context manager observing the wall-clock duration of its body."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state['count'] if state else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, {'counts': list(s['counts']), 'sum': s['sum'], 'count': s['count']})
+                           for key, s in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), state['counts']):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(state["sum"])}')
+            lines.append(f'{self.name}_count{labels} {state["count"]}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A thread-safe collection of metrics.
+
+    Metrics are created on first request and returned as-is afterwards, so
+    several Tokenometry instances can share one registry and one endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric '{name}' is already registered with a different type or labels.")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Renders every registered metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+class ScannerMetrics:
+    """The set of metrics published by a Tokenometry scanner."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.scan_duration = registry.histogram(
+            'tokenometry_scan_duration_seconds', 'Wall-clock duration of a full scan.', ['strategy'])
+        self.scan_skipped = registry.counter(
+            'tokenometry_scan_skipped_assets_total', 'Assets left out of a scan because its deadline passed.',
+            ['strategy'])
+        self.request_duration = registry.histogram(
+            'tokenometry_coinbase_request_duration_seconds', 'Latency of Coinbase REST requests.',
+            ['endpoint', 'granularity'])
+        self.request_errors = registry.counter(
+            'tokenometry_coinbase_request_errors_total', 'Failed Coinbase REST requests.',
+            ['endpoint', 'product_id'])
+        self.request_retries = registry.counter(
+            'tokenometry_coinbase_request_retries_total', 'Coinbase REST requests retried after an error.',
+            ['endpoint'])
+        self.request_hedges = registry.counter(
+            'tokenometry_coinbase_request_hedges_total', 'Duplicate requests sent for slow Coinbase calls.',
+            ['endpoint'])
+        self.short_circuits = registry.counter(
+            'tokenometry_circuit_short_circuits_total', 'Requests skipped because the circuit breaker was open.',
+            ['endpoint', 'product_id'])
+        self.circuit_state = registry.gauge(
+            'tokenometry_circuit_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open).',
+            ['endpoint', 'product_id'])
+        self.rate_limit_wait = registry.histogram(
+            'tokenometry_rate_limiter_wait_seconds', 'Time spent waiting on the request rate limiter.',
+            ['limiter'], buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+        self.cache_requests = registry.counter(
+            'tokenometry_cache_requests_total', 'Cache lookups by outcome (hit ratio = hit / total).',
+            ['cache', 'result'])
+        self.prescreen = registry.counter(
+            'tokenometry_prescreen_total', 'Pre-screen outcomes per asset evaluation.', ['strategy', 'result'])
+        self.signals = registry.counter(
+            'tokenometry_signals_total', 'Actionable signals emitted.', ['strategy', 'asset', 'signal'])
+        self.enrichment = registry.counter(
+            'tokenometry_enrichment_total', 'Enrichment source lookups by outcome (ok, timeout, error).',
+            ['source', 'result'])
+        self.enrichment_duration = registry.histogram(
+            'tokenometry_enrichment_duration_seconds', 'Wall-clock duration of an enrichment round.')
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        self.cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would otherwise flood stderr.
+        pass
+
+
+def start_http_server(port: int = 9464, addr: str = '127.0.0.1',
+                      registry: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Serves a registry at http://addr:port/metrics from a daemon thread.
+
+    Args:
+        port: TCP port to listen on (0 picks a free port).
+        addr: Interface to bind; defaults to localhost only.
+        registry: Registry to expose; defaults to the module-level REGISTRY.
+
+    Returns:
+        The running server. Call ``shutdown()`` on it to stop serving.
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry or REGISTRY})
+    server = ThreadingHTTPServer((addr, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='tokenometry-metrics', daemon=True)
+    thread.start()
+    return server
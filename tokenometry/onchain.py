@@ -0,0 +1,199 @@
+# onchain.py
+# Locally cached daily on-chain series with a rolling window sum.
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .metrics import REGISTRY, ScannerMetrics
+from .transport import http_get
+
+GLASSNODE_URL = 'https://api.glassnode.com/v1/metrics/'
+DAY_SECONDS = 86400
+
+
+class RollingSeries:
+    """
+    The points of a series within ``window`` steps (days by default) of its
+    latest point, plus their running sum.
+
+    The window is defined by date, so a gap in the series leaves fewer points
+    in it instead of stretching it further back. Appending a point adds its
+    value and subtracts the ones it pushes out, so the window sum is O(1)
+    amortised per new point; every ``window`` appends the sum is recomputed
+    from the points so rounding error cannot build up.
+    """
+
+    def __init__(self, window: int, points: Optional[List[Tuple[int, float]]] = None, step: int = DAY_SECONDS):
+        self.window = window
+        self.step = step
+        self.points: Deque[Tuple[int, float]] = deque()
+        self.total = 0.0
+        self._appends = 0
+        for t, v in points or ():
+            self.append(t, v)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return self.points[-1][0] if self.points else None
+
+    def append(self, timestamp: int, value: float) -> bool:
+        """Adds a point newer than the last one; returns False for stale or duplicate points."""
+        if self.points and timestamp <= self.points[-1][0]:
+            return False
+        self.points.append((int(timestamp), float(value)))
+        self.total += float(value)
+        start = int(timestamp) - self.window * self.step
+        while self.points[0][0] <= start:
+            self.total -= self.points.popleft()[1]
+        self._appends += 1
+        if self._appends % self.window == 0:
+            self.resum()
+        return True
+
+    def resum(self) -> float:
+        """Recomputes the running sum from the window, clearing accumulated rounding error."""
+        self.total = sum(v for _, v in self.points)
+        return self.total
+
+
+class OnChainCache:
+    """
+    Daily Glassnode metrics cached per asset, topped up with only new days.
+
+    The first lookup for an asset requests ``window`` days; afterwards a
+    request is made only once the next daily point can exist (its day has
+    closed), asking just for the days after the last stored point, and at
+    most every ``retry_seconds`` while Glassnode has not published it yet.
+    With ``path`` set, series are persisted as JSON and survive restarts.
+    """
+
+    def __init__(self, api_key: Optional[str], metric: str = 'distribution/exchange_net_position_change',
+                 window: int = 7, path: Optional[str] = None, retry_seconds: float = 3600,
+                 fetch: Callable = http_get, clock: Callable[[], float] = time.time,
+                 metrics: Optional[ScannerMetrics] = None, logger: Optional[logging.Logger] = None,
+                 max_age_seconds: float = DAY_SECONDS):
+        """
+        Args:
+            api_key: Glassnode API key
+            metric: Glassnode metric path
+            window: Number of daily points summed by ``net_flow``
+            path: Optional JSON file the series are persisted to
+            retry_seconds: Minimum delay between requests for an asset whose next point is late
+            fetch: HTTP GET function, ``http_get`` by default
+            clock: Wall-clock time source (epoch seconds)
+            metrics: Optional ScannerMetrics for cache hit/miss counters
+            logger: Logger for fetch errors
+            max_age_seconds: How long after its day closes the latest point still
+                counts as current; older series read as no data
+        """
+        self.api_key = api_key
+        self.metric = metric
+        self.window = window
+        self.path = path
+        self.retry_seconds = retry_seconds
+        self.max_age_seconds = max_age_seconds
+        self.fetch = fetch
+        self.clock = clock
+        self.metrics = metrics or ScannerMetrics(REGISTRY)
+        self.logger = logger or logging.getLogger('Tokenometry')
+        self._lock = threading.Lock()
+        self._series: Dict[str, RollingSeries] = {}
+        self._last_request: Dict[str, float] = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                stored = json.load(f)
+            if stored.get('metric') == metric:
+                self._series = {asset: RollingSeries(window, [tuple(p) for p in points])
+                                for asset, points in stored.get('series', {}).items()}
+
+    def _due(self, asset: str, now: float) -> bool:
+        # Throttled even before the first point arrives, so an empty response is not re-requested every scan
+        if now - self._last_request.get(asset, float('-inf')) < self.retry_seconds:
+            return False
+        series = self._series.get(asset)
+        if series is None or series.last_timestamp is None:
+            return True
+        # Glassnode stamps a daily point with the start of its day; the next one exists once that day closes
+        return now >= series.last_timestamp + 2 * DAY_SECONDS
+
+    def _request(self, asset: str, since: int) -> List[Dict]:
+        params = {'a': asset, 's': since, 'i': '24h', 'api_key': self.api_key}
+        response = self.fetch(GLASSNODE_URL + self.metric, params=params)
+        response.raise_for_status()
+        return response.json() or []
+
+    def refresh(self, asset: str) -> int:
+        """
+        Fetches any new daily points for an asset, if one can be due.
+
+        Returns:
+            The number of points appended.
+        """
+        now = self.clock()
+        with self._lock:
+            due = self._due(asset, now)
+            series = self._series.get(asset)
+            since = (series.last_timestamp + DAY_SECONDS if series is not None and series.last_timestamp is not None
+                     else int(now) // DAY_SECONDS * DAY_SECONDS - self.window * DAY_SECONDS)
+            if due:
+                self._last_request[asset] = now
+        self.metrics.record_cache('onchain', not due)
+        if not due:
+            return 0
+
+        points = sorted((int(item['t']), float(item['v'])) for item in self._request(asset, since)
+                        if item.get('v') is not None)
+        with self._lock:
+            series = self._series.setdefault(asset, RollingSeries(self.window))
+            added = sum(series.append(t, v) for t, v in points)
+        if added:
+            self._save()
+        return added
+
+    def net_flow(self, asset: str) -> Optional[float]:
+        """
+        Sum of the daily values in the ``window`` days up to an asset's latest point (e.g. 'BTC').
+
+        Returns:
+            The rolling sum, or None when no data is available or the latest
+            point is more than ``max_age_seconds`` past the close of its day.
+        """
+        try:
+            self.refresh(asset)
+        except Exception as e:
+            self.logger.error("Error fetching on-chain data for %s: %s", asset, e)
+        now = self.clock()
+        with self._lock:
+            series = self._series.get(asset)
+            if series is None or not series.points:
+                return None
+            # Daily points are stamped with the start of their day
+            if now - (series.last_timestamp + DAY_SECONDS) > self.max_age_seconds:
+                return None
+            return series.total
+
+    def status(self, asset: str) -> str:
+        """'Accumulation' for net outflows from exchanges, 'Distribution' for inflows, else 'Neutral'."""
+        if not self.api_key:
+            return 'Neutral'
+        flow = self.net_flow(asset)
+        if flow is None:
+            return 'Neutral'
+        return 'Accumulation' if flow < 0 else 'Distribution'
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            stored = {'metric': self.metric,
+                      'series': {asset: list(s.points) for asset, s in self._series.items()}}
+        # Written to a temporary file and renamed, so a crash never leaves a torn cache
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(stored, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,40 @@
+# ratelimit.py
+# Token-bucket rate limiting for outbound API requests.
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket.
+
+    Coinbase public endpoints allow roughly 10 requests per second per IP;
+    callers acquire one token per request and block until one is available.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        if rate_per_second <= 0:
+            raise ValueError('rate_per_second must be positive.')
+        self.rate = float(rate_per_second)
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping if necessary.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,193 @@
+# reporting.py
+# Headless backtest charts: LTTB-downsampled series rendered with Agg in a process pool.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: picks ``threshold`` points that preserve a series' shape.
+
+    The first and last points are always kept. The rest are split into
+    ``threshold - 2`` buckets, and from each the point forming the largest
+    triangle with the previously selected point and the next bucket's mean
+    is chosen, so peaks and troughs survive where plain striding drops them.
+
+    Args:
+        x: Monotonic x values (e.g. int64 timestamps)
+        y: Finite y values, same length as ``x``
+        threshold: Number of points to keep
+
+    Returns:
+        Sorted indices of the selected points (all indices if the series is
+        already shorter than ``threshold``).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(series: pd.Series, max_points: int = DEFAULT_MAX_POINTS) -> pd.Series:
+    """LTTB-downsamples a Series with a DatetimeIndex (NaNs are dropped first)."""
+    series = series.dropna()
+    x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else series.index.to_numpy()
+    return series.iloc[lttb_indices(x, series.to_numpy(), max_points)]
+
+
+def _trend_spans(trend: pd.Series, value: str) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Contiguous runs where ``trend == value``, as (start, end) pairs."""
+    mask = (trend == value).to_numpy()
+    if not mask.any():
+        return []
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    index = trend.index
+    return [(index[s], index[min(e, len(index) - 1)]) for s, e in zip(edges[::2], edges[1::2])]
+
+
+def prepare_backtest(df: pd.DataFrame, trades: Sequence[Dict], product_id: str,
+                     initial_capital: Optional[float] = None, max_points: int = DEFAULT_MAX_POINTS) -> Dict:
+    """
+    Reduces a backtest to what its chart needs: downsampled series, trend spans and trade markers.
+
+    The result is small and picklable, so it is cheap to ship to a worker process.
+
+    Args:
+        df: Backtest frame with 'Close', and optionally 'Portfolio_Value' and 'Trend' columns
+        trades: Trade dicts with 'type', 'date' and 'price' keys
+        product_id: Asset shown in the title
+        initial_capital: Scales the buy-and-hold curve; defaults to the first portfolio value
+        max_points: Points kept per series
+
+    Returns:
+        A chart payload for ``render_backtest``.
+    """
+    payload = {'product_id': product_id, 'close': downsample(df['Close'], max_points), 'spans': {}, 'trades': {}}
+    if 'Trend' in df.columns:
+        payload['spans'] = {t: _trend_spans(df['Trend'], t) for t in ('Bullish', 'Bearish')}
+    if 'Portfolio_Value' in df.columns:
+        equity = df['Portfolio_Value']
+        capital = initial_capital if initial_capital is not None else equity.dropna().iloc[0]
+        payload['equity'] = downsample(equity, max_points)
+        payload['buy_hold'] = downsample(df['Close'] / df['Close'].iloc[0] * capital, max_points)
+    for kind in ('BUY', 'SELL', 'STOP-LOSS'):
+        marks = [t for t in trades if t['type'] == kind]
+        payload['trades'][kind] = ([t['date'] for t in marks], [t['price'] for t in marks])
+    return payload
+
+
+def render_backtest(payload: Dict, path: str, dpi: int = 100) -> str:
+    """
+    Draws a prepared backtest to a PNG or SVG file (chosen by the extension).
+
+    Uses a bare ``Figure`` on the Agg canvas, never pyplot, so it needs no
+    display and is safe in worker processes.
+
+    Returns:
+        The written path.
+    """
+    import matplotlib.dates as mdates
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    product_id = payload['product_id']
+    has_equity = 'equity' in payload
+    fig = Figure(figsize=(15, 12 if has_equity else 8))
+    FigureCanvasAgg(fig)
+    if has_equity:
+        ax1, ax2 = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [2, 1]})
+    else:
+        ax1, ax2 = fig.subplots(1, 1), None
+
+    close = payload['close']
+    ax1.plot(close.index, close.to_numpy(), label='Close Price', color='skyblue', lw=1.5, zorder=1)
+    for trend, color in (('Bullish', 'green'), ('Bearish', 'red')):
+        for i, (start, end) in enumerate(payload['spans'].get(trend, [])):
+            ax1.axvspan(start, end, color=color, alpha=0.1, lw=0, label=f'{trend} Trend' if i == 0 else None)
+    for kind, marker, color, label in (('BUY', '^', 'lime', 'Buy'), ('SELL', 'v', 'blue', 'Sell (Signal)'),
+                                       ('STOP-LOSS', 'x', 'maroon', 'Sell (Stop-Loss)')):
+        dates, prices = payload['trades'].get(kind, ([], []))
+        if dates:
+            ax1.plot(dates, prices, marker, ms=10, color=color, label=label, zorder=2)
+    ax1.set_title(f'{product_id} Backtest')
+    ax1.set_ylabel('Price (USD)')
+    ax1.legend()
+    ax1.grid(True, which='both', ls='--', lw=0.5)
+
+    if ax2 is not None:
+        equity, buy_hold = payload['equity'], payload['buy_hold']
+        ax2.plot(equity.index, equity.to_numpy(), label='Strategy Portfolio Value', color='blue', lw=2)
+        ax2.plot(buy_hold.index, buy_hold.to_numpy(), label='Buy & Hold', color='grey', ls='--', lw=1.5)
+        ax2.set_title('Portfolio Value Over Time')
+        ax2.set_ylabel('Portfolio Value (USD)')
+        ax2.legend()
+        ax2.grid(True, which='both', ls='--', lw=0.5)
+    last_ax = ax2 if ax2 is not None else ax1
+    last_ax.set_xlabel('Date')
+    last_ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    fig.savefig(path, dpi=dpi)
+    return path
+
+
+def _render_job(args: Tuple[Dict, str, int]) -> Tuple[str, str]:
+    payload, path, dpi = args
+    return payload['product_id'], render_backtest(payload, path, dpi)
+
+
+def render_many(backtests: Iterable[Tuple[str, pd.DataFrame, Sequence[Dict]]], out_dir: str,
+                fmt: str = 'png', workers: Optional[int] = None, max_points: int = DEFAULT_MAX_POINTS,
+                initial_capital: Optional[float] = None, dpi: int = 100) -> Dict[str, str]:
+    """
+    Charts many backtests in parallel.
+
+    Each backtest is downsampled in this process (so only a few thousand
+    points per chart are pickled) and drawn by a pool of worker processes.
+
+    Args:
+        backtests: (product_id, frame, trades) triples
+        out_dir: Directory for ``<product_id>.<fmt>`` files
+        fmt: 'png' or 'svg'
+        workers: Worker processes; defaults to the CPU count, 1 renders in-process
+        max_points: Points kept per series
+        initial_capital: Passed to ``prepare_backtest``
+        dpi: Raster resolution
+
+    Returns:
+        A dict of product ID to written file path.
+    """
+    if fmt not in ('png', 'svg'):
+        raise ValueError("fmt must be 'png' or 'svg'.")
+    jobs = [(prepare_backtest(df, trades, product_id, initial_capital, max_points),
+             os.path.join(out_dir, f'{product_id}.{fmt}'), dpi)
+            for product_id, df, trades in backtests]
+    if workers == 1 or len(jobs) <= 1:
+        return dict(_render_job(job) for job in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(executor.map(_render_job, jobs))
@@ -0,0 +1,195 @@
+# retry.py
+# Retries with jittered exponential backoff, and hedged requests for tail latency.
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Callable, Deque, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    True for errors worth retrying: timeouts, connection errors, 429 and 5xx.
+
+    Client errors such as 400 or 404 carry a response with a 4xx status and
+    are not retried, since repeating them cannot succeed.
+    """
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return True
+
+
+class RetryPolicy:
+    """
+    Retries a call with "full jitter" exponential backoff.
+
+    Retry ``n`` (from 0) sleeps a uniform random time in
+    ``[0, min(max_delay, base_delay * 2**n)]``, which spreads retries from
+    many callers instead of synchronising them.
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0,
+                 retryable: Callable[[BaseException], bool] = is_retryable,
+                 sleep: Callable[[float], None] = time.sleep, rng: Optional[random.Random] = None):
+        if attempts < 1:
+            raise ValueError('attempts must be at least 1.')
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number ``retry`` (0-based)."""
+        return self.rng.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    def call(self, fn: Callable[[], T],
+             on_retry: Optional[Callable[[int, BaseException, float], None]] = None) -> T:
+        """
+        Calls ``fn`` until it succeeds, fails with a non-retryable error, or attempts run out.
+
+        Args:
+            fn: The call to make
+            on_retry: Called as ``on_retry(retry_number, error, delay)`` before each sleep
+
+        Returns:
+            The result of the first successful call; the last error is re-raised otherwise.
+        """
+        for attempt in range(self.attempts):
+            try:
+                return fn()
+            except Exception as e:
+                if attempt == self.attempts - 1 or not self.retryable(e):
+                    raise
+                delay = self.backoff(attempt)
+                if on_retry is not None:
+                    on_retry(attempt + 1, e, delay)
+                self.sleep(delay)
+        raise AssertionError('unreachable')
+
+
+class LatencyTracker:
+    """A sliding window of recent call latencies with quantile lookups."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The ``q`` quantile (nearest rank) of the window, or None when it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[max(0, math.ceil(q * len(samples)) - 1)]
+
+
+class HedgedCaller:
+    """
+    Sends a duplicate of a call that is slower than usual and takes whichever finishes first.
+
+    The hedge fires once the call has run longer than the ``quantile`` of
+    recent latencies, so only the slowest few percent of calls are
+    duplicated; ``budget`` additionally caps hedges at that fraction of all
+    calls. Both copies go through ``fn``, so any rate limiter inside it
+    still applies to hedges. The losing copy is left to finish in the
+    background and its result is discarded.
+    """
+
+    def __init__(self, quantile: float = 0.95, min_samples: int = 20, budget: float = 0.1,
+                 max_workers: int = 16, window: int = 200):
+        """
+        Args:
+            quantile: Latency quantile after which a hedge is sent
+            min_samples: Latencies observed before hedging starts
+            budget: Maximum hedges as a fraction of calls
+            max_workers: Threads running primary and hedged calls
+            window: Number of recent latencies the quantile is taken over
+        """
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.budget = budget
+        self.latency = LatencyTracker(window)
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tokenometry-hedge')
+
+    def _timed(self, fn: Callable[[], T]) -> Callable[[], T]:
+        def run():
+            start = time.perf_counter()
+            result = fn()
+            self.latency.observe(time.perf_counter() - start)
+            return result
+        return run
+
+    def _hedge_delay(self) -> Optional[float]:
+        if len(self.latency) < self.min_samples:
+            return None
+        with self._lock:
+            if self.hedges >= self.budget * self.calls:
+                return None
+        return self.latency.quantile(self.quantile)
+
+    def call(self, fn: Callable[[], T], timeout: Optional[float] = None,
+             on_hedge: Optional[Callable[[], None]] = None) -> T:
+        """
+        Runs ``fn``, hedging it if it is slow.
+
+        Args:
+            fn: The call to make; must be safe to run twice concurrently
+            timeout: Seconds to wait for any copy before raising TimeoutError
+            on_hedge: Called when the duplicate is sent
+
+        Returns:
+            The first successful result; if every copy fails, the last error is raised.
+        """
+        with self._lock:
+            self.calls += 1
+        deadline = None if timeout is None else time.monotonic() + timeout
+        delay = self._hedge_delay()
+        timed = self._timed(fn)
+        pending = {self._executor.submit(timed)}
+        hedged = delay is None
+        error: Optional[BaseException] = None
+        while pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            wait_for = remaining if hedged else (delay if remaining is None else min(delay, remaining))
+            done, pending = wait_futures(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if not done and not hedged:
+                if remaining is not None and remaining <= delay:
+                    break
+                hedged = True
+                with self._lock:
+                    self.hedges += 1
+                if on_hedge is not None:
+                    on_hedge()
+                pending.add(self._executor.submit(timed))
+            elif not done:
+                break
+        if error is not None and not pending:
+            raise error
+        raise TimeoutError(f'Call did not complete within {timeout}s.')
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,91 @@
+# scheduler.py
+# Crossover-proximity index that decides how often each asset is refreshed.
+
+import heapq
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class ProximityIndex:
+    """
+    Schedules asset refreshes by how close their MAs are to crossing.
+
+    Proximity is the short/long MA spread in units of ATR. Assets within
+    ``near_atr`` are refreshed every ``fast_seconds``; assets beyond
+    ``far_atr`` every ``slow_seconds``; in between the interval is
+    interpolated linearly. Due times live in a min-heap, so finding the
+    assets to refresh costs O(k log n) for k due assets.
+    """
+
+    def __init__(self, fast_seconds: float, slow_seconds: float, near_atr: float = 0.5,
+                 far_atr: float = 3.0, clock: Callable[[], float] = time.monotonic):
+        if slow_seconds < fast_seconds:
+            raise ValueError('slow_seconds must be >= fast_seconds.')
+        if far_atr <= near_atr:
+            raise ValueError('far_atr must be greater than near_atr.')
+        self.fast_seconds = fast_seconds
+        self.slow_seconds = slow_seconds
+        self.near_atr = near_atr
+        self.far_atr = far_atr
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due_at: Dict[str, float] = {}
+        self._proximity: Dict[str, Optional[float]] = {}
+        self._sequence = 0
+
+    def interval(self, proximity: Optional[float]) -> float:
+        """Refresh interval in seconds for a proximity (None means unknown: refresh fast)."""
+        if proximity is None or proximity <= self.near_atr:
+            return self.fast_seconds
+        if proximity >= self.far_atr:
+            return self.slow_seconds
+        fraction = (proximity - self.near_atr) / (self.far_atr - self.near_atr)
+        return self.fast_seconds + fraction * (self.slow_seconds - self.fast_seconds)
+
+    def update(self, product_id: str, proximity: Optional[float]) -> float:
+        """
+        Records an asset's latest proximity and schedules its next refresh.
+
+        Returns:
+            The monotonic time at which the asset is next due.
+        """
+        due_at = self.clock() + self.interval(proximity)
+        with self._lock:
+            self._sequence += 1
+            self._proximity[product_id] = proximity
+            self._due_at[product_id] = due_at
+            heapq.heappush(self._heap, (due_at, self._sequence, product_id))
+        return due_at
+
+    def is_scheduled(self, product_id: str) -> bool:
+        with self._lock:
+            return product_id in self._due_at
+
+    def proximity(self, product_id: str) -> Optional[float]:
+        """Last recorded proximity in ATRs, or None if unknown."""
+        with self._lock:
+            return self._proximity.get(product_id)
+
+    def due(self, universe: Iterable[str]) -> List[str]:
+        """
+        Pops the assets of ``universe`` that should be refreshed now.
+
+        Assets never seen before are always due. Returned assets are
+        unscheduled until ``update`` is called for them again.
+        """
+        universe = list(universe)
+        members = set(universe)
+        now = self.clock()
+        with self._lock:
+            due = {p for p in universe if p not in self._due_at}
+            while self._heap and self._heap[0][0] <= now:
+                due_at, _, product_id = heapq.heappop(self._heap)
+                # Skip entries superseded by a later update
+                if self._due_at.get(product_id) != due_at:
+                    continue
+                del self._due_at[product_id]
+                if product_id in members:
+                    due.add(product_id)
+        return [p for p in universe if p in due]
@@ -0,0 +1,216 @@
+# sentiment.py
+# News sentiment scoring with a per-headline polarity cache and batched scoring.
+#
+# TextBlob is an optional dependency: pip install "tokenometry[sentiment]"
+
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .metrics import REGISTRY, ScannerMetrics
+from .transport import http_get
+
+NEWS_API_URL = 'https://newsapi.org/v2/everything'
+
+
+def textblob_polarity(title: str) -> float:
+    """Default scorer: TextBlob polarity in [-1, 1]. Module-level so process pools can pickle it."""
+    try:
+        from textblob import TextBlob
+    except ImportError as e:
+        raise ImportError('Sentiment scoring requires textblob: pip install "tokenometry[sentiment]"') from e
+    return TextBlob(title).sentiment.polarity
+
+
+def _score_chunk(scorer: Callable[[str], float], titles: Sequence[str]) -> List[float]:
+    return [scorer(title) for title in titles]
+
+
+def article_key(article: Dict) -> str:
+    """Cache key for an article: a hash of its URL, or of its title when there is no URL."""
+    identity = article.get('url') or article.get('title') or ''
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+
+class SentimentService:
+    """
+    Aggregate news sentiment per asset, scoring each headline once.
+
+    Polarities are cached by article (URL or title hash) for ``ttl`` seconds,
+    and the NewsAPI article list per search term for ``fetch_ttl`` seconds.
+    ``label_many`` fetches every asset's headlines concurrently, collects the
+    ones not seen before and scores them in one batch (in a process pool when
+    ``workers > 1``), so a cycle's cost follows the number of new headlines
+    rather than the number of assets.
+    """
+
+    def __init__(self, api_key: Optional[str], ttl: float = 24 * 3600, fetch_ttl: float = 900,
+                 max_articles: int = 20, bullish_threshold: float = 0.05, bearish_threshold: float = -0.05,
+                 workers: int = 0, fetch_workers: int = 8, scorer: Callable[[str], float] = textblob_polarity,
+                 fetch: Callable = http_get, metrics: Optional[ScannerMetrics] = None,
+                 clock: Callable[[], float] = time.monotonic, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            api_key: NewsAPI key; without one every asset is Neutral
+            ttl: Seconds a headline's polarity stays cached
+            fetch_ttl: Seconds an asset's article list is reused before NewsAPI is queried again
+            max_articles: Most recent articles averaged per asset
+            bullish_threshold: Average polarity above which sentiment is Positive
+            bearish_threshold: Average polarity below which sentiment is Negative
+            workers: Scoring processes; 0 or 1 scores in the calling process
+            fetch_workers: Threads used to query NewsAPI for several assets at once
+            scorer: Picklable function mapping a headline to a polarity
+            fetch: HTTP GET function, ``http_get`` by default
+            metrics: Optional ScannerMetrics for cache hit/miss counters
+            clock: Time source for expiry
+            logger: Logger for fetch errors
+        """
+        self.api_key = api_key
+        self.ttl = ttl
+        self.fetch_ttl = fetch_ttl
+        self.max_articles = max_articles
+        self.bullish_threshold = bullish_threshold
+        self.bearish_threshold = bearish_threshold
+        self.workers = workers
+        self.fetch_workers = fetch_workers
+        self.scorer = scorer
+        self.fetch = fetch
+        self.metrics = metrics or ScannerMetrics(REGISTRY)
+        self.clock = clock
+        self.logger = logger or logging.getLogger('Tokenometry')
+        self._lock = threading.Lock()
+        self._polarity: Dict[str, Tuple[float, float]] = {}
+        self._articles: Dict[str, Tuple[List[Dict], float]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _fetch_articles(self, search_term: str) -> List[Dict]:
+        now = self.clock()
+        with self._lock:
+            cached = self._articles.get(search_term)
+        if cached is not None and cached[1] > now:
+            self.metrics.record_cache('news_articles', True)
+            return cached[0]
+        self.metrics.record_cache('news_articles', False)
+        params = {'q': search_term, 'sortBy': 'publishedAt', 'language': 'en', 'apiKey': self.api_key}
+        response = self.fetch(NEWS_API_URL, params=params)
+        response.raise_for_status()
+        articles = response.json().get('articles', [])[:self.max_articles]
+        with self._lock:
+            self._articles[search_term] = (articles, now + self.fetch_ttl)
+        return articles
+
+    def score_titles(self, titles: Iterable[Tuple[str, str]]) -> Dict[str, float]:
+        """
+        Scores (key, title) pairs, reusing cached polarities.
+
+        Returns:
+            A dict of key to polarity for every pair given.
+        """
+        now = self.clock()
+        scores, pending = {}, {}
+        with self._lock:
+            for key, title in titles:
+                cached = self._polarity.get(key)
+                if cached is not None and cached[1] > now:
+                    scores[key] = cached[0]
+                elif key not in pending:
+                    pending[key] = title
+        if scores:
+            self.metrics.cache_requests.inc(len(scores), cache='sentiment', result='hit')
+        if pending:
+            self.metrics.cache_requests.inc(len(pending), cache='sentiment', result='miss')
+            keys, batch = list(pending), list(pending.values())
+            polarities = self._score_batch(batch)
+            expires = self.clock() + self.ttl
+            with self._lock:
+                for key, polarity in zip(keys, polarities):
+                    self._polarity[key] = (polarity, expires)
+                    scores[key] = polarity
+        return scores
+
+    def _score_batch(self, titles: List[str]) -> List[float]:
+        if self.workers <= 1 or len(titles) < 2 * self.workers:
+            return _score_chunk(self.scorer, titles)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        size = -(-len(titles) // self.workers)
+        chunks = [titles[i:i + size] for i in range(0, len(titles), size)]
+        results = self._pool.map(_score_chunk, [self.scorer] * len(chunks), chunks)
+        return [polarity for chunk in results for polarity in chunk]
+
+    def polarity_many(self, product_ids: Sequence[str]) -> Dict[str, Optional[float]]:
+        """
+        Average headline polarity per asset, or None where news could not be fetched.
+
+        Article lists are fetched concurrently and all unseen headlines are
+        scored in a single batch.
+        """
+        terms = {product_id: product_id.split('-')[0] for product_id in product_ids}
+        unique_terms = list(dict.fromkeys(terms.values()))
+        articles: Dict[str, Optional[List[Dict]]] = {}
+
+        def fetch(term):
+            try:
+                return term, self._fetch_articles(term)
+            except Exception as e:
+                self.logger.error("Error fetching news for %s: %s", term, e)
+                return term, None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.fetch_workers, len(unique_terms)))) as executor:
+            articles.update(executor.map(fetch, unique_terms))
+
+        titled = [(article_key(a), a['title']) for batch in articles.values() if batch
+                  for a in batch if a.get('title')]
+        scores = self.score_titles(titled)
+
+        result: Dict[str, Optional[float]] = {}
+        for product_id, term in terms.items():
+            batch = articles.get(term)
+            if batch is None:
+                result[product_id] = None
+            elif not batch:
+                result[product_id] = 0.0
+            else:
+                # Untitled articles count as neutral, matching the original per-asset average
+                total = sum(scores[article_key(a)] for a in batch if a.get('title'))
+                result[product_id] = total / len(batch)
+        return result
+
+    def label(self, polarity: Optional[float]) -> str:
+        """Maps an average polarity to 'Positive', 'Negative' or 'Neutral'."""
+        if polarity is None:
+            return 'Neutral'
+        if polarity > self.bullish_threshold:
+            return 'Positive'
+        if polarity < self.bearish_threshold:
+            return 'Negative'
+        return 'Neutral'
+
+    def label_many(self, product_ids: Sequence[str]) -> Dict[str, str]:
+        """Sentiment label per asset; Neutral for every asset when no API key is configured."""
+        if not self.api_key:
+            return {product_id: 'Neutral' for product_id in product_ids}
+        return {product_id: self.label(polarity)
+                for product_id, polarity in self.polarity_many(product_ids).items()}
+
+    def sentiment(self, product_id: str) -> str:
+        """Sentiment label for one asset."""
+        return self.label_many([product_id])[product_id]
+
+    def purge(self) -> int:
+        """Drops expired polarities and article lists; returns how many entries were removed."""
+        now = self.clock()
+        with self._lock:
+            before = len(self._polarity) + len(self._articles)
+            self._polarity = {k: v for k, v in self._polarity.items() if v[1] > now}
+            self._articles = {k: v for k, v in self._articles.items() if v[1] > now}
+            return before - len(self._polarity) - len(self._articles)
+
+    def close(self) -> None:
+        """Shuts down the scoring process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
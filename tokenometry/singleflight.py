@@ -0,0 +1,70 @@
+# singleflight.py
+# Coalesces identical concurrent calls into one execution whose result is shared.
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+
+    The first caller for a key (the leader) executes the function; callers
+    arriving with the same key while it is in flight wait for it and
+    receive the same result or exception. Nothing is cached: once the call
+    returns, the next caller starts a fresh one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executes ``fn`` for ``key``, or joins the execution already in flight.
+
+        Returns:
+            (result, joined): ``joined`` is True if this caller waited on
+            another caller's execution instead of running ``fn`` itself.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+
+# Shared by every Tokenometry instance in the process; keys include the client (or
+# local data source), so strategies coalesce with each other only when they share one
+CANDLE_REQUESTS = SingleFlight()
@@ -0,0 +1,192 @@
+# sinks.py
+# Pluggable signal sinks fed by a bounded queue and a batching background writer.
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+_STOP = object()
+
+
+class SignalSink:
+    """Base class for signal destinations. ``write_batch`` is only called from the writer thread."""
+
+    def write_batch(self, signals: List[Dict]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink(SignalSink):
+    """Appends one JSON object per signal to a file."""
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._file = None
+
+    def write_batch(self, signals: List[Dict]) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(''.join(json.dumps(s, default=float) + '\n' for s in signals))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteSink(SignalSink):
+    """
+    Stores signals in a SQLite table using WAL journaling.
+
+    Each batch is one transaction, so commit cost is paid per batch rather
+    than per signal, and readers are never blocked by the writer.
+    """
+
+    def __init__(self, path: str, table: str = 'signals'):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name '{table}'.")
+        self.path = path
+        self.table = table
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {self.table} ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, asset TEXT, signal TEXT, '
+            'strength TEXT, trend TEXT, close_price REAL, trade_plan TEXT)')
+        return conn
+
+    def write_batch(self, signals: List[Dict]) -> None:
+        if self._conn is None:
+            self._conn = self._connect()
+        rows = [(s['timestamp'], s['asset'], s['signal'], s.get('strength'), s.get('trend'),
+                 float(s['close_price']), json.dumps(s.get('trade_plan') or {}, default=float))
+                for s in signals]
+        with self._conn:
+            self._conn.executemany(
+                f'INSERT INTO {self.table} (timestamp, asset, signal, strength, trend, close_price, trade_plan) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ParquetSink(SignalSink):
+    """Writes each batch as Parquet files in a dataset partitioned by asset and date (needs pyarrow)."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def write_batch(self, signals: List[Dict]) -> None:
+        from .arrow_io import write_signals
+        write_signals(signals, self.root)
+
+
+class BufferedSignalWriter:
+    """
+    Decouples signal persistence from the scan loop.
+
+    ``submit`` puts signals on a bounded queue and returns immediately; a
+    background thread drains it, handing the sink batches of up to
+    ``batch_size`` signals at least every ``flush_interval`` seconds. When
+    the queue is full, ``submit`` blocks (backpressure) for up to
+    ``put_timeout`` seconds and then raises ``queue.Full``.
+    """
+
+    def __init__(self, sink: SignalSink, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0, put_timeout: Optional[float] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.logger = logger or logging.getLogger('Tokenometry')
+        self.written = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='tokenometry-signal-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, signal: Dict) -> None:
+        """Queues one signal, blocking while the queue is full."""
+        if self._closed:
+            raise RuntimeError('BufferedSignalWriter is closed.')
+        self._queue.put(signal, timeout=self.put_timeout)
+
+    def submit_many(self, signals: Iterable[Dict]) -> None:
+        for signal in signals:
+            self.submit(signal)
+
+    @property
+    def pending(self) -> int:
+        """Signals queued but not yet handed to the sink."""
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Blocks until every signal submitted so far has been written (or failed)."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flushes remaining signals, stops the writer thread and closes the sink."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.sink.close()
+
+    def __enter__(self) -> 'BufferedSignalWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write(self, batch: List[Dict]) -> None:
+        try:
+            self.sink.write_batch(batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            self.logger.error("Signal sink %s failed to write %d signals: %s", type(self.sink).__name__, len(batch), e)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self) -> None:
+        batch: List[Dict] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                if batch:
+                    self._write(batch)
+                self._queue.task_done()
+                return
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch, deadline = [], None
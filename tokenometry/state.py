@@ -0,0 +1,74 @@
+# state.py
+# Persisted last-emitted-signal state, used to suppress repeat emissions.
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class SignalStateStore:
+    """
+    Remembers the last signal emitted per (strategy, asset) and its candle.
+
+    State lives in a single SQLite ``WITHOUT ROWID`` table (one small row per
+    pair) and is mirrored in memory, so lookups never touch disk and each
+    emission costs one upsert. Use ``path=':memory:'`` for a non-persistent store.
+    """
+
+    def __init__(self, path: str = 'tokenometry_state.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS signal_state ('
+            'strategy TEXT NOT NULL, asset TEXT NOT NULL, signal TEXT NOT NULL, '
+            'candle_ts INTEGER NOT NULL, updated_at REAL NOT NULL, '
+            'PRIMARY KEY (strategy, asset)) WITHOUT ROWID')
+        self._conn.commit()
+        self._state: Dict[Tuple[str, str], Tuple[str, int]] = {
+            (strategy, asset): (signal, candle_ts)
+            for strategy, asset, signal, candle_ts in self._conn.execute(
+                'SELECT strategy, asset, signal, candle_ts FROM signal_state')
+        }
+
+    def last(self, strategy: str, asset: str) -> Optional[Tuple[str, int]]:
+        """The last emitted (signal, candle epoch seconds) for a pair, or None."""
+        with self._lock:
+            return self._state.get((strategy, asset))
+
+    def is_new(self, strategy: str, asset: str, signal: str, candle_ts: int) -> bool:
+        """True unless exactly this signal was already emitted for this candle."""
+        return self.last(strategy, asset) != (signal, int(candle_ts))
+
+    def already_emitted_for(self, strategy: str, asset: str, candle_ts: int) -> bool:
+        """True if any signal was already emitted for this pair on this candle."""
+        last = self.last(strategy, asset)
+        return last is not None and last[1] == int(candle_ts)
+
+    def record(self, strategy: str, asset: str, signal: str, candle_ts: int) -> None:
+        """Stores an emission, replacing the previous one for the pair."""
+        candle_ts = int(candle_ts)
+        with self._lock:
+            self._state[(strategy, asset)] = (signal, candle_ts)
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO signal_state (strategy, asset, signal, candle_ts, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?)', (strategy, asset, signal, candle_ts, time.time()))
+
+    def clear(self, strategy: Optional[str] = None) -> None:
+        """Forgets all state, or only one strategy's."""
+        with self._lock:
+            with self._conn:
+                if strategy is None:
+                    self._state.clear()
+                    self._conn.execute('DELETE FROM signal_state')
+                else:
+                    self._state = {k: v for k, v in self._state.items() if k[0] != strategy}
+                    self._conn.execute('DELETE FROM signal_state WHERE strategy = ?', (strategy,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,98 @@
+# transport.py
+# A shared, pooled keep-alive HTTP session for Coinbase and enrichment sources.
+
+import threading
+from typing import Optional
+
+DEFAULT_POOL_SIZE = 10
+
+_lock = threading.Lock()
+_session = None
+_pool_size = DEFAULT_POOL_SIZE
+
+
+def _mount_pool(session, pool_size: int) -> None:
+    from requests.adapters import HTTPAdapter
+
+    # One pool per host with up to pool_size kept-alive connections; retries are
+    # left to the caller so failures surface immediately.
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def _build_session(pool_size: int):
+    import requests
+
+    session = requests.Session()
+    _mount_pool(session, pool_size)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+def get_session(pool_size: Optional[int] = None):
+    """
+    Returns the process-wide pooled ``requests.Session``.
+
+    The session is created on first use. Connection pools in urllib3 are
+    thread-safe, so every thread and every data source can share it and
+    reuse TCP+TLS connections instead of handshaking per request.
+
+    Args:
+        pool_size: Maximum kept-alive connections per host. The first call
+            sets it; later calls can only grow it, in place, so clients
+            already holding the session keep sharing its connections.
+
+    Returns:
+        The shared session.
+    """
+    global _session, _pool_size
+    with _lock:
+        if _session is None:
+            _pool_size = pool_size or _pool_size
+            _session = _build_session(_pool_size)
+        elif pool_size is not None and pool_size > _pool_size:
+            # Requests in flight finish on the old adapter, which is dropped, not closed
+            _mount_pool(_session, pool_size)
+            _pool_size = pool_size
+        return _session
+
+
+def close_session() -> None:
+    """Closes the shared session and all of its pooled connections."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def http_get(url: str, params: Optional[dict] = None, timeout: Optional[float] = 10.0, **kwargs):
+    """
+    Issues a GET request over the shared session.
+
+    Args:
+        url: Request URL
+        params: Optional query parameters
+        timeout: Seconds to wait for connect and read; None waits forever
+
+    Returns:
+        The ``requests.Response``.
+    """
+    return get_session().get(url, params=params, timeout=timeout, **kwargs)
+
+
+def attach_session(client, pool_size: Optional[int] = None):
+    """
+    Points a Coinbase ``RESTClient`` at the shared session.
+
+    Args:
+        client: A ``coinbase.rest.RESTClient`` (or anything with a ``session`` attribute)
+        pool_size: Optional pool size forwarded to ``get_session``
+
+    Returns:
+        The same client, for chaining.
+    """
+    if hasattr(client, 'session'):
+        client.session = get_session(pool_size)
+    return client